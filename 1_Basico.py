@@ -7,6 +7,7 @@ El usuario juega contra la computadora en un bucle infinito.
 Características:
 - Validación básica de entrada
 - Lógica de juego simple y directa
+- Generador aleatorio propio de la partida, con semilla opcional para repetirla
 """
 
 import random
@@ -50,9 +51,17 @@ def evaluar_juego(eleccion_usuario, eleccion_computadora):
             print("Las tijeras cortan el papel. ¡Ganaste!")
 
 
-def main():
-    """Función principal que ejecuta el bucle del juego."""
+def main(semilla=None):
+    """
+    Función principal que ejecuta el bucle del juego.
+
+    Args:
+        semilla (int | None): Semilla del generador aleatorio de la partida; con la
+            misma semilla la computadora repite las mismas elecciones
+    """
     acciones_juego = [PIEDRA, PAPEL, TIJERAS]
+    # Generador propio de esta partida en lugar del módulo random global
+    rng = random.Random(semilla)
     
     print("=== Bienvenido a Piedra, Papel y Tijeras ===\n")
 
@@ -71,7 +80,7 @@ def main():
             continue
         
         # Computadora elige una acción aleatoria
-        eleccion_computadora = random.choice(acciones_juego)
+        eleccion_computadora = rng.choice(acciones_juego)
 
         print(f"\nElegiste {eleccion_usuario}. La computadora eligió {eleccion_computadora}")
         evaluar_juego(eleccion_usuario, eleccion_computadora)
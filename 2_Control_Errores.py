@@ -8,6 +8,7 @@ Características:
 - Manejo de errores con try-except
 - Validación de entrada más robusta
 - Conversión a minúsculas para mejor UX
+- Generador aleatorio propio de la partida, con semilla opcional para repetirla
 """
 
 import random
@@ -56,9 +57,17 @@ def evaluar_juego(eleccion_usuario, eleccion_computadora):
             print("Las tijeras cortan el papel. ¡Ganaste!")
 
 
-def main():
-    """Función principal que ejecuta el bucle del juego con manejo de errores."""
+def main(semilla=None):
+    """
+    Función principal que ejecuta el bucle del juego con manejo de errores.
+
+    Args:
+        semilla (int | None): Semilla del generador aleatorio de la partida; con la
+            misma semilla la computadora repite las mismas elecciones
+    """
     acciones_juego = [PIEDRA, PAPEL, TIJERAS]
+    # Generador propio de esta partida en lugar del módulo random global
+    rng = random.Random(semilla)
     
     print("=== Bienvenido a Piedra, Papel y Tijeras (v2) ===\n")
 
@@ -77,7 +86,7 @@ def main():
                 raise OpcionIncorrectaException
             
             # Computadora elige una acción aleatoria
-            eleccion_computadora = random.choice(acciones_juego)
+            eleccion_computadora = rng.choice(acciones_juego)
 
             print(f"\nElegiste {eleccion_usuario}. La computadora eligió {eleccion_computadora}")
             evaluar_juego(eleccion_usuario, eleccion_computadora)
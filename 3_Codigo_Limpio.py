@@ -4,21 +4,18 @@ Piedra, Papel y Tijeras - Versión con Código Limpio
 Implementación más estructurada utilizando Enums y separación de responsabilidades.
 
 Características:
-- Uso de Enums para mejorar legibilidad y mantenibilidad
+- Uso de Enums (compartidos en piedra_papel_tijeras.nucleo) para mejorar legibilidad y mantenibilidad
 - Funciones claramente separadas por responsabilidad
 - Mejor validación de entrada con manejo de excepciones
-- Mensajes formateados dinámicamente
+- Mensajes precalculados una sola vez en el paquete compartido
+- Generador aleatorio propio de la partida, con semilla opcional para repetirla
 """
 
 import random
-from enum import IntEnum
 
-
-class AccionJuego(IntEnum):
-    """Enum que representa las acciones posibles en el juego."""
-    Piedra = 0
-    Papel = 1
-    Tijeras = 2
+from piedra_papel_tijeras.nucleo import AccionJuego, describir_ronda
+from piedra_papel_tijeras.presentacion import (MENSAJE_DESPEDIDA, MENSAJE_ELECCION_USUARIO, MENSAJE_OTRA_RONDA,
+                                               MENSAJE_SELECCION_INVALIDA, MENSAJES_ELECCION_COMPUTADORA)
 
 
 def evaluar_juego(eleccion_usuario, eleccion_computadora):
@@ -29,41 +26,22 @@ def evaluar_juego(eleccion_usuario, eleccion_computadora):
         eleccion_usuario (AccionJuego): La acción elegida por el usuario
         eleccion_computadora (AccionJuego): La acción elegida por la computadora
     """
-    if eleccion_usuario == eleccion_computadora:
-        print(f"El usuario y la computadora eligieron {eleccion_usuario.name}. ¡Empate!")
-
-    # Eligiste Piedra
-    elif eleccion_usuario == AccionJuego.Piedra:
-        if eleccion_computadora == AccionJuego.Tijeras:
-            print("La piedra rompe las tijeras. ¡Ganaste!")
-        else:
-            print("El papel envuelve la piedra. ¡Perdiste!")
-
-    # Eligiste Papel
-    elif eleccion_usuario == AccionJuego.Papel:
-        if eleccion_computadora == AccionJuego.Piedra:
-            print("El papel envuelve la piedra. ¡Ganaste!")
-        else:
-            print("Las tijeras cortan el papel. ¡Perdiste!")
-
-    # Eligiste Tijeras
-    elif eleccion_usuario == AccionJuego.Tijeras:
-        if eleccion_computadora == AccionJuego.Piedra:
-            print("La piedra rompe las tijeras. ¡Perdiste!")
-        else:
-            print("Las tijeras cortan el papel. ¡Ganaste!")
+    print(describir_ronda(eleccion_usuario, eleccion_computadora))
 
             
-def obtener_accion_computadora():
+def obtener_accion_computadora(rng=random):
     """
     Genera una acción aleatoria para la computadora.
     
+    Args:
+        rng (random.Random): Generador aleatorio a utilizar (por defecto, el módulo random)
+
     Returns:
         AccionJuego: La acción elegida aleatoriamente por la computadora
     """
-    seleccion_computadora = random.randint(0, len(AccionJuego) - 1)
+    seleccion_computadora = rng.randint(0, len(AccionJuego) - 1)
     accion_computadora = AccionJuego(seleccion_computadora)
-    print(f"La computadora eligió {accion_computadora.name}.")
+    print(MENSAJES_ELECCION_COMPUTADORA[accion_computadora])
     
     return accion_computadora
             
@@ -78,10 +56,8 @@ def obtener_accion_usuario():
     Raises:
         ValueError: Si la entrada no es un número válido dentro del rango
     """
-    # Generar dinámicamente el string de opciones desde el Enum
-    opciones_juego = [f"{accion_juego.name}[{accion_juego.value}]" for accion_juego in AccionJuego]
-    opciones_juego_str = ", ".join(opciones_juego)
-    seleccion_usuario = int(input(f"\nElige una opción ({opciones_juego_str}): "))
+    # Pregunta precalculada una sola vez a partir del Enum
+    seleccion_usuario = int(input(MENSAJE_ELECCION_USUARIO))
     accion_usuario = AccionJuego(seleccion_usuario)
        
     return accion_usuario
@@ -94,28 +70,34 @@ def jugar_otra_ronda():
     Returns:
         bool: True si el usuario quiere otra ronda, False en caso contrario
     """
-    otra_ronda = input("\n¿Otra ronda? (s/n): ")
+    otra_ronda = input(MENSAJE_OTRA_RONDA)
     return otra_ronda.lower() == 's'
         
 
-def main():
-    """Función principal que ejecuta el bucle del juego."""
+def main(semilla=None):
+    """
+    Función principal que ejecuta el bucle del juego.
+
+    Args:
+        semilla (int | None): Semilla del generador aleatorio de la partida; con la
+            misma semilla la computadora repite las mismas elecciones
+    """
     print("=== Bienvenido a Piedra, Papel y Tijeras (v3) ===\n")
+    # Generador propio de esta partida en lugar del módulo random global
+    rng = random.Random(semilla)
     
     while True:
         try:
             eleccion_usuario = obtener_accion_usuario()
         except ValueError:
-            # Mostrar el rango válido de opciones
-            rango_str = f"[0, {len(AccionJuego) - 1}]"
-            print(f"Selección inválida. ¡Elige una opción dentro del rango {rango_str}!")
+            print(MENSAJE_SELECCION_INVALIDA)
             continue
 
-        eleccion_computadora = obtener_accion_computadora()
+        eleccion_computadora = obtener_accion_computadora(rng)
         evaluar_juego(eleccion_usuario, eleccion_computadora)
 
         if not jugar_otra_ronda():
-            print("\n¡Gracias por jugar! Hasta luego.")
+            print(MENSAJE_DESPEDIDA)
             break
         
 
@@ -5,10 +5,11 @@ Implementación con una estrategia de IA simple que aprende de sus propios resul
 en rondas anteriores.
 
 Características:
-- Enums para acciones y resultados del juego
+- Enums para acciones y resultados del juego (compartidos en piedra_papel_tijeras.nucleo)
 - Historial de acciones de la IA y resultados para análisis
 - IA básica que adapta su estrategia según su propio desempeño anterior
 - Manejo robusto de errores
+- Generador aleatorio propio de la partida, con semilla opcional para repetirla
 
 Estrategia de IA JUSTA Y HONESTA:
 
@@ -30,22 +31,11 @@ Mirar la acción del usuario sería hacer trampa.
 """
 
 import random
-from enum import IntEnum
-
-
-class AccionJuego(IntEnum):
-    """Enum que representa las acciones posibles en el juego."""
-    Piedra = 0
-    Papel = 1
-    Tijeras = 2
-
-
-class ResultadoJuego(IntEnum):
-    """Enum que representa los posibles resultados del juego."""
-    Victoria = 0
-    Derrota = 1
-    Empate = 2
 
+from piedra_papel_tijeras.historial import HistorialPartida
+from piedra_papel_tijeras.nucleo import AccionJuego, ResultadoJuego, describir_ronda, evaluar_ronda
+from piedra_papel_tijeras.presentacion import (MENSAJE_DESPEDIDA, MENSAJE_ELECCION_USUARIO, MENSAJE_OTRA_RONDA,
+                                               MENSAJE_SELECCION_INVALIDA)
 
 
 def evaluar_juego(eleccion_usuario, eleccion_computadora):
@@ -64,42 +54,13 @@ def evaluar_juego(eleccion_usuario, eleccion_computadora):
     Returns:
         ResultadoJuego: El resultado del juego para el usuario (Victoria/Derrota/Empate)
     """
-    
-    if eleccion_usuario == eleccion_computadora:
-        print(f"El usuario y la computadora eligieron {eleccion_usuario.name}. ¡Empate!")
-        resultado_juego = ResultadoJuego.Empate
-
-    # Elegiste Piedra
-    elif eleccion_usuario == AccionJuego.Piedra:
-        if eleccion_computadora == AccionJuego.Tijeras:
-            print("La piedra rompe las tijeras. ¡Ganaste!")
-            resultado_juego = ResultadoJuego.Victoria
-        else:  # La computadora eligió Papel
-            print("El papel envuelve la piedra. ¡Perdiste!")
-            resultado_juego = ResultadoJuego.Derrota
-
-    # Elegiste Papel
-    elif eleccion_usuario == AccionJuego.Papel:
-        if eleccion_computadora == AccionJuego.Piedra:
-            print("El papel envuelve la piedra. ¡Ganaste!")
-            resultado_juego = ResultadoJuego.Victoria
-        else:  # La computadora eligió Tijeras
-            print("Las tijeras cortan el papel. ¡Perdiste!")
-            resultado_juego = ResultadoJuego.Derrota
-
-    # Elegiste Tijeras
-    else:  # eleccion_usuario == AccionJuego.Tijeras
-        if eleccion_computadora == AccionJuego.Piedra:
-            print("La piedra rompe las tijeras. ¡Perdiste!")
-            resultado_juego = ResultadoJuego.Derrota
-        else:  # La computadora eligió Papel
-            print("Las tijeras cortan el papel. ¡Ganaste!")
-            resultado_juego = ResultadoJuego.Victoria
+    resultado_juego = evaluar_ronda(eleccion_usuario, eleccion_computadora)
+    print(describir_ronda(eleccion_usuario, eleccion_computadora))
 
     return resultado_juego
 
             
-def obtener_accion_computadora(historial_juego, historial_computadora):
+def obtener_accion_computadora(historial_juego, historial_computadora, rng=random):
     """
     Obtiene la acción de la computadora basada en la IA simple y honesta.
     
@@ -118,15 +79,16 @@ def obtener_accion_computadora(historial_juego, historial_computadora):
     (Victoria = el usuario ganó, Derrota = el usuario perdió, Empate = empate)
     
     Args:
-        historial_juego (list): Historial de resultados del juego (perspectiva del usuario)
-        historial_computadora (list): Historial de PROPIAS acciones de la IA (lo importante)
+        historial_juego (list | VistaHistorial): Historial de resultados del juego (perspectiva del usuario)
+        historial_computadora (list | VistaHistorial): Historial de PROPIAS acciones de la IA (lo importante)
+        rng (random.Random): Generador aleatorio a utilizar (por defecto, el módulo random)
         
     Returns:
         AccionJuego: La acción elegida por la computadora
     """
     # Primera ronda sin historial => elección aleatoria
     if len(historial_computadora) == 0:
-        accion_computadora = obtener_accion_aleatoria_computadora()
+        accion_computadora = obtener_accion_aleatoria_computadora(rng)
     else:
         # Analizar el resultado de la última ronda (desde la perspectiva del usuario)
         ultimo_resultado = historial_juego[-1]
@@ -137,7 +99,7 @@ def obtener_accion_computadora(historial_juego, historial_computadora):
             accion_que_perdio = historial_computadora[-1]
             acciones_disponibles = [a for a in AccionJuego if a != accion_que_perdio]
             # Elegir aleatoriamente de las dos opciones restantes
-            accion_computadora = random.choice(acciones_disponibles)
+            accion_computadora = rng.choice(acciones_disponibles)
         
         # Si el usuario perdió (IA ganó): mantener la estrategia ganadora
         elif ultimo_resultado == ResultadoJuego.Derrota:
@@ -146,7 +108,7 @@ def obtener_accion_computadora(historial_juego, historial_computadora):
         
         # Si fue empate: elección aleatoria
         else:
-            accion_computadora = obtener_accion_aleatoria_computadora()
+            accion_computadora = obtener_accion_aleatoria_computadora(rng)
     
     return accion_computadora
             
@@ -161,23 +123,24 @@ def obtener_accion_usuario():
     Raises:
         ValueError: Si la entrada no es un número válido dentro del rango
     """
-    # Generar dinámicamente el string de opciones desde el Enum
-    opciones_juego = [f"{accion_juego.name}[{accion_juego.value}]" for accion_juego in AccionJuego]
-    opciones_juego_str = ", ".join(opciones_juego)
-    seleccion_usuario = int(input(f"\nElige una opción ({opciones_juego_str}): "))
+    # Pregunta precalculada una sola vez a partir del Enum
+    seleccion_usuario = int(input(MENSAJE_ELECCION_USUARIO))
     accion_usuario = AccionJuego(seleccion_usuario)
        
     return accion_usuario
 
 
-def obtener_accion_aleatoria_computadora():
+def obtener_accion_aleatoria_computadora(rng=random):
     """
     Genera una acción aleatoria para la computadora.
     
+    Args:
+        rng (random.Random): Generador aleatorio a utilizar (por defecto, el módulo random)
+        
     Returns:
         AccionJuego: Una acción aleatoria
     """
-    seleccion_computadora = random.randint(0, len(AccionJuego) - 1)
+    seleccion_computadora = rng.randint(0, len(AccionJuego) - 1)
     accion_computadora = AccionJuego(seleccion_computadora)
 
     return accion_computadora
@@ -190,32 +153,38 @@ def jugar_otra_ronda():
     Returns:
         bool: True si el usuario quiere otra ronda, False en caso contrario
     """
-    otra_ronda = input("\n¿Otra ronda? (s/n): ")
+    otra_ronda = input(MENSAJE_OTRA_RONDA)
     return otra_ronda.lower() == 's'
         
 
-def main():
-    """Función principal que ejecuta el bucle del juego con IA básica."""
+def main(semilla=None):
+    """
+    Función principal que ejecuta el bucle del juego con IA básica.
+
+    Args:
+        semilla (int | None): Semilla del generador aleatorio de la partida; con la
+            misma semilla y las mismas jugadas la IA repite sus elecciones
+    """
     print("=== Bienvenido a Piedra, Papel y Tijeras (v4 - IA Básica) ===\n")
+    # Generador propio de esta partida en lugar del módulo random global
+    rng = random.Random(semilla)
     
-    historial_juego = []
-    historial_acciones_computadora = []
+    # Historial compacto: un byte por ronda con ambas acciones y el resultado
+    historial = HistorialPartida()
     
     while True:
         try:
             eleccion_usuario = obtener_accion_usuario()
         except ValueError:
-            rango_str = f"[0, {len(AccionJuego) - 1}]"
-            print(f"Selección inválida. ¡Elige una opción dentro del rango {rango_str}!")
+            print(MENSAJE_SELECCION_INVALIDA)
             continue
 
-        eleccion_computadora = obtener_accion_computadora( historial_juego, historial_acciones_computadora)
-        historial_acciones_computadora.append(eleccion_computadora)
+        eleccion_computadora = obtener_accion_computadora(historial.resultados, historial.acciones_computadora, rng)
         resultado_juego = evaluar_juego(eleccion_usuario, eleccion_computadora)
-        historial_juego.append(resultado_juego)
+        historial.append(eleccion_usuario, eleccion_computadora, resultado_juego)
 
         if not jugar_otra_ronda():
-            print("\n¡Gracias por jugar! Hasta luego.")
+            print(MENSAJE_DESPEDIDA)
             break
         
 
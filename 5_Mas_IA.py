@@ -5,11 +5,12 @@ Implementación con una estrategia de IA más sofisticada que analiza
 los patrones recientes de las acciones del usuario.
 
 Características:
-- Enums para acciones y resultados del juego
+- Enums para acciones y resultados del juego (compartidos en piedra_papel_tijeras.nucleo)
 - Historial de acciones para análisis de patrones estadísticos
 - IA avanzada que detecta la acción más frecuente reciente del usuario
-- Análisis estadístico de movimientos recientes usando mode()
+- Ventana deslizante con el recuento de los movimientos recientes (coste constante por ronda)
 - Historial de resultados desde la perspectiva del usuario
+- Generador aleatorio propio de la partida, con semilla opcional para repetirla
 
 Estrategia de IA HONESTA y AVANZADA:
 - Analiza SOLO los movimientos previos del usuario (no la acción actual)
@@ -23,32 +24,16 @@ Eso sería hacer trampa. La IA solo usa información del pasado.
 """
 
 import random
-from enum import IntEnum
-from statistics import mode
 
+from piedra_papel_tijeras.historial import HistorialPartida
+from piedra_papel_tijeras.nucleo import (AccionJuego, describir_ronda, evaluar_ronda,
+                                         obtener_accion_ganadora)
+from piedra_papel_tijeras.presentacion import (MENSAJE_DESPEDIDA, MENSAJE_ELECCION_USUARIO, MENSAJE_OTRA_RONDA,
+                                               MENSAJE_SELECCION_INVALIDA, MENSAJES_ELECCION_COMPUTADORA)
+from piedra_papel_tijeras.ventana import VentanaFrecuencias
 
-class AccionJuego(IntEnum):
-    """Enum que representa las acciones posibles en el juego."""
-    Piedra = 0
-    Papel = 1
-    Tijeras = 2
 
-
-class ResultadoJuego(IntEnum):
-    """Enum que representa los posibles resultados del juego."""
-    Victoria = 0
-    Derrota = 1
-    Empate = 2
-
-
-# Diccionario que define qué acción vence a otra
-Victorias = {
-    AccionJuego.Piedra: AccionJuego.Papel,    # Papel vence a Piedra
-    AccionJuego.Papel: AccionJuego.Tijeras,   # Tijeras vence a Papel
-    AccionJuego.Tijeras: AccionJuego.Piedra   # Piedra vence a Tijeras
-}
-
-# Número de acciones recientes a analizar para detectar patrones
+# Número de acciones recientes a analizar por defecto (configurable en main())
 NUMERO_ACCIONES_RECIENTES = 5
 
 
@@ -68,42 +53,13 @@ def evaluar_juego(eleccion_usuario, eleccion_computadora):
     Returns:
         ResultadoJuego: El resultado del juego para el usuario (Victoria/Derrota/Empate)
     """
-    
-    if eleccion_usuario == eleccion_computadora:
-        print(f"El usuario y la computadora eligieron {eleccion_usuario.name}. ¡Empate!")
-        resultado_juego = ResultadoJuego.Empate
-
-    # Elegiste Piedra
-    elif eleccion_usuario == AccionJuego.Piedra:
-        if eleccion_computadora == AccionJuego.Tijeras:
-            print("La piedra rompe las tijeras. ¡Ganaste!")
-            resultado_juego = ResultadoJuego.Victoria
-        else:  # La computadora eligió Papel
-            print("El papel envuelve la piedra. ¡Perdiste!")
-            resultado_juego = ResultadoJuego.Derrota
-
-    # Elegiste Papel
-    elif eleccion_usuario == AccionJuego.Papel:
-        if eleccion_computadora == AccionJuego.Piedra:
-            print("El papel envuelve la piedra. ¡Ganaste!")
-            resultado_juego = ResultadoJuego.Victoria
-        else:  # La computadora eligió Tijeras
-            print("Las tijeras cortan el papel. ¡Perdiste!")
-            resultado_juego = ResultadoJuego.Derrota
-
-    # Elegiste Tijeras
-    else:  # eleccion_usuario == AccionJuego.Tijeras
-        if eleccion_computadora == AccionJuego.Piedra:
-            print("La piedra rompe las tijeras. ¡Perdiste!")
-            resultado_juego = ResultadoJuego.Derrota
-        else:  # La computadora eligió Papel
-            print("Las tijeras cortan el papel. ¡Ganaste!")
-            resultado_juego = ResultadoJuego.Victoria
+    resultado_juego = evaluar_ronda(eleccion_usuario, eleccion_computadora)
+    print(describir_ronda(eleccion_usuario, eleccion_computadora))
 
     return resultado_juego
 
             
-def obtener_accion_computadora(historial_usuario, historial_juego):
+def obtener_accion_computadora(historial_usuario, historial_juego, rng=random):
     """
     Obtiene la acción de la computadora basada en análisis de patrones HISTÓRICOS.
     
@@ -111,39 +67,47 @@ def obtener_accion_computadora(historial_usuario, historial_juego):
     La IA NUNCA examina la acción actual que el usuario acaba de elegir.
     Solo usa información histórica para detectar patrones.
     
-    IMPORTANTE: El último elemento de historial_usuario es la acción ACTUAL del usuario.
-    Esta función lo EXCLUYE deliberadamente y analiza solo las acciones anteriores.
+    IMPORTANTE: historial_usuario contiene solo las acciones PREVIAS del usuario.
+    La acción actual se añade después de que la IA haya elegido.
     
     Procedimiento:
-    1. Excluye el último elemento (acción actual) del historial del usuario
-    2. Obtiene los últimos NUMERO_ACCIONES_RECIENTES movimientos PREVIOS
-    3. Calcula la acción más frecuente en esos movimientos históricos
+    1. La ventana conserva solo los últimos movimientos PREVIOS (tamaño configurable)
+    2. La ventana mantiene el recuento de cada acción al añadir cada movimiento
+    3. Consulta la acción más frecuente sin recorrer todo el historial
     4. Elige la acción que vence esa opción más frecuente
     
+    Con una secuencia cualquiera (lista o VistaHistorial) en lugar de una ventana,
+    se analizan sus últimos NUMERO_ACCIONES_RECIENTES movimientos. Se mantiene la
+    convención de las versiones anteriores: si la secuencia tiene una acción más
+    que historial_juego, su último elemento es la acción ACTUAL y se EXCLUYE.
+    
     Args:
-        historial_usuario (list): Historial de acciones del usuario (incluye la actual)
-        historial_juego (list): Historial de resultados del juego
+        historial_usuario (VentanaFrecuencias | list | VistaHistorial): Acciones previas del
+            usuario (una secuencia puede incluir además la actual al final)
+        historial_juego (list | VistaHistorial): Historial de resultados del juego
+        rng (random.Random): Generador aleatorio a utilizar (por defecto, el módulo random)
         
     Returns:
         AccionJuego: La acción elegida por la computadora
     """
-    # Excluir el último elemento (acción actual) y analizar solo el historial previo
-    historial_previo_usuario = historial_usuario[:-1] if historial_usuario else []
-    
+    if not isinstance(historial_usuario, VentanaFrecuencias):
+        # Una acción más que resultados: la última es la ACTUAL y nunca se analiza
+        fin = len(historial_usuario) - (len(historial_usuario) == len(historial_juego) + 1)
+        historial_usuario = historial_usuario[max(0, fin - NUMERO_ACCIONES_RECIENTES):fin]
+
     # No hay acciones previas del usuario => elección aleatoria de la computadora
-    if not historial_previo_usuario or not historial_juego:
-        accion_computadora = obtener_accion_aleatoria_computadora()
-    # IA avanzada: analizar patrones en el historial reciente (EXCLUIDA la acción actual)
+    if not historial_usuario or not historial_juego:
+        accion_computadora = obtener_accion_aleatoria_computadora(rng)
+    # IA avanzada: analizar patrones en el historial reciente (la acción actual aún no está)
     else:
-        # Obtener los últimos NUMERO_ACCIONES_RECIENTES movimientos PREVIOS (sin la actual)
-        acciones_recientes = historial_previo_usuario[-NUMERO_ACCIONES_RECIENTES:]
-        # Calcular la acción más frecuente en esos movimientos históricos
-        accion_mas_frecuente_reciente_usuario = AccionJuego(mode(acciones_recientes))
+        # Una secuencia sin recuentos se convierte en una ventana con sus últimos movimientos
+        if not isinstance(historial_usuario, VentanaFrecuencias):
+            historial_usuario = VentanaFrecuencias.desde_bytes(NUMERO_ACCIONES_RECIENTES, bytes(historial_usuario))
+        # Consultar la acción más frecuente en la ventana de movimientos previos
+        accion_mas_frecuente_reciente_usuario = AccionJuego(historial_usuario.moda())
         # Elegir la acción que vence esa opción más frecuente
         accion_computadora = obtener_accion_ganadora(accion_mas_frecuente_reciente_usuario)
 
-    print(f"La computadora eligió {accion_computadora.name}.")
-    
     return accion_computadora
             
 
@@ -157,41 +121,29 @@ def obtener_accion_usuario():
     Raises:
         ValueError: Si la entrada no es un número válido dentro del rango
     """
-    # Generar dinámicamente el string de opciones desde el Enum
-    opciones_juego = [f"{accion_juego.name}[{accion_juego.value}]" for accion_juego in AccionJuego]
-    opciones_juego_str = ", ".join(opciones_juego)
-    seleccion_usuario = int(input(f"\nElige una opción ({opciones_juego_str}): "))
+    # Pregunta precalculada una sola vez a partir del Enum
+    seleccion_usuario = int(input(MENSAJE_ELECCION_USUARIO))
     accion_usuario = AccionJuego(seleccion_usuario)
        
     return accion_usuario
 
 
-def obtener_accion_aleatoria_computadora():
+def obtener_accion_aleatoria_computadora(rng=random):
     """
     Genera una acción aleatoria para la computadora.
     
+    Args:
+        rng (random.Random): Generador aleatorio a utilizar (por defecto, el módulo random)
+        
     Returns:
         AccionJuego: Una acción aleatoria
     """
-    seleccion_computadora = random.randint(0, len(AccionJuego) - 1)
+    seleccion_computadora = rng.randint(0, len(AccionJuego) - 1)
     accion_computadora = AccionJuego(seleccion_computadora)
 
     return accion_computadora
 
 
-def obtener_accion_ganadora(accion_juego):
-    """
-    Obtiene la acción que vence a la acción dada.
-    
-    Args:
-        accion_juego (AccionJuego): La acción contra la que queremos ganar
-        
-    Returns:
-        AccionJuego: La acción ganadora
-    """
-    return Victorias[accion_juego]
-
-
 def jugar_otra_ronda():
     """
     Pregunta al usuario si desea jugar otra ronda.
@@ -199,32 +151,44 @@ def jugar_otra_ronda():
     Returns:
         bool: True si el usuario quiere otra ronda, False en caso contrario
     """
-    otra_ronda = input("\n¿Otra ronda? (s/n): ")
+    otra_ronda = input(MENSAJE_OTRA_RONDA)
     return otra_ronda.lower() == 's'
         
 
-def main():
-    """Función principal que ejecuta el bucle del juego con IA avanzada."""
+def main(num_acciones_recientes=NUMERO_ACCIONES_RECIENTES, semilla=None):
+    """
+    Función principal que ejecuta el bucle del juego con IA avanzada.
+    
+    Args:
+        num_acciones_recientes (int): Número de acciones previas del usuario que analiza la IA
+        semilla (int | None): Semilla del generador aleatorio de la partida; con la
+            misma semilla y las mismas jugadas la IA repite sus elecciones
+    """
     print("=== Bienvenido a Piedra, Papel y Tijeras (v5 - IA Avanzada) ===\n")
+    # Generador propio de esta partida en lugar del módulo random global
+    rng = random.Random(semilla)
     
-    historial_juego = []
-    historial_acciones_usuario = []
+    # Historial compacto: un byte por ronda con ambas acciones y el resultado
+    historial = HistorialPartida()
+    # Ventana de tamaño fijo: memoria y coste por ronda constantes en sesiones largas
+    historial_acciones_usuario = VentanaFrecuencias(num_acciones_recientes)
     
     while True:
         try:
             eleccion_usuario = obtener_accion_usuario()
-            historial_acciones_usuario.append(eleccion_usuario)
         except ValueError:
-            rango_str = f"[0, {len(AccionJuego) - 1}]"
-            print(f"Selección inválida. ¡Elige una opción dentro del rango {rango_str}!")
+            print(MENSAJE_SELECCION_INVALIDA)
             continue
 
-        eleccion_computadora = obtener_accion_computadora(historial_acciones_usuario, historial_juego)
+        eleccion_computadora = obtener_accion_computadora(historial_acciones_usuario, historial.resultados, rng)
+        print(MENSAJES_ELECCION_COMPUTADORA[eleccion_computadora])
         resultado_juego = evaluar_juego(eleccion_usuario, eleccion_computadora)
-        historial_juego.append(resultado_juego)
+        historial.append(eleccion_usuario, eleccion_computadora, resultado_juego)
+        # La acción del usuario solo pasa a la ventana cuando la IA ya ha elegido
+        historial_acciones_usuario.append(eleccion_usuario)
 
         if not jugar_otra_ronda():
-            print("\n¡Gracias por jugar! Hasta luego.")
+            print(MENSAJE_DESPEDIDA)
             break
         
 
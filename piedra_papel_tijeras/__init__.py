@@ -0,0 +1,27 @@
+"""
+Piedra, Papel y Tijeras - Paquete compartido
+============================================
+Código común reutilizado por las versiones 3, 4 y 5 del juego y por las
+herramientas de análisis.
+
+Módulos:
+- nucleo: Enums, tabla de resultados y evaluación de una ronda
+- reglas: Motor de reglas para juegos de N acciones (Lagarto-Spock y mayores)
+- presentacion: Mensajes del juego precalculados
+- historial, ventana, markov, dirichlet, estrategias: Estado de la partida y estrategias de la IA
+- azar: Flujos aleatorios reproducibles con semilla propia por sesión
+- simulacion, torneo: Partidas automáticas sin entrada/salida
+- jugar_lotes: Partidas por lotes sin interacción desde la entrada estándar o un archivo
+- explotabilidad: Mejor respuesta contra cada IA y su tasa de victorias esperada
+- lote, decisiones_lote, bitacora, analisis, ensamble: Procesamiento por lotes con NumPy (opcional)
+- servidor, sesiones, carga: Servidor de red y generador de carga
+- instantaneas: Formato binario versionado para guardar y cargar muchas sesiones
+- estadisticas: Tasa de victorias y clasificación globales, agregadas sin cerrojos
+- apertura: Libro de aperturas extraído de las bitácoras para las primeras rondas
+- instrumentacion, pruebas_rendimiento: Medida del rendimiento
+
+El paquete no importa ningún módulo al cargarse: importar
+piedra_papel_tijeras.nucleo solo carga el núcleo, y las dependencias pesadas
+(NumPy, asyncio, argparse, multiprocessing) se cargan en los módulos o
+funciones que las necesitan.
+"""
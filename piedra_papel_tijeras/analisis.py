@@ -0,0 +1,277 @@
+"""
+Piedra, Papel y Tijeras - Análisis en flujo de bitácoras
+========================================================
+Estadísticas por sesión calculadas leyendo una bitácora binaria (archivo o
+entrada estándar) por fragmentos, en una sola pasada y con memoria constante
+respecto al número de rondas.
+
+Características:
+- Cadena de generadores: lectura por fragmentos -> evaluación por lotes -> agregación
+- Los resultados se recalculan con evaluar_lote() en lugar de confiar en el registro
+- Agregación vectorizada por fragmento; Python solo recorre las sesiones de cada fragmento
+- Por sesión: tasa de victorias, distribución de acciones, rachas máximas y
+  una puntuación de predictibilidad del usuario
+- La memoria depende del número de sesiones, no del número de rondas
+
+Se asume que las rondas de cada sesión aparecen en la bitácora en el orden en
+que se jugaron (como las escribe el servidor).
+"""
+
+import argparse
+import json
+import sys
+
+import numpy as np
+
+from .bitacora import MAGIA_BITACORA, TAMANO_REGISTRO, tipo_registro
+from .lote import evaluar_lote
+from .nucleo import AccionJuego, ResultadoJuego
+
+# Registros leídos en cada fragmento (1 MiB de datos con registros de 16 bytes)
+REGISTROS_POR_FRAGMENTO = 1 << 16
+
+
+class EstadisticasSesion:
+    """Estadísticas acumuladas de una sesión."""
+
+    __slots__ = ("id_sesion", "rondas", "acciones", "resultados", "transiciones",
+                 "ultima_accion", "resultado_racha", "longitud_racha", "rachas_maximas")
+
+    def __init__(self, id_sesion):
+        """
+        Args:
+            id_sesion (int): Identificador de la sesión
+        """
+        num_acciones = len(AccionJuego)
+        self.id_sesion = id_sesion
+        self.rondas = 0
+        # Veces que el usuario eligió cada acción
+        self.acciones = [0] * num_acciones
+        # Rondas con cada resultado (perspectiva del usuario)
+        self.resultados = [0] * len(ResultadoJuego)
+        # transiciones[anterior * N + siguiente] = veces que el usuario eligió siguiente tras anterior
+        self.transiciones = [0] * num_acciones * num_acciones
+        self.ultima_accion = None
+        # Racha en curso: resultado que se repite y cuántas rondas seguidas lleva
+        self.resultado_racha = None
+        self.longitud_racha = 0
+        # Racha más larga de cada resultado
+        self.rachas_maximas = [0] * len(ResultadoJuego)
+
+    @property
+    def tasa_victorias(self):
+        """float: Fracción de rondas ganadas por el usuario."""
+        return self.resultados[ResultadoJuego.Victoria] / self.rondas if self.rondas else 0.0
+
+    @property
+    def distribucion(self):
+        """list: Fracción de rondas en las que el usuario eligió cada acción."""
+        return [conteo / self.rondas if self.rondas else 0.0 for conteo in self.acciones]
+
+    @property
+    def predictibilidad(self):
+        """
+        float: Fracción de acciones del usuario acertadas prediciendo, tras cada
+        acción, la que más le siguió en toda la sesión (Markov de orden 1 a
+        posteriori). Un jugador aleatorio ronda 1/3; uno totalmente predecible, 1.
+        """
+        num_acciones = len(AccionJuego)
+        total = sum(self.transiciones)
+        if not total:
+            return 0.0
+        aciertos = sum(max(self.transiciones[inicio:inicio + num_acciones])
+                       for inicio in range(0, len(self.transiciones), num_acciones))
+        return aciertos / total
+
+    def como_dict(self):
+        """
+        Returns:
+            dict: Resumen de la sesión con nombres legibles
+        """
+        return {
+            "id_sesion": self.id_sesion,
+            "rondas": self.rondas,
+            "tasa_victorias": self.tasa_victorias,
+            "resultados": {resultado.name: self.resultados[resultado] for resultado in ResultadoJuego},
+            "distribucion": {accion.name: fraccion for accion, fraccion in zip(AccionJuego, self.distribucion)},
+            "rachas_maximas": {resultado.name: self.rachas_maximas[resultado] for resultado in ResultadoJuego},
+            "predictibilidad": self.predictibilidad,
+        }
+
+
+def leer_fragmentos(archivo, registros_por_fragmento=REGISTROS_POR_FRAGMENTO):
+    """
+    Lee una bitácora de un flujo binario fragmento a fragmento.
+
+    Cada fragmento es una vista sobre un buffer reutilizado: solo es válido
+    hasta que se pide el siguiente.
+
+    Args:
+        archivo (BinaryIO): Flujo binario con la bitácora (archivo abierto o sys.stdin.buffer)
+        registros_por_fragmento (int): Número máximo de registros por fragmento
+
+    Yields:
+        numpy.ndarray: Registros con los campos de tipo_registro()
+
+    Raises:
+        ValueError: Si el flujo no empieza por la cabecera de bitácora
+    """
+    if archivo.read(len(MAGIA_BITACORA)) != MAGIA_BITACORA:
+        raise ValueError("La entrada no es una bitácora de Piedra, Papel y Tijeras")
+
+    tipo = tipo_registro()
+    buffer = bytearray(registros_por_fragmento * TAMANO_REGISTRO)
+    vista = memoryview(buffer)
+    pendientes = 0
+    while leidos := archivo.readinto(vista[pendientes:]):
+        disponibles = pendientes + leidos
+        completos = disponibles // TAMANO_REGISTRO
+        if completos:
+            yield np.frombuffer(buffer, dtype=tipo, count=completos)
+        # Un registro partido entre dos lecturas se completa en la siguiente
+        pendientes = disponibles - completos * TAMANO_REGISTRO
+        buffer[:pendientes] = buffer[completos * TAMANO_REGISTRO:disponibles]
+
+
+def evaluar_fragmentos(fragmentos):
+    """
+    Calcula con evaluar_lote() el resultado de cada ronda de los fragmentos.
+
+    Args:
+        fragmentos (Iterable[numpy.ndarray]): Registros de la bitácora
+
+    Yields:
+        tuple: (id_sesion, acciones_usuario, resultados) del fragmento, como arrays de NumPy
+    """
+    for fragmento in fragmentos:
+        resultados = evaluar_lote(fragmento["usuario"], fragmento["computadora"])
+        yield fragmento["id_sesion"], fragmento["usuario"], resultados
+
+
+class AnalizadorSesiones:
+    """Agrega de forma incremental las estadísticas de cada sesión."""
+
+    def __init__(self):
+        self.sesiones = {}
+
+    def procesar(self, ids_sesion, acciones_usuario, resultados):
+        """
+        Incorpora un fragmento de rondas a las estadísticas.
+
+        Args:
+            ids_sesion (numpy.ndarray): Sesión de cada ronda
+            acciones_usuario (numpy.ndarray): Acción del usuario en cada ronda
+            resultados (numpy.ndarray): Resultado de cada ronda (perspectiva del usuario)
+        """
+        if not len(ids_sesion):
+            return
+
+        num_acciones = len(AccionJuego)
+        num_resultados = len(ResultadoJuego)
+
+        # Agrupar por sesión conservando el orden de juego dentro de cada una
+        orden = np.argsort(ids_sesion, kind="stable")
+        acciones = acciones_usuario[orden].astype(np.intp)
+        resultados = resultados[orden].astype(np.intp)
+        ids, primeras, rondas = np.unique(ids_sesion[orden], return_index=True, return_counts=True)
+        num_sesiones = len(ids)
+        indice = np.repeat(np.arange(num_sesiones), rondas)
+
+        conteo_acciones = np.bincount(indice * num_acciones + acciones,
+                                      minlength=num_sesiones * num_acciones).reshape(num_sesiones, -1)
+        conteo_resultados = np.bincount(indice * num_resultados + resultados,
+                                        minlength=num_sesiones * num_resultados).reshape(num_sesiones, -1)
+
+        # Transiciones entre rondas consecutivas de la misma sesión dentro del fragmento
+        misma_sesion = indice[1:] == indice[:-1]
+        codigos = (indice[1:] * num_acciones + acciones[:-1]) * num_acciones + acciones[1:]
+        conteo_transiciones = np.bincount(codigos[misma_sesion],
+                                          minlength=num_sesiones * num_acciones ** 2).reshape(num_sesiones, -1)
+
+        # Rachas: tramos de resultados iguales consecutivos dentro de cada sesión
+        corte = np.ones(len(resultados), dtype=bool)
+        corte[1:] = ~misma_sesion | (resultados[1:] != resultados[:-1])
+        inicios_racha = np.flatnonzero(corte)
+        longitudes = np.diff(np.append(inicios_racha, len(resultados)))
+        sesion_racha = indice[inicios_racha]
+        resultado_racha = resultados[inicios_racha]
+        es_primera = np.ones(len(inicios_racha), dtype=bool)
+        es_primera[1:] = sesion_racha[1:] != sesion_racha[:-1]
+        es_ultima = np.ones(len(inicios_racha), dtype=bool)
+        es_ultima[:-1] = es_primera[1:]
+
+        # La primera racha de cada sesión continúa la que venía del fragmento anterior
+        estadisticas = [self._obtener(int(id_sesion)) for id_sesion in ids]
+        racha_previa = np.array([e.longitud_racha for e in estadisticas])
+        resultado_previo = np.array([-1 if e.resultado_racha is None else e.resultado_racha
+                                     for e in estadisticas])
+        continua = es_primera & (resultado_racha == resultado_previo[sesion_racha])
+        longitudes[continua] += racha_previa[sesion_racha[continua]]
+
+        maximas = np.zeros((num_sesiones, num_resultados), dtype=longitudes.dtype)
+        np.maximum.at(maximas, (sesion_racha, resultado_racha), longitudes)
+        ultimas = np.flatnonzero(es_ultima)
+
+        for posicion, e in enumerate(estadisticas):
+            primera = primeras[posicion]
+            if e.ultima_accion is not None:
+                # Transición entre la última acción del fragmento anterior y la primera de este
+                e.transiciones[e.ultima_accion * num_acciones + acciones[primera]] += 1
+            e.rondas += int(rondas[posicion])
+            e.acciones = [a + b for a, b in zip(e.acciones, conteo_acciones[posicion].tolist())]
+            e.resultados = [a + b for a, b in zip(e.resultados, conteo_resultados[posicion].tolist())]
+            e.transiciones = [a + b for a, b in zip(e.transiciones, conteo_transiciones[posicion].tolist())]
+            e.rachas_maximas = [max(a, b) for a, b in zip(e.rachas_maximas, maximas[posicion].tolist())]
+            e.ultima_accion = int(acciones[primera + rondas[posicion] - 1])
+            ultima = ultimas[posicion]
+            e.resultado_racha = int(resultado_racha[ultima])
+            e.longitud_racha = int(longitudes[ultima])
+
+    def _obtener(self, id_sesion):
+        """Devuelve las estadísticas de una sesión, creándolas si es nueva."""
+        estadisticas = self.sesiones.get(id_sesion)
+        if estadisticas is None:
+            estadisticas = self.sesiones[id_sesion] = EstadisticasSesion(id_sesion)
+        return estadisticas
+
+
+def analizar(archivo, registros_por_fragmento=REGISTROS_POR_FRAGMENTO):
+    """
+    Resume una bitácora completa en una sola pasada.
+
+    Args:
+        archivo (BinaryIO): Flujo binario con la bitácora
+        registros_por_fragmento (int): Registros leídos en cada fragmento
+
+    Returns:
+        dict: EstadisticasSesion de cada sesión, indexadas por id_sesion
+    """
+    analizador = AnalizadorSesiones()
+    for ids_sesion, acciones_usuario, resultados in evaluar_fragmentos(
+            leer_fragmentos(archivo, registros_por_fragmento)):
+        analizador.procesar(ids_sesion, acciones_usuario, resultados)
+    return analizador.sesiones
+
+
+def main():
+    """Función principal que analiza una bitácora desde la línea de comandos."""
+    parser = argparse.ArgumentParser(description="Estadísticas por sesión de una bitácora de Piedra, Papel y Tijeras")
+    parser.add_argument("bitacora", nargs="?", default="-",
+                        help="Archivo de bitácora (por defecto, '-' = entrada estándar)")
+    parser.add_argument("--fragmento", type=int, default=REGISTROS_POR_FRAGMENTO,
+                        help="Registros leídos en cada fragmento")
+    argumentos = parser.parse_args()
+
+    if argumentos.bitacora == "-":
+        sesiones = analizar(sys.stdin.buffer, argumentos.fragmento)
+    else:
+        with open(argumentos.bitacora, "rb") as archivo:
+            sesiones = analizar(archivo, argumentos.fragmento)
+
+    # Una línea JSON por sesión, para poder encadenar con otras herramientas
+    for id_sesion in sorted(sesiones):
+        print(json.dumps(sesiones[id_sesion].como_dict(), ensure_ascii=False))
+
+
+if __name__ == "__main__":
+    main()
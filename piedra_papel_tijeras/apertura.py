@@ -0,0 +1,354 @@
+"""
+Piedra, Papel y Tijeras - Libro de aperturas
+============================================
+Respuestas precalculadas para las primeras rondas de una partida, extraídas
+de las bitácoras de partidas anteriores, para que las sesiones nuevas no
+empiecen jugando al azar.
+
+Características:
+- Estadística agregada de las primeras k acciones de los usuarios: para cada
+  secuencia inicial (prefijo), cuántas veces se eligió cada acción a continuación
+- Compilación a una tabla de bytes con la respuesta a cada prefijo (la
+  acción que vence a la más frecuente), consultada en O(1)
+- Los prefijos se codifican como un número en base N con su longitud,
+  igual que la ventana de la estrategia de frecuencias
+- Solo se responde con prefijos vistos suficientes veces; en los demás
+  casos decide la IA de la sesión
+- Actualización incremental: el libro recuerda hasta qué registro leyó la
+  bitácora y las sesiones aún en apertura, y solo procesa lo añadido después
+- Cargar y consultar el libro solo usa la biblioteca estándar; extraerlo de
+  las bitácoras requiere NumPy
+
+Formato del archivo:
+    Cabecera de 8 bytes (MAGIA_LIBRO), parámetros (CABECERA_LIBRO), conteos
+    uint32 de cada prefijo y acción siguiente, y sesiones pendientes (PENDIENTE_LIBRO)
+"""
+
+import os
+import struct
+from array import array
+
+from .nucleo import AccionJuego
+from .reglas import REGLAS_CLASICAS
+
+# Cabecera que identifica el archivo y la versión del formato
+MAGIA_LIBRO = b"PPTBOOK\x01"
+
+# <profundidad: uint8> <acciones: uint8> <relleno: 2 bytes> <min_muestras: uint32>
+# <registros leídos de la bitácora: uint64> <sesiones pendientes: uint32> <relleno: 4 bytes>
+CABECERA_LIBRO = struct.Struct("<BBxxIQI4x")
+
+# Sesión que aún no ha completado la apertura: <id_sesion: uint64> <rondas: uint32> <prefijo: uint32>
+PENDIENTE_LIBRO = struct.Struct("<QII")
+
+# Número de primeras rondas que cubre el libro
+PROFUNDIDAD_APERTURA = 4
+
+# Veces que debe haberse visto un prefijo para responder con el libro
+MIN_MUESTRAS_APERTURA = 20
+
+# Sesiones en apertura que se recuerdan entre actualizaciones (se olvidan las más antiguas)
+MAX_PENDIENTES_APERTURA = 1 << 16
+
+# Valor de la tabla de respuestas para los prefijos sin respuesta
+SIN_RESPUESTA = 0xFF
+
+# Acciones indexadas por su valor, para convertir sin llamar al enum
+_ACCIONES = tuple(AccionJuego)
+
+
+class LibroAperturas:
+    """Estadística de las primeras acciones de los usuarios y respuesta compilada a cada prefijo."""
+
+    __slots__ = ("profundidad", "min_muestras", "num_acciones", "desplazamientos", "conteos",
+                 "respuestas", "pendientes", "registros_leidos")
+
+    def __init__(self, profundidad=PROFUNDIDAD_APERTURA, min_muestras=MIN_MUESTRAS_APERTURA):
+        """
+        Args:
+            profundidad (int): Número de primeras rondas que cubre el libro
+            min_muestras (int): Veces que debe haberse visto un prefijo para responder
+
+        Raises:
+            ValueError: Si la profundidad no está entre 1 y 16
+        """
+        if not 1 <= profundidad <= 16:
+            raise ValueError("La profundidad del libro debe estar entre 1 y 16")
+        self.profundidad = profundidad
+        self.min_muestras = min_muestras
+        self.num_acciones = len(AccionJuego)
+        # El prefijo de longitud L empieza en la posición N^0 + N^1 + ... + N^(L-1)
+        self.desplazamientos = [0]
+        for longitud in range(profundidad - 1):
+            self.desplazamientos.append(self.desplazamientos[-1] + self.num_acciones ** longitud)
+        num_prefijos = self.desplazamientos[-1] + self.num_acciones ** (profundidad - 1)
+        # conteos[prefijo * N + accion]: veces que un usuario eligió accion tras ese prefijo
+        self.conteos = array("I", bytes(4 * num_prefijos * self.num_acciones))
+        self.respuestas = bytes([SIN_RESPUESTA]) * num_prefijos
+        # Sesiones a medio abrir: id_sesion => (rondas vistas, prefijo codificado)
+        self.pendientes = {}
+        self.registros_leidos = 0
+
+    def respuesta(self, longitud, prefijo):
+        """
+        Consulta la respuesta del libro tras las primeras acciones del usuario.
+
+        Args:
+            longitud (int): Número de acciones del prefijo (menor que la profundidad)
+            prefijo (int): Acciones del prefijo codificadas en base N (la primera, la más significativa)
+
+        Returns:
+            AccionJuego | None: La acción de la computadora, o None si el libro no tiene respuesta
+        """
+        respuesta = self.respuestas[self.desplazamientos[longitud] + prefijo]
+        return None if respuesta == SIN_RESPUESTA else _ACCIONES[respuesta]
+
+    def registrar(self, id_sesion, ronda, accion_usuario):
+        """
+        Incorpora una acción de la bitácora si pertenece a la apertura de su sesión.
+
+        Args:
+            id_sesion (int): Identificador de la sesión
+            ronda (int): Número de ronda dentro de la sesión (empezando en 0)
+            accion_usuario (int): La acción del usuario
+
+        Returns:
+            bool: Si la acción se ha contado
+        """
+        if ronda >= self.profundidad:
+            return False
+        if ronda == 0:
+            prefijo = 0
+        else:
+            # Sin las rondas anteriores de la sesión (p. ej. anteriores a la bitácora) no hay prefijo
+            vistas, prefijo = self.pendientes.pop(id_sesion, (None, 0))
+            if vistas != ronda:
+                return False
+
+        self.conteos[(self.desplazamientos[ronda] + prefijo) * self.num_acciones + accion_usuario] += 1
+        if ronda + 1 < self.profundidad:
+            if len(self.pendientes) >= MAX_PENDIENTES_APERTURA:
+                # Se olvida la sesión pendiente más antigua (orden de inserción del dict)
+                del self.pendientes[next(iter(self.pendientes))]
+            self.pendientes[id_sesion] = (ronda + 1, prefijo * self.num_acciones + accion_usuario)
+        return True
+
+    def compilar(self):
+        """Recalcula la tabla de respuestas a partir de los conteos."""
+        num_acciones = self.num_acciones
+        respuestas = bytearray(len(self.respuestas))
+        for posicion in range(len(respuestas)):
+            conteos = self.conteos[posicion * num_acciones:(posicion + 1) * num_acciones]
+            maximo = max(conteos)
+            if sum(conteos) < self.min_muestras or not maximo:
+                respuestas[posicion] = SIN_RESPUESTA
+            else:
+                # A igualdad de conteos, la acción de menor valor
+                respuestas[posicion] = REGLAS_CLASICAS.tabla_ganadoras[conteos.index(maximo)]
+        self.respuestas = bytes(respuestas)
+
+    def actualizar(self, ruta_bitacora, registros_por_fragmento=1 << 16):
+        """
+        Incorpora los registros añadidos a una bitácora desde la última actualización (requiere NumPy).
+
+        Args:
+            ruta_bitacora (str | os.PathLike): Bitácora del servidor
+            registros_por_fragmento (int): Registros procesados de cada vez
+
+        Returns:
+            int: Registros nuevos leídos
+
+        Raises:
+            ValueError: Si la bitácora tiene menos registros de los ya leídos (es otro archivo)
+        """
+        from .bitacora import leer_bitacora
+
+        registros = leer_bitacora(ruta_bitacora)
+        if len(registros) < self.registros_leidos:
+            raise ValueError(f"{ruta_bitacora} tiene menos registros de los que ya contiene el libro")
+
+        nuevos = len(registros) - self.registros_leidos
+        for inicio in range(self.registros_leidos, len(registros), registros_por_fragmento):
+            fragmento = registros[inicio:inicio + registros_por_fragmento]
+            # Solo se recorren en Python los registros de las primeras rondas
+            apertura = fragmento[fragmento["ronda"] < self.profundidad]
+            for id_sesion, ronda, accion in zip(apertura["id_sesion"].tolist(), apertura["ronda"].tolist(),
+                                                apertura["usuario"].tolist()):
+                self.registrar(id_sesion, ronda, accion)
+        self.registros_leidos = len(registros)
+        self.compilar()
+        return nuevos
+
+    def guardar(self, ruta):
+        """
+        Escribe el libro en un archivo de forma atómica.
+
+        Args:
+            ruta (str | os.PathLike): Ruta del archivo
+        """
+        temporal = f"{ruta}.tmp"
+        with open(temporal, "wb") as archivo:
+            archivo.write(MAGIA_LIBRO)
+            archivo.write(CABECERA_LIBRO.pack(self.profundidad, self.num_acciones, self.min_muestras,
+                                              self.registros_leidos, len(self.pendientes)))
+            archivo.write(self.conteos.tobytes())
+            archivo.write(b"".join(PENDIENTE_LIBRO.pack(id_sesion, vistas, prefijo)
+                                   for id_sesion, (vistas, prefijo) in self.pendientes.items()))
+        os.replace(temporal, ruta)
+
+    def como_dict(self):
+        """
+        Returns:
+            dict: Parámetros y respuesta de cada prefijo con respuesta (prefijo como nombres de acciones)
+        """
+        aperturas = {}
+        for longitud in range(self.profundidad):
+            for prefijo in range(self.num_acciones ** longitud):
+                respuesta = self.respuesta(longitud, prefijo)
+                if respuesta is not None:
+                    acciones = [_ACCIONES[prefijo // self.num_acciones ** (longitud - 1 - posicion)
+                                          % self.num_acciones].name for posicion in range(longitud)]
+                    aperturas[",".join(acciones) or "-"] = respuesta.name
+        return {
+            "profundidad": self.profundidad,
+            "min_muestras": self.min_muestras,
+            "registros_leidos": self.registros_leidos,
+            "sesiones_pendientes": len(self.pendientes),
+            "aperturas": aperturas,
+        }
+
+
+def cargar_libro(ruta):
+    """
+    Lee un libro guardado con LibroAperturas.guardar() y compila sus respuestas.
+
+    Args:
+        ruta (str | os.PathLike): Ruta del archivo
+
+    Returns:
+        LibroAperturas: El libro listo para consultar
+
+    Raises:
+        ValueError: Si el archivo no es un libro de aperturas válido
+    """
+    with open(ruta, "rb") as archivo:
+        contenido = archivo.read()
+    if not contenido.startswith(MAGIA_LIBRO):
+        raise ValueError(f"{ruta} no es un libro de aperturas de Piedra, Papel y Tijeras")
+
+    posicion = len(MAGIA_LIBRO)
+    profundidad, num_acciones, min_muestras, registros_leidos, num_pendientes = \
+        CABECERA_LIBRO.unpack_from(contenido, posicion)
+    posicion += CABECERA_LIBRO.size
+    if num_acciones != len(AccionJuego):
+        raise ValueError(f"{ruta} es un libro para {num_acciones} acciones")
+
+    libro = LibroAperturas(profundidad, min_muestras)
+    tamano_conteos = len(libro.conteos) * libro.conteos.itemsize
+    fin_pendientes = posicion + tamano_conteos + num_pendientes * PENDIENTE_LIBRO.size
+    if len(contenido) != fin_pendientes:
+        raise ValueError(f"{ruta} está incompleto o dañado")
+    libro.conteos = array("I", contenido[posicion:posicion + tamano_conteos])
+    libro.pendientes = {
+        id_sesion: (vistas, prefijo)
+        for id_sesion, vistas, prefijo in PENDIENTE_LIBRO.iter_unpack(contenido[posicion + tamano_conteos:])
+    }
+    libro.registros_leidos = registros_leidos
+    libro.compilar()
+    return libro
+
+
+class JugadorConApertura:
+    """Jugador que responde con el libro en las primeras rondas y delega después en otro jugador."""
+
+    __slots__ = ("jugador", "libro", "_rondas", "_prefijo", "_vistas")
+
+    def __init__(self, jugador, libro):
+        """
+        Args:
+            jugador (callable): Jugador de simulacion.JUGADORES que decide fuera del libro
+            libro (LibroAperturas): Libro de aperturas compartido (solo se consulta)
+        """
+        self.jugador = jugador
+        self.libro = libro
+        # Rondas de la apertura ya incorporadas al prefijo (como máximo, la profundidad)
+        self._rondas = 0
+        self._prefijo = 0
+        # Posición del historial hasta la que ya se ha leído
+        self._vistas = 0
+
+    def __call__(self, acciones_propias, acciones_rival, resultados_rival):
+        # El jugador decide siempre, para que su estado y su flujo aleatorio no dependan del libro
+        accion = self.jugador(acciones_propias, acciones_rival, resultados_rival)
+
+        profundidad = self.libro.profundidad
+        num_acciones = self.libro.num_acciones
+        while self._vistas < len(acciones_rival) and self._rondas < profundidad:
+            self._prefijo = self._prefijo * num_acciones + acciones_rival[self._vistas]
+            self._rondas += 1
+            self._vistas += 1
+        self._vistas = len(acciones_rival)
+
+        if self._rondas < profundidad:
+            respuesta = self.libro.respuesta(self._rondas, self._prefijo)
+            if respuesta is not None:
+                return respuesta
+        return accion
+
+    @property
+    def compactable(self):
+        """bool: Solo se puede compactar si el jugador envuelto también puede."""
+        return getattr(self.jugador, "compactable", False)
+
+    def exportar_estado(self):
+        """
+        Returns:
+            tuple: (estado del jugador envuelto, rondas de apertura vistas, prefijo codificado)
+        """
+        return self.jugador.exportar_estado(), self._rondas, self._prefijo
+
+    def importar_estado(self, estado, rondas_vistas=0):
+        """
+        Args:
+            estado (tuple): Estado devuelto por exportar_estado()
+            rondas_vistas (int): Longitud del historial que se considera ya leída
+        """
+        estado_jugador, self._rondas, self._prefijo = estado
+        self._vistas = rondas_vistas
+        self.jugador.importar_estado(estado_jugador, rondas_vistas)
+
+
+def main():
+    """Función principal que construye o actualiza un libro de aperturas desde la línea de comandos."""
+    import argparse
+    import json
+
+    parser = argparse.ArgumentParser(description="Construye o actualiza un libro de aperturas a partir de bitácoras")
+    parser.add_argument("bitacora", nargs="?", help="Bitácora del servidor (sin ella, solo se muestra el libro)")
+    parser.add_argument("--libro", required=True, help="Archivo del libro; si existe, se actualiza")
+    parser.add_argument("--profundidad", type=int, default=PROFUNDIDAD_APERTURA,
+                        help="Primeras rondas que cubre un libro nuevo")
+    parser.add_argument("--min-muestras", type=int,
+                        help=f"Veces que debe verse un prefijo para responder con el libro "
+                             f"(por defecto, la del libro o {MIN_MUESTRAS_APERTURA})")
+    argumentos = parser.parse_args()
+
+    try:
+        if os.path.exists(argumentos.libro):
+            libro = cargar_libro(argumentos.libro)
+            if argumentos.min_muestras is not None:
+                libro.min_muestras = argumentos.min_muestras
+                libro.compilar()
+        else:
+            libro = LibroAperturas(argumentos.profundidad, argumentos.min_muestras or MIN_MUESTRAS_APERTURA)
+        if argumentos.bitacora:
+            libro.actualizar(argumentos.bitacora)
+            libro.guardar(argumentos.libro)
+    except (OSError, ValueError) as error:
+        parser.error(str(error))
+
+    print(json.dumps(libro.como_dict(), ensure_ascii=False))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,263 @@
+"""
+Piedra, Papel y Tijeras - Flujos aleatorios reproducibles
+=========================================================
+Generadores aleatorios propios de cada sesión, con semillas explícitas, en
+lugar del módulo random global compartido por todo el proceso.
+
+Características:
+- Semillas derivadas de forma determinista (semilla base + identificador de
+  sesión), de modo que cada sesión se puede repetir bit a bit
+- FlujoAleatorio: acciones aleatorias sacadas por bloques precalculados;
+  cada acción es la lectura de un byte del bloque
+- Cada bloque tiene su propia semilla, así que el flujo puede saltar a
+  cualquier posición sin generar las anteriores
+- Los bloques se generan con random.randbytes() y bytes.translate(), sin
+  bucles de Python ni dependencias externas; también se pueden leer como
+  arrays de NumPy para la simulación por lotes
+- GeneradorReanudable: random.Random con la misma secuencia que el original
+  que cuenta los números de 32 bits consumidos; su estado es un entero (en
+  lugar de los 2,5 KB del Mersenne Twister) y se restaura avanzando la
+  semilla en C hasta esa posición
+"""
+
+import os
+import random
+
+from .nucleo import AccionJuego
+
+# Acciones aleatorias precalculadas en cada bloque
+TAMANO_BLOQUE_AZAR = 4096
+
+# Números de 32 bits que se descartan en cada llamada al avanzar un GeneradorReanudable
+_PALABRAS_SALTO = 1 << 16
+
+# Métodos en C de random.Random, llamados directamente para que contar no cueste un super()
+_RANDOM = random.Random.random
+_GETRANDBITS = random.Random.getrandbits
+
+
+def derivar_semilla(*partes):
+    """
+    Deriva una semilla de 64 bits a partir de varios valores.
+
+    El resultado depende solo de los valores (no del proceso ni del orden
+    de creación), de modo que la misma sesión recibe siempre la misma semilla.
+
+    Args:
+        *partes: Valores que identifican el flujo (semilla base, id de sesión...)
+
+    Returns:
+        int: Semilla derivada
+    """
+    return random.Random(":".join(map(str, partes))).getrandbits(64)
+
+
+def semilla_nueva():
+    """
+    Returns:
+        int: Semilla de 64 bits tomada del sistema operativo, para poder registrarla y repetir la partida
+    """
+    return int.from_bytes(os.urandom(8))
+
+
+class FlujoAleatorio:
+    """Secuencia reproducible de acciones aleatorias servida por bloques."""
+
+    __slots__ = ("semilla", "num_acciones", "tamano_bloque", "_traduccion", "_descartes",
+                 "_bloque", "_indice_bloque", "_posicion")
+
+    def __init__(self, semilla=None, num_acciones=len(AccionJuego), tamano_bloque=TAMANO_BLOQUE_AZAR):
+        """
+        Args:
+            semilla (int | None): Semilla del flujo (None = una nueva del sistema operativo)
+            num_acciones (int): Número de acciones distintas (hasta 256)
+            tamano_bloque (int): Acciones precalculadas en cada bloque
+
+        Raises:
+            ValueError: Si el número de acciones no está entre 1 y 256
+        """
+        if not 1 <= num_acciones <= 256:
+            raise ValueError("El número de acciones debe estar entre 1 y 256")
+        self.semilla = semilla_nueva() if semilla is None else semilla
+        self.num_acciones = num_acciones
+        self.tamano_bloque = tamano_bloque
+        # Cada byte aleatorio se reduce módulo N; los bytes del último tramo incompleto se
+        # descartan para que todas las acciones sean igual de probables
+        limite = 256 - 256 % num_acciones
+        self._traduccion = bytes(valor % num_acciones if valor < limite else 0 for valor in range(256))
+        self._descartes = bytes(range(limite, 256))
+        self._cargar(0)
+
+    def _cargar(self, indice_bloque):
+        """Genera el bloque indicado y se sitúa al principio."""
+        rng = random.Random(f"{self.semilla}:{indice_bloque}")
+        bloque = b""
+        while len(bloque) < self.tamano_bloque:
+            faltan = self.tamano_bloque - len(bloque)
+            bloque += rng.randbytes(faltan).translate(self._traduccion, self._descartes)
+        self._bloque = bloque
+        self._indice_bloque = indice_bloque
+        self._posicion = 0
+
+    def siguiente(self):
+        """
+        Returns:
+            int: La siguiente acción del flujo
+        """
+        if self._posicion == self.tamano_bloque:
+            self._cargar(self._indice_bloque + 1)
+        accion = self._bloque[self._posicion]
+        self._posicion += 1
+        return accion
+
+    def extraer(self, cantidad):
+        """
+        Saca varias acciones seguidas del flujo.
+
+        Args:
+            cantidad (int): Número de acciones
+
+        Returns:
+            bytes: Las acciones, en el mismo orden en que las daría siguiente()
+        """
+        partes = []
+        while cantidad:
+            if self._posicion == self.tamano_bloque:
+                self._cargar(self._indice_bloque + 1)
+            tomadas = min(cantidad, self.tamano_bloque - self._posicion)
+            partes.append(self._bloque[self._posicion:self._posicion + tomadas])
+            self._posicion += tomadas
+            cantidad -= tomadas
+        return b"".join(partes)
+
+    def extraer_array(self, cantidad):
+        """
+        Saca varias acciones seguidas como array de NumPy (requiere NumPy).
+
+        Args:
+            cantidad (int): Número de acciones
+
+        Returns:
+            numpy.ndarray: Las acciones (uint8)
+        """
+        import numpy as np
+        return np.frombuffer(self.extraer(cantidad), dtype=np.uint8)
+
+    @property
+    def consumidas(self):
+        """int: Acciones sacadas del flujo desde el principio."""
+        return self._indice_bloque * self.tamano_bloque + self._posicion
+
+    def saltar_a(self, consumidas):
+        """
+        Sitúa el flujo como si ya se hubieran sacado esas acciones.
+
+        Args:
+            consumidas (int): Posición dentro del flujo
+        """
+        indice_bloque, posicion = divmod(consumidas, self.tamano_bloque)
+        if indice_bloque != self._indice_bloque:
+            self._cargar(indice_bloque)
+        self._posicion = posicion
+
+    def exportar_estado(self):
+        """
+        Returns:
+            int: Acciones consumidas (la semilla ya identifica el resto del flujo)
+        """
+        return self.consumidas
+
+    def importar_estado(self, estado):
+        """
+        Args:
+            estado (int): Posición devuelta por exportar_estado()
+        """
+        self.saltar_a(estado)
+
+
+class GeneradorReanudable(random.Random):
+    """random.Random con semilla conocida que cuenta lo consumido para poder reanudarse."""
+
+    def __init__(self, semilla=None):
+        """
+        Args:
+            semilla (int | None): Semilla del generador (None = una nueva, consultable en self.semilla)
+        """
+        super().__init__(semilla)
+
+    def seed(self, a=None, version=2):
+        """Siembra el generador y pone a cero la cuenta de números consumidos."""
+        self.semilla = semilla_nueva() if a is None else a
+        self.consumidas = 0
+        super().seed(self.semilla, version)
+
+    def random(self):
+        # Cada float de 53 bits consume dos números de 32 bits del Mersenne Twister
+        self.consumidas += 2
+        return _RANDOM(self)
+
+    def getrandbits(self, k):
+        # randbytes() y las llamadas directas pasan por aquí: un número de 32 bits por cada 32 bits pedidos
+        self.consumidas += (k + 31) // 32
+        return _GETRANDBITS(self, k)
+
+    def _randbelow(self, n):
+        # Mismo rechazo que random.Random._randbelow_with_getrandbits, sin pasar por getrandbits()
+        k = n.bit_length()
+        palabras = (k + 31) // 32
+        r = _GETRANDBITS(self, k)
+        consumidas = palabras
+        while r >= n:
+            r = _GETRANDBITS(self, k)
+            consumidas += palabras
+        self.consumidas += consumidas
+        return r
+
+    def exportar_estado(self):
+        """
+        Returns:
+            int: Números de 32 bits consumidos (la semilla ya identifica el resto de la secuencia)
+        """
+        return self.consumidas
+
+    def importar_estado(self, estado):
+        """
+        Avanza el generador hasta la posición indicada (volviendo a sembrarlo si ya la ha pasado).
+
+        Args:
+            estado (int): Posición devuelta por exportar_estado()
+        """
+        if estado < self.consumidas:
+            self.seed(self.semilla)
+        restantes = estado - self.consumidas
+        while restantes:
+            # getrandbits(32 * n) genera exactamente n números de 32 bits en C
+            palabras = min(restantes, _PALABRAS_SALTO)
+            _GETRANDBITS(self, 32 * palabras)
+            restantes -= palabras
+        self.consumidas = estado
+
+
+def exportar_generador(rng):
+    """
+    Obtiene la posición de un generador recibido desde fuera, si se puede reanudar.
+
+    Args:
+        rng (random.Random): El generador
+
+    Returns:
+        int | None: Posición del GeneradorReanudable (None para cualquier otro generador)
+    """
+    return rng.exportar_estado() if isinstance(rng, GeneradorReanudable) else None
+
+
+def importar_generador(rng, estado):
+    """
+    Restaura la posición de un generador recibido desde fuera, si se puede reanudar.
+
+    Args:
+        rng (random.Random): El generador
+        estado (int | None): Posición devuelta por exportar_generador()
+    """
+    if estado is not None and isinstance(rng, GeneradorReanudable):
+        rng.importar_estado(estado)
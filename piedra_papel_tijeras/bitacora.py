@@ -0,0 +1,250 @@
+"""
+Piedra, Papel y Tijeras - Bitácora binaria de partidas
+======================================================
+Registro persistente de rondas en un archivo binario de solo añadido, con
+registros de tamaño fijo que se leen sin copias mediante mmap y NumPy.
+
+Características:
+- Registro de 16 bytes por ronda: sesión, número de ronda, acción del usuario,
+  acción de la computadora y resultado (desde la perspectiva del usuario)
+- Las acciones y resultados se guardan con sus valores de AccionJuego / ResultadoJuego
+- Escritura con buffer propio: una llamada al sistema cada muchos registros
+- Lectura con mmap + numpy.frombuffer: un array estructurado que apunta al
+  archivo, sin convertir cada ronda en objetos de Python
+- La escritura solo usa la librería estándar; NumPy solo es necesario para leer
+- Un registro incompleto al final (caída durante la escritura) se ignora al
+  leer y se descarta al reabrir la bitácora, para que los registros nuevos
+  sigan alineados
+- Al reabrirla se conoce el mayor identificador de sesión registrado, para
+  que las sesiones de un nuevo arranque no reutilicen los de arranques anteriores
+
+Formato del archivo:
+    Cabecera de 8 bytes (MAGIA_BITACORA) seguida de registros little-endian
+    <id_sesion: uint64> <ronda: uint32> <usuario: uint8> <computadora: uint8> <resultado: uint8> <relleno: 1 byte>
+"""
+
+import mmap
+import os
+import struct
+
+# Cabecera que identifica el archivo y la versión del formato
+MAGIA_BITACORA = b"PPTLOG\x01\x00"
+
+# Estructura de un registro (tamaño fijo y alineado a 8 bytes)
+FORMATO_REGISTRO = struct.Struct("<QIBBBx")
+TAMANO_REGISTRO = FORMATO_REGISTRO.size
+
+# Solo el identificador de sesión de cada registro
+_FORMATO_ID_SESION = struct.Struct("<Q8x")
+
+# Registros que se acumulan en memoria antes de escribirlos en el archivo
+REGISTROS_POR_BUFFER = 4096
+
+# Tipo NumPy equivalente a FORMATO_REGISTRO (se construye al leer por primera vez)
+_TIPO_REGISTRO = None
+
+
+def tipo_registro():
+    """
+    Obtiene el tipo estructurado de NumPy que corresponde a un registro.
+
+    Returns:
+        numpy.dtype: Campos id_sesion, ronda, usuario, computadora y resultado
+    """
+    global _TIPO_REGISTRO
+    if _TIPO_REGISTRO is None:
+        import numpy as np
+
+        _TIPO_REGISTRO = np.dtype({
+            "names": ["id_sesion", "ronda", "usuario", "computadora", "resultado"],
+            "formats": ["<u8", "<u4", "u1", "u1", "u1"],
+            "offsets": [0, 8, 12, 13, 14],
+            "itemsize": TAMANO_REGISTRO,
+        })
+    return _TIPO_REGISTRO
+
+
+class EscritorBitacora:
+    """Añade rondas a una bitácora binaria acumulándolas en un buffer."""
+
+    def __init__(self, ruta, registros_por_buffer=REGISTROS_POR_BUFFER):
+        """
+        Abre (o crea) la bitácora para añadir registros al final.
+
+        Si el último registro quedó incompleto, se descarta antes de añadir
+        nada: los registros nuevos empiezan en un múltiplo de TAMANO_REGISTRO.
+        El mayor identificador de sesión ya registrado queda en
+        self.mayor_id_sesion (0 si la bitácora está vacía).
+
+        Args:
+            ruta (str | os.PathLike): Ruta del archivo de bitácora
+            registros_por_buffer (int): Registros acumulados antes de cada escritura
+
+        Raises:
+            ValueError: Si el archivo existe pero no es una bitácora válida
+        """
+        self.ruta = ruta
+        self._archivo = open(ruta, "ab")
+        tamano = self._archivo.tell()
+        self.mayor_id_sesion = 0
+        if tamano == 0:
+            self._archivo.write(MAGIA_BITACORA)
+        else:
+            try:
+                _validar_cabecera(ruta)
+            except ValueError:
+                self._archivo.close()
+                raise
+            completo = tamano - (tamano - len(MAGIA_BITACORA)) % TAMANO_REGISTRO
+            if completo != tamano:
+                self._archivo.truncate(completo)
+            self.mayor_id_sesion = mayor_id_sesion(ruta)
+        self._buffer = bytearray(registros_por_buffer * TAMANO_REGISTRO)
+        self._posicion = 0
+
+    def registrar(self, id_sesion, ronda, accion_usuario, accion_computadora, resultado):
+        """
+        Añade una ronda a la bitácora.
+
+        Args:
+            id_sesion (int): Identificador de la sesión
+            ronda (int): Número de ronda dentro de la sesión (empezando en 0)
+            accion_usuario (AccionJuego): La acción del usuario
+            accion_computadora (AccionJuego): La acción de la computadora
+            resultado (ResultadoJuego): El resultado desde la perspectiva del usuario
+        """
+        FORMATO_REGISTRO.pack_into(self._buffer, self._posicion, id_sesion, ronda,
+                                   accion_usuario, accion_computadora, resultado)
+        self._posicion += TAMANO_REGISTRO
+        if self._posicion == len(self._buffer):
+            self.vaciar()
+
+    def vaciar(self):
+        """Escribe en el archivo los registros pendientes del buffer."""
+        if self._posicion:
+            self._archivo.write(memoryview(self._buffer)[:self._posicion])
+            self._posicion = 0
+        self._archivo.flush()
+
+    def cerrar(self):
+        """Escribe los registros pendientes y cierra el archivo."""
+        if not self._archivo.closed:
+            self.vaciar()
+            self._archivo.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *_):
+        self.cerrar()
+
+
+def _validar_cabecera(ruta):
+    """Comprueba que el archivo empieza por la cabecera de bitácora."""
+    with open(ruta, "rb") as archivo:
+        if archivo.read(len(MAGIA_BITACORA)) != MAGIA_BITACORA:
+            raise ValueError(f"{ruta} no es una bitácora de Piedra, Papel y Tijeras")
+
+
+def mayor_id_sesion(ruta):
+    """
+    Obtiene el mayor identificador de sesión de la bitácora.
+
+    Con NumPy se calcula sobre el archivo mapeado con leer_bitacora(). Sin
+    NumPy se recorre el archivo por bloques de REGISTROS_POR_BUFFER registros,
+    así que la memoria usada no depende del tamaño de la bitácora.
+
+    Args:
+        ruta (str | os.PathLike): Ruta del archivo de bitácora
+
+    Returns:
+        int: El mayor identificador de sesión (0 si no hay registros completos)
+
+    Raises:
+        ValueError: Si el archivo no es una bitácora válida
+    """
+    try:
+        ids_sesion = leer_bitacora(ruta)["id_sesion"]
+    except ImportError:
+        return _mayor_id_sesion_por_bloques(ruta)
+    return int(ids_sesion.max()) if ids_sesion.size else 0
+
+
+def _mayor_id_sesion_por_bloques(ruta):
+    """Versión de mayor_id_sesion() sin NumPy: desempaqueta el archivo por bloques."""
+    _validar_cabecera(ruta)
+    mayor = 0
+    tamano_bloque = REGISTROS_POR_BUFFER * TAMANO_REGISTRO
+    with open(ruta, "rb") as archivo:
+        archivo.seek(len(MAGIA_BITACORA))
+        while bloque := archivo.read(tamano_bloque):
+            completos = len(bloque) - len(bloque) % TAMANO_REGISTRO
+            if completos:
+                mayor = max(mayor, max(_FORMATO_ID_SESION.iter_unpack(bloque[:completos]))[0])
+    return mayor
+
+
+def leer_bitacora(ruta):
+    """
+    Proyecta la bitácora en memoria como un array estructurado de NumPy.
+
+    El array apunta directamente al archivo mapeado (sin copias): solo se leen
+    del disco las páginas que se consultan. Un registro incompleto al final
+    (por ejemplo, tras una caída durante la escritura) se ignora.
+
+    Args:
+        ruta (str | os.PathLike): Ruta del archivo de bitácora
+
+    Returns:
+        numpy.ndarray: Registros con los campos de tipo_registro() (solo lectura)
+
+    Raises:
+        ValueError: Si el archivo no es una bitácora válida
+    """
+    import numpy as np
+
+    _validar_cabecera(ruta)
+    tamano = os.path.getsize(ruta)
+    num_registros = (tamano - len(MAGIA_BITACORA)) // TAMANO_REGISTRO
+    if not num_registros:
+        return np.empty(0, dtype=tipo_registro())
+
+    with open(ruta, "rb") as archivo:
+        # El array mantiene vivo el mapeo aunque se cierre el archivo
+        mapa = mmap.mmap(archivo.fileno(), 0, access=mmap.ACCESS_READ)
+    return np.frombuffer(mapa, dtype=tipo_registro(), count=num_registros, offset=len(MAGIA_BITACORA))
+
+
+def rondas_sesion(registros, id_sesion):
+    """
+    Selecciona las rondas de una sesión en orden de juego.
+
+    Args:
+        registros (numpy.ndarray): Registros devueltos por leer_bitacora()
+        id_sesion (int): Identificador de la sesión
+
+    Returns:
+        numpy.ndarray: Registros de la sesión ordenados por número de ronda
+    """
+    import numpy as np
+
+    seleccion = registros[registros["id_sesion"] == id_sesion]
+    return seleccion[np.argsort(seleccion["ronda"], kind="stable")]
+
+
+def historial_sesion(registros, id_sesion):
+    """
+    Reconstruye el historial compacto de una sesión para reanudarla o analizarla.
+
+    Args:
+        registros (numpy.ndarray): Registros devueltos por leer_bitacora()
+        id_sesion (int): Identificador de la sesión
+
+    Returns:
+        HistorialPartida: El historial de la sesión, codificado de forma vectorizada
+    """
+    from .historial import HistorialPartida
+
+    rondas = rondas_sesion(registros, id_sesion)
+    bytes_rondas = rondas["usuario"] | (rondas["computadora"] << 2) | (rondas["resultado"] << 4)
+    return HistorialPartida(bytes_rondas.tobytes())
@@ -0,0 +1,123 @@
+"""
+Piedra, Papel y Tijeras - Generador de carga para el servidor
+=============================================================
+Cliente que simula miles de jugadores conectados a la vez al servidor de
+red y mide la latencia de cada jugada.
+
+Características:
+- Miles de conexiones simultáneas desde un único bucle de eventos
+- Cada jugador simulado juega un número fijo de rondas con acciones aleatorias
+- Latencia medida por jugada (desde el envío de la acción hasta la respuesta)
+- Informe final con rondas por segundo y percentiles p50/p99
+"""
+
+import argparse
+import asyncio
+import random
+import statistics
+import time
+
+from .servidor import (ESTRATEGIA_POR_DEFECTO, HOST_POR_DEFECTO, PUERTO_POR_DEFECTO,
+                       ampliar_limite_descriptores)
+
+# Límite de conexiones abriéndose a la vez, para no desbordar la cola del servidor
+MAX_CONEXIONES_EN_CURSO = 500
+
+
+async def jugador_simulado(host, puerto, estrategia, num_rondas, latencias, semaforo, rng):
+    """
+    Conecta un jugador, juega sus rondas y registra la latencia de cada una.
+
+    Args:
+        host (str): Dirección del servidor
+        puerto (int): Puerto del servidor
+        estrategia (str): IA que se solicita al servidor
+        num_rondas (int): Rondas a jugar
+        latencias (list): Lista donde se añaden las latencias en segundos
+        semaforo (asyncio.Semaphore): Limita las conexiones que se abren a la vez
+        rng (random.Random): Generador de las acciones del jugador
+    """
+    async with semaforo:
+        lector, escritor = await asyncio.open_connection(host, puerto)
+        escritor.write(f"HOLA {estrategia}\n".encode())
+        respuesta = await lector.readline()
+        if not respuesta.startswith(b"OK"):
+            raise ConnectionError(respuesta.decode().strip())
+
+    try:
+        for _ in range(num_rondas):
+            inicio = time.perf_counter()
+            escritor.write(f"{rng.randrange(3)}\n".encode())
+            await lector.readline()
+            latencias.append(time.perf_counter() - inicio)
+        escritor.write(b"SALIR\n")
+        await lector.readline()
+    finally:
+        escritor.close()
+
+
+async def generar_carga(host=HOST_POR_DEFECTO, puerto=PUERTO_POR_DEFECTO, num_jugadores=10_000,
+                        num_rondas=10, estrategia=ESTRATEGIA_POR_DEFECTO, semilla=0):
+    """
+    Lanza los jugadores simulados y resume las latencias obtenidas.
+
+    Args:
+        host (str): Dirección del servidor
+        puerto (int): Puerto del servidor
+        num_jugadores (int): Número de jugadores simultáneos
+        num_rondas (int): Rondas que juega cada jugador
+        estrategia (str): IA que se solicita al servidor
+        semilla (int): Semilla para las acciones de los jugadores
+
+    Returns:
+        dict: Rondas, errores, duración, rondas por segundo y latencias p50/p99 en milisegundos
+    """
+    latencias = []
+    semaforo = asyncio.Semaphore(MAX_CONEXIONES_EN_CURSO)
+    rng = random.Random(semilla)
+
+    inicio = time.perf_counter()
+    resultados = await asyncio.gather(
+        *(jugador_simulado(host, puerto, estrategia, num_rondas, latencias, semaforo,
+                           random.Random(rng.getrandbits(64)))
+          for _ in range(num_jugadores)),
+        return_exceptions=True,
+    )
+    duracion = time.perf_counter() - inicio
+
+    percentiles = statistics.quantiles(latencias, n=100) if len(latencias) > 1 else [0.0] * 99
+    return {
+        "rondas": len(latencias),
+        "errores": sum(isinstance(resultado, Exception) for resultado in resultados),
+        "duracion_s": duracion,
+        "rondas_por_segundo": len(latencias) / duracion if duracion else 0.0,
+        "latencia_p50_ms": percentiles[49] * 1000,
+        "latencia_p99_ms": percentiles[98] * 1000,
+    }
+
+
+def main():
+    """Función principal que lanza la prueba de carga desde la línea de comandos."""
+    parser = argparse.ArgumentParser(description="Generador de carga para el servidor de Piedra, Papel y Tijeras")
+    parser.add_argument("--host", default=HOST_POR_DEFECTO, help="Dirección del servidor")
+    parser.add_argument("--puerto", type=int, default=PUERTO_POR_DEFECTO, help="Puerto del servidor")
+    parser.add_argument("--jugadores", type=int, default=10_000, help="Jugadores simultáneos")
+    parser.add_argument("--rondas", type=int, default=10, help="Rondas por jugador")
+    parser.add_argument("--estrategia", default=ESTRATEGIA_POR_DEFECTO, help="IA solicitada al servidor")
+    parser.add_argument("--semilla", type=int, default=0, help="Semilla de las acciones")
+    argumentos = parser.parse_args()
+
+    ampliar_limite_descriptores()
+    informe = asyncio.run(generar_carga(argumentos.host, argumentos.puerto, argumentos.jugadores,
+                                        argumentos.rondas, argumentos.estrategia, argumentos.semilla))
+
+    print(f"Rondas jugadas:      {informe['rondas']}")
+    print(f"Jugadores con error: {informe['errores']}")
+    print(f"Duración:            {informe['duracion_s']:.2f} s")
+    print(f"Rondas por segundo:  {informe['rondas_por_segundo']:.0f}")
+    print(f"Latencia p50:        {informe['latencia_p50_ms']:.3f} ms")
+    print(f"Latencia p99:        {informe['latencia_p99_ms']:.3f} ms")
+
+
+if __name__ == "__main__":
+    main()
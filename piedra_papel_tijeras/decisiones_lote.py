@@ -0,0 +1,260 @@
+"""
+Piedra, Papel y Tijeras - Decisiones por lotes de muchas sesiones
+=================================================================
+Estado de K sesiones guardado como estructura de arrays (un array por campo,
+con una posición por sesión) y decisión de la IA de todas ellas en un único
+paso vectorizado con NumPy.
+
+Características:
+- Estado por sesión: rondas jugadas, última acción de cada jugador, último
+  resultado, ventana circular de acciones recientes del usuario y sus recuentos
+- Regla de la versión 4 (IA básica), gana-repite / pierde-cambia y cualquier
+  otra tabla de compilar_tabla(): la decisión es un índice en la tabla de
+  candidatas rellenada a un array rectangular
+- Frecuencias de la versión 5: moda de la ventana a partir de los recuentos,
+  con el mismo desempate que VentanaFrecuencias (la primera desde la más
+  antigua), y la acción que la vence
+- Admite cualquier juego de N acciones (ReglasJuego)
+- Subconjuntos de sesiones por índices: solo se decide y actualiza en las
+  sesiones que han jugado en este paso
+
+Las decisiones deterministas coinciden con las de EstrategiaTabla y
+EstrategiaFrecuencias; las aleatorias salen de un único numpy.random.Generator
+compartido por el lote, así que siguen la misma distribución pero no la misma
+secuencia que los generadores propios de cada sesión.
+"""
+
+import numpy as np
+
+from .estrategias import TAMANO_VENTANA_FRECUENCIAS, compilar_tabla, regla_gana_repite, regla_ia_basica
+from .reglas import REGLAS_CLASICAS
+
+
+class SesionesLote:
+    """Estado de K sesiones como estructura de arrays, con decisiones vectorizadas."""
+
+    __slots__ = ("reglas", "tamano_ventana", "rondas", "ultima_usuario", "ultima_computadora",
+                 "ultimo_resultado", "ventana", "conteos", "_rng", "_tabla_plana", "_ganadoras", "_tablas")
+
+    def __init__(self, num_sesiones, tamano_ventana=TAMANO_VENTANA_FRECUENCIAS, reglas=REGLAS_CLASICAS,
+                 semilla=None):
+        """
+        Args:
+            num_sesiones (int): Número de sesiones K
+            tamano_ventana (int): Acciones recientes del usuario que se guardan por sesión
+            reglas (ReglasJuego): Reglas del juego (por defecto, el clásico de 3 acciones)
+            semilla (int | None): Semilla del generador aleatorio del lote
+
+        Raises:
+            ValueError: Si el tamaño de la ventana no es positivo
+        """
+        if tamano_ventana < 1:
+            raise ValueError("La ventana debe tener al menos una acción")
+        self.reglas = reglas
+        self.tamano_ventana = tamano_ventana
+        num_acciones = reglas.num_acciones
+        tipo_accion = np.min_scalar_type(num_acciones - 1)
+
+        # Un array por campo y una posición por sesión
+        self.rondas = np.zeros(num_sesiones, dtype=np.int64)
+        self.ultima_usuario = np.zeros(num_sesiones, dtype=tipo_accion)
+        self.ultima_computadora = np.zeros(num_sesiones, dtype=tipo_accion)
+        self.ultimo_resultado = np.zeros(num_sesiones, dtype=np.uint8)
+        # Ventana circular: la acción de la ronda r se guarda en la columna r % tamano_ventana
+        self.ventana = np.zeros((num_sesiones, tamano_ventana), dtype=tipo_accion)
+        # conteos[sesion, accion]: veces que aparece accion en la ventana de la sesión
+        self.conteos = np.zeros((num_sesiones, num_acciones), dtype=np.min_scalar_type(tamano_ventana))
+
+        self._rng = np.random.default_rng(semilla)
+        self._tabla_plana = np.frombuffer(reglas.tabla_plana, dtype=np.uint8)
+        self._ganadoras = np.array(reglas.tabla_ganadoras, dtype=tipo_accion)
+        # Tablas de compilar_tabla() ya convertidas, por id (se guarda la tabla para que el id siga vivo)
+        self._tablas = {}
+
+    def __len__(self):
+        return len(self.rondas)
+
+    def _filas(self, indices):
+        """Devuelve los índices de las sesiones afectadas como array (todas si indices es None)."""
+        if indices is None:
+            return np.arange(len(self.rondas))
+        return np.asarray(indices, dtype=np.intp)
+
+    def _validar_acciones(self, *acciones):
+        """Lanza ValueError si alguna acción está fuera de rango (NumPy admite índices negativos)."""
+        num_acciones = self.reglas.num_acciones
+        for array in acciones:
+            if array.size and (array.min() < 0 or array.max() >= num_acciones):
+                raise ValueError(f"Las acciones deben estar dentro del rango [0, {num_acciones - 1}]")
+
+    def observar(self, acciones_usuario, acciones_computadora, indices=None):
+        """
+        Incorpora una ronda terminada de cada sesión indicada.
+
+        Args:
+            acciones_usuario (array-like): Acción del usuario en cada sesión
+            acciones_computadora (array-like): Acción de la computadora en cada sesión
+            indices (array-like | None): Sesiones que han jugado, sin repetidos (None = todas)
+
+        Returns:
+            numpy.ndarray: Valores de ResultadoJuego (uint8) desde la perspectiva del usuario
+
+        Raises:
+            ValueError: Si los arrays no tienen la forma de las sesiones indicadas o
+                contienen acciones fuera de rango
+        """
+        filas = self._filas(indices)
+        usuario = np.asarray(acciones_usuario)
+        computadora = np.asarray(acciones_computadora)
+        if usuario.shape != filas.shape or computadora.shape != filas.shape:
+            raise ValueError(f"Se esperaban {len(filas)} acciones de cada jugador, "
+                             f"no {usuario.shape} y {computadora.shape}")
+        self._validar_acciones(usuario, computadora)
+
+        num_acciones = self.reglas.num_acciones
+        resultados = self._tabla_plana.take(usuario.astype(np.intp) * num_acciones + computadora)
+
+        rondas = self.rondas[filas]
+        columnas = rondas % self.tamano_ventana
+        # Con la ventana llena, la acción que se sobrescribe sale de los recuentos
+        llenas = rondas >= self.tamano_ventana
+        self.conteos[filas[llenas], self.ventana[filas[llenas], columnas[llenas]]] -= 1
+        self.conteos[filas, usuario] += 1
+        self.ventana[filas, columnas] = usuario
+
+        self.rondas[filas] = rondas + 1
+        self.ultima_usuario[filas] = usuario
+        self.ultima_computadora[filas] = computadora
+        self.ultimo_resultado[filas] = resultados
+        return resultados
+
+    def _convertir_tabla(self, tabla):
+        """Convierte una tabla de compilar_tabla() en (candidatas rellenadas, número de candidatas)."""
+        convertida = self._tablas.get(id(tabla))
+        if convertida is None:
+            num_candidatas = np.array([len(candidatas) for candidatas in tabla], dtype=np.intp)
+            # Las filas con menos candidatas se rellenan repitiendo la primera; el relleno nunca se elige
+            rellenas = np.empty((len(tabla), num_candidatas.max()), dtype=self.ventana.dtype)
+            for estado, candidatas in enumerate(tabla):
+                rellenas[estado] = candidatas[0]
+                rellenas[estado, :len(candidatas)] = candidatas
+            convertida = self._tablas[id(tabla)] = (tabla, rellenas, num_candidatas)
+        return convertida[1:]
+
+    def decidir_tabla(self, tabla, indices=None):
+        """
+        Decide la próxima acción de cada sesión con una regla precompilada.
+
+        Args:
+            tabla (tuple): Tabla devuelta por compilar_tabla() para las reglas del lote
+            indices (array-like | None): Sesiones que deciden (None = todas)
+
+        Returns:
+            numpy.ndarray: Acción de la computadora en cada sesión
+
+        Raises:
+            ValueError: Si la tabla no tiene un estado por cada última ronda posible
+        """
+        num_acciones = self.reglas.num_acciones
+        if len(tabla) != 1 + num_acciones * num_acciones:
+            raise ValueError("La tabla no corresponde a las reglas del lote")
+        candidatas, num_candidatas = self._convertir_tabla(tabla)
+        filas = self._filas(indices)
+
+        # Mismo estado que EstrategiaTabla: 0 antes de la primera ronda, 1 + c * N + u después
+        estados = self.ultima_computadora[filas].astype(np.intp)
+        estados *= num_acciones
+        estados += self.ultima_usuario[filas]
+        estados += 1
+        estados[self.rondas[filas] == 0] = 0
+
+        # Una candidata uniforme por sesión; con una sola candidata siempre sale la 0
+        elecciones = (self._rng.random(len(filas)) * num_candidatas[estados]).astype(np.intp)
+        return candidatas[estados, elecciones]
+
+    def decidir_ia_basica(self, indices=None):
+        """
+        Decide con la regla de la versión 4 (IA básica).
+
+        Args:
+            indices (array-like | None): Sesiones que deciden (None = todas)
+
+        Returns:
+            numpy.ndarray: Acción de la computadora en cada sesión
+        """
+        return self.decidir_tabla(compilar_tabla(regla_ia_basica, self.reglas), indices)
+
+    def decidir_gana_repite(self, indices=None):
+        """
+        Decide con gana-repite / pierde-cambia.
+
+        Args:
+            indices (array-like | None): Sesiones que deciden (None = todas)
+
+        Returns:
+            numpy.ndarray: Acción de la computadora en cada sesión
+        """
+        return self.decidir_tabla(compilar_tabla(regla_gana_repite, self.reglas), indices)
+
+    def decidir_frecuencias(self, indices=None):
+        """
+        Decide con la estrategia de frecuencias de la versión 5: vencer a la moda de la ventana.
+
+        Args:
+            indices (array-like | None): Sesiones que deciden (None = todas)
+
+        Returns:
+            numpy.ndarray: Acción de la computadora en cada sesión
+        """
+        filas = self._filas(indices)
+        tamano = self.tamano_ventana
+        rondas = self.rondas[filas]
+
+        # Ventana ordenada de la más antigua a la más reciente: con la ventana llena la más
+        # antigua está en la columna que toca sobrescribir; si no, en la columna 0
+        inicios = np.where(rondas >= tamano, rondas % tamano, 0)
+        posiciones = np.arange(tamano)
+        contenido = self.ventana[filas[:, None], (inicios[:, None] + posiciones) % tamano]
+
+        # Candidatas a moda: posiciones ocupadas cuya acción tiene el recuento máximo;
+        # argmax devuelve la primera, que es el desempate de VentanaFrecuencias
+        conteos = self.conteos[filas]
+        maximos = conteos.max(axis=1)
+        candidatas = np.take_along_axis(conteos, contenido.astype(np.intp), axis=1) == maximos[:, None]
+        candidatas &= posiciones < np.minimum(rondas, tamano)[:, None]
+        modas = contenido[np.arange(len(filas)), candidatas.argmax(axis=1)]
+        acciones = self._ganadoras[modas]
+
+        # Ventana vacía: acción aleatoria
+        vacias = rondas == 0
+        if vacias.any():
+            acciones[vacias] = self._rng.integers(0, self.reglas.num_acciones, int(vacias.sum()))
+        return acciones
+
+    def jugar(self, estrategia, acciones_usuario, indices=None):
+        """
+        Juega una ronda en cada sesión indicada: decide, evalúa y actualiza el estado.
+
+        Args:
+            estrategia (str): Clave de DECISIONES_LOTE
+            acciones_usuario (array-like): Acción del usuario en cada sesión
+            indices (array-like | None): Sesiones que juegan, sin repetidos (None = todas)
+
+        Returns:
+            tuple: (acciones de la computadora, resultados desde la perspectiva del usuario)
+
+        Raises:
+            ValueError: Si la estrategia no existe o las acciones no son válidas
+        """
+        if estrategia not in DECISIONES_LOTE:
+            raise ValueError(f"Estrategia sin decisión por lotes: {estrategia}")
+        acciones_computadora = DECISIONES_LOTE[estrategia](self, indices)
+        return acciones_computadora, self.observar(acciones_usuario, acciones_computadora, indices)
+
+
+# Decisión por lotes de cada estrategia, con la misma clave que en ESTRATEGIAS
+DECISIONES_LOTE = {
+    "ia_basica": SesionesLote.decidir_ia_basica,
+    "gana_repite": SesionesLote.decidir_gana_repite,
+    "frecuencias": SesionesLote.decidir_frecuencias,
+}
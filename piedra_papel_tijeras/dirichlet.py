@@ -0,0 +1,211 @@
+"""
+Piedra, Papel y Tijeras - Modelo bayesiano del rival con olvido
+===============================================================
+IA que estima la probabilidad de cada acción del usuario con conteos de
+Dirichlet que se olvidan exponencialmente, condicionados a la ronda
+anterior (acción del usuario y resultado), y juega la acción de mayor
+puntuación esperada.
+
+Características:
+- A diferencia de la versión 5 (últimas 5 acciones con el mismo peso), toda
+  la historia cuenta, con un peso que decae en cada ronda
+- Contexto: la acción del usuario y el resultado de la ronda anterior
+  (1 + 3N contextos, incluido el de la primera ronda)
+- Actualización O(1) por ronda: en lugar de multiplicar todos los conteos por
+  el factor de olvido, cada ronda nueva suma un peso mayor, y los conteos solo
+  se reescalan de tarde en tarde para no desbordar
+- Decisión por puntuación esperada (+1 si gana, -1 si pierde) con la tabla de
+  acciones ganadoras de las reglas (Victorias en el juego clásico); la
+  puntuación de cada acción se actualiza con cada observación, así que decidir
+  es buscar el máximo de N valores
+- Estado pequeño (contexto, conteos en bytes y posición del generador
+  aleatorio) que se exporta y restaura
+- Factor de olvido configurable por despliegue (configurar_decaimiento() o
+  la opción --decaimiento del servidor)
+
+Estrategia HONESTA: solo se analizan rondas ya terminadas.
+"""
+
+from array import array
+from itertools import chain
+from math import sumprod
+
+from .azar import GeneradorReanudable, exportar_generador, importar_generador
+from .nucleo import ResultadoJuego
+from .reglas import REGLAS_CLASICAS
+
+# Factor de olvido por ronda: 1 = no olvidar; 0.9 = una ronda de hace 10 pesa ~1/3
+DECAIMIENTO_DIRICHLET = 0.95
+
+# Conteo a priori de cada acción en cada contexto (Dirichlet simétrica)
+PRIORI_DIRICHLET = 1.0
+
+# Peso a partir del cual se reescalan los conteos para que no desborden
+_PESO_MAXIMO = 1e100
+
+
+def configurar_decaimiento(decaimiento):
+    """
+    Cambia el factor de olvido de las estrategias que se creen a partir de ahora.
+
+    Args:
+        decaimiento (float): Factor de olvido por ronda, en (0, 1]
+
+    Raises:
+        ValueError: Si el factor no está en (0, 1]
+    """
+    global DECAIMIENTO_DIRICHLET
+    if not 0 < decaimiento <= 1:
+        raise ValueError("El factor de olvido debe estar entre 0 (excluido) y 1")
+    DECAIMIENTO_DIRICHLET = decaimiento
+
+
+class EstrategiaDirichlet:
+    """IA bayesiana: conteos de Dirichlet con olvido por contexto de la ronda anterior."""
+
+    __slots__ = ("decaimiento", "priori", "rng", "reglas", "_num_acciones", "_pagos", "_sesgos", "_conteos",
+                 "_puntuaciones", "_acciones", "_contexto", "_peso")
+
+    def __init__(self, decaimiento=None, priori=PRIORI_DIRICHLET, rng=None, reglas=REGLAS_CLASICAS):
+        """
+        Args:
+            decaimiento (float | None): Factor de olvido por ronda en (0, 1]
+                (None = DECAIMIENTO_DIRICHLET del despliegue)
+            priori (float): Conteo a priori de cada acción en cada contexto
+            rng (random.Random | None): Generador aleatorio para deshacer empates
+                (None = un GeneradorReanudable con semilla nueva)
+            reglas (ReglasJuego): Reglas del juego (por defecto, el clásico de 3 acciones)
+
+        Raises:
+            ValueError: Si el factor de olvido no está en (0, 1]
+        """
+        decaimiento = DECAIMIENTO_DIRICHLET if decaimiento is None else decaimiento
+        if not 0 < decaimiento <= 1:
+            raise ValueError("El factor de olvido debe estar entre 0 (excluido) y 1")
+        self.decaimiento = decaimiento
+        self.priori = priori
+        self.rng = rng or GeneradorReanudable()
+        self.reglas = reglas
+        num_acciones = reglas.num_acciones
+        self._num_acciones = num_acciones
+        # _pagos[accion_usuario][accion]: puntos de la computadora al jugar accion contra accion_usuario,
+        # +1 si la vence (reglas.acciones_ganadoras, Victorias en el juego clásico) y -1 si pierde
+        ganadoras = [set(fila) for fila in reglas.acciones_ganadoras]
+        self._pagos = tuple(
+            tuple(1 if accion in ganadoras[usuario] else -1 if usuario in ganadoras[accion] else 0
+                  for accion in range(num_acciones))
+            for usuario in range(num_acciones)
+        )
+        # Puntos de cada acción contra el priori (una vez cada acción del usuario); en los juegos
+        # cíclicos cada acción gana tantas veces como pierde y el priori no influye (None)
+        sesgos = [sum(self._pagos[usuario][accion] for usuario in range(num_acciones))
+                  for accion in range(num_acciones)]
+        self._sesgos = sesgos if any(sesgos) else None
+        num_contextos = 1 + num_acciones * len(ResultadoJuego)
+        # _conteos[contexto][accion]: peso acumulado de las veces que el usuario eligió accion tras
+        # contexto (0 = primera ronda, 1 + accion * 3 + resultado = ronda anterior)
+        self._conteos = [[0.0] * num_acciones for _ in range(num_contextos)]
+        # _puntuaciones[contexto][accion]: puntos esperados (sin normalizar ni priori) de cada acción
+        self._puntuaciones = [[0.0] * num_acciones for _ in range(num_contextos)]
+        self._acciones = tuple(reglas.acciones)
+        self._contexto = 0
+        # Peso de la próxima observación: crece 1 / decaimiento por ronda, lo que equivale
+        # a multiplicar todos los conteos anteriores por el factor de olvido
+        self._peso = 1.0
+
+    def observar(self, accion_usuario, accion_computadora, resultado):
+        """
+        Incorpora una ronda terminada (protocolo Estrategia).
+
+        Args:
+            accion_usuario (AccionJuego): La acción del usuario
+            accion_computadora (AccionJuego): La acción de la computadora
+            resultado (ResultadoJuego): El resultado desde la perspectiva del usuario
+        """
+        peso = self._peso
+        self._conteos[self._contexto][accion_usuario] += peso
+        puntuaciones = self._puntuaciones[self._contexto]
+        for accion, pago in enumerate(self._pagos[accion_usuario]):
+            puntuaciones[accion] += peso * pago
+        self._contexto = 1 + accion_usuario * len(ResultadoJuego) + resultado
+        self._peso /= self.decaimiento
+        if self._peso > _PESO_MAXIMO:
+            self._reescalar()
+
+    def _reescalar(self):
+        """Divide los conteos por el peso actual para que la siguiente observación pese 1."""
+        escala = 1 / self._peso
+        self._conteos = [[conteo * escala for conteo in conteos] for conteos in self._conteos]
+        self._puntuaciones = [[puntuacion * escala for puntuacion in puntuaciones]
+                              for puntuaciones in self._puntuaciones]
+        self._peso = 1.0
+
+    def probabilidades(self):
+        """
+        Estima la distribución de la próxima acción del usuario en el contexto actual.
+
+        Returns:
+            list: Probabilidad de cada acción (media a posteriori de la Dirichlet)
+        """
+        # El priori se expresa en la escala de la última observación (peso / decaimiento)
+        priori = self.priori * self._peso * self.decaimiento
+        conteos = self._conteos[self._contexto]
+        total = sum(conteos) + priori * self._num_acciones
+        return [(conteo + priori) / total for conteo in conteos]
+
+    def siguiente_accion(self):
+        """
+        Elige la acción de la próxima ronda (protocolo Estrategia).
+
+        Returns:
+            IntEnum: La acción de mayor puntuación esperada (al azar entre las empatadas)
+        """
+        # El total del contexto es común a todas las acciones: basta con las puntuaciones sin normalizar
+        puntuaciones = self._puntuaciones[self._contexto]
+        if self._sesgos is not None:
+            priori = self.priori * self._peso * self.decaimiento
+            puntuaciones = [puntuacion + priori * sesgo for puntuacion, sesgo in zip(puntuaciones, self._sesgos)]
+        maximo = max(puntuaciones)
+        if puntuaciones.count(maximo) == 1:
+            return self._acciones[puntuaciones.index(maximo)]
+        return self._acciones[self.rng.choice([accion for accion, puntuacion in enumerate(puntuaciones)
+                                               if puntuacion == maximo])]
+
+    def exportar_estado(self):
+        """
+        Obtiene el estado mínimo necesario para continuar más adelante.
+
+        No modifica la estrategia: los conteos se exportan reescalados (como si
+        la próxima observación pesara 1) sin tocar los que siguen en uso.
+
+        Returns:
+            tuple: (factor de olvido, contexto, conteos reescalados en bytes (float64),
+                posición del generador aleatorio o None si no es un GeneradorReanudable)
+        """
+        escala = 1 / self._peso
+        conteos = array("d", (conteo * escala for conteo in chain.from_iterable(self._conteos)))
+        return self.decaimiento, self._contexto, conteos.tobytes(), exportar_generador(self.rng)
+
+    def importar_estado(self, estado, rondas_vistas=0):
+        """
+        Restaura un estado obtenido con exportar_estado().
+
+        Args:
+            estado (tuple): Estado devuelto por exportar_estado()
+            rondas_vistas (int): No se usa; se acepta por compatibilidad con los jugadores
+
+        Raises:
+            ValueError: Si los conteos no corresponden a este juego
+        """
+        decaimiento, contexto, conteos, posicion_rng = estado
+        conteos = array("d", conteos)
+        if len(conteos) != len(self._conteos) * self._num_acciones:
+            raise ValueError("El estado no corresponde a esta estrategia de Dirichlet")
+        self.decaimiento = decaimiento
+        self._contexto = contexto
+        self._conteos = [conteos[inicio:inicio + self._num_acciones].tolist()
+                         for inicio in range(0, len(conteos), self._num_acciones)]
+        # Las puntuaciones se deducen de los conteos
+        self._puntuaciones = [[sumprod(fila, columna) for columna in zip(*self._pagos)] for fila in self._conteos]
+        self._peso = 1.0
+        importar_generador(self.rng, posicion_rng)
@@ -0,0 +1,180 @@
+"""
+Piedra, Papel y Tijeras - Meta-estrategia de ensamble
+=====================================================
+IA al estilo "Iocaine Powder": ejecuta en cada ronda muchas estrategias a la
+vez y juega la propuesta de la que mejor lo habría hecho recientemente.
+
+Características:
+- Estrategias base: IA de la versión 4, IA de la versión 5 con varias ventanas,
+  IA de Markov de varios órdenes y una elección aleatoria
+- Cada estrategia base genera tres variantes rotadas ("segunda intención"):
+  su propuesta, la acción que vence a su propuesta y la que vence a esa
+- Puntuación con decaimiento exponencial de todas las variantes, actualizada
+  con una única operación vectorizada de NumPy por ronda
+- Misma firma que obtener_accion_computadora() de la versión 5
+
+Estrategia HONESTA: las puntuaciones solo se actualizan con rondas ya
+terminadas; la acción actual del usuario nunca se consulta.
+"""
+
+import random
+
+import numpy as np
+
+from .markov import EstrategiaMarkov
+from .nucleo import TABLA_RESULTADOS, AccionJuego, ResultadoJuego
+from .ventana import VentanaFrecuencias
+from .versiones import VERSION_IA_BASICA, VERSION_MAS_IA, cargar_version
+
+# Factor por el que se multiplican las puntuaciones en cada ronda
+DECAIMIENTO_ENSAMBLE = 0.9
+
+# Tamaños de ventana de las variantes de la IA de la versión 5
+VENTANAS_ENSAMBLE = (5, 10, 20, 50, 100)
+
+# Órdenes de las variantes de Markov sin y con resultados en el contexto
+ORDENES_MARKOV_ENSAMBLE = (1, 2, 3, 4, 5, 6)
+ORDENES_MARKOV_RESULTADOS_ENSAMBLE = (1, 2, 3, 4)
+
+# Puntos de jugar una acción contra la acción del usuario: +1 gana, -1 pierde, 0 empata
+PUNTOS_POR_RESULTADO_USUARIO = {ResultadoJuego.Victoria: -1, ResultadoJuego.Derrota: 1, ResultadoJuego.Empate: 0}
+_PUNTOS = np.array(
+    [[PUNTOS_POR_RESULTADO_USUARIO[TABLA_RESULTADOS[accion_usuario][accion_propia]]
+      for accion_usuario in AccionJuego]
+     for accion_propia in AccionJuego],
+    dtype=np.float64,
+)
+
+# Rotaciones aplicadas a cada propuesta base: 0 = propuesta, 1 = la vence, 2 = vence a la que la vence
+_ROTACIONES = np.arange(len(AccionJuego), dtype=np.intp)
+
+
+class _PredictorIABasica:
+    """IA de la versión 4 jugando con sus propias propuestas hipotéticas."""
+
+    __slots__ = ("_obtener_accion", "_acciones_propias", "_resultados")
+
+    def __init__(self):
+        self._obtener_accion = cargar_version(VERSION_IA_BASICA).obtener_accion_computadora
+        # La IA básica solo consulta la última ronda, así que basta con guardar esa
+        self._acciones_propias = []
+        self._resultados = []
+
+    def proponer(self, historial_usuario, historial_juego, rng):
+        return self._obtener_accion(self._resultados, self._acciones_propias, rng)
+
+    def registrar(self, accion_propuesta, accion_usuario):
+        self._acciones_propias[:] = [accion_propuesta]
+        self._resultados[:] = [TABLA_RESULTADOS[accion_usuario][accion_propuesta]]
+
+
+class _PredictorMasIA:
+    """IA de la versión 5 con su propia ventana de acciones del usuario."""
+
+    __slots__ = ("_obtener_accion", "_ventana")
+
+    def __init__(self, tamano_ventana):
+        self._obtener_accion = cargar_version(VERSION_MAS_IA).obtener_accion_computadora
+        self._ventana = VentanaFrecuencias(tamano_ventana)
+
+    def proponer(self, historial_usuario, historial_juego, rng):
+        return self._obtener_accion(self._ventana, historial_juego, rng)
+
+    def registrar(self, accion_propuesta, accion_usuario):
+        self._ventana.append(accion_usuario)
+
+
+class _PredictorMarkov:
+    """IA de Markov; sin predicción disponible propone una acción aleatoria."""
+
+    __slots__ = ("_estrategia",)
+
+    def __init__(self, orden, usar_resultados):
+        self._estrategia = EstrategiaMarkov(orden, usar_resultados)
+
+    def proponer(self, historial_usuario, historial_juego, rng):
+        return self._estrategia(historial_usuario, historial_juego, rng)
+
+    def registrar(self, accion_propuesta, accion_usuario):
+        pass
+
+
+class _PredictorAleatorio:
+    """Propuesta aleatoria, útil como referencia frente a rivales impredecibles."""
+
+    __slots__ = ()
+
+    def proponer(self, historial_usuario, historial_juego, rng):
+        return rng.randrange(len(AccionJuego))
+
+    def registrar(self, accion_propuesta, accion_usuario):
+        pass
+
+
+class EstrategiaEnsamble:
+    """IA que juega la variante con mejor puntuación reciente entre muchas estrategias."""
+
+    def __init__(self, decaimiento=DECAIMIENTO_ENSAMBLE, ventanas=VENTANAS_ENSAMBLE,
+                 ordenes_markov=ORDENES_MARKOV_ENSAMBLE,
+                 ordenes_markov_resultados=ORDENES_MARKOV_RESULTADOS_ENSAMBLE):
+        """
+        Args:
+            decaimiento (float): Factor de olvido de las puntuaciones, entre 0 y 1
+            ventanas (tuple): Tamaños de ventana de las variantes de la versión 5
+            ordenes_markov (tuple): Órdenes de las variantes de Markov sin resultados
+            ordenes_markov_resultados (tuple): Órdenes de las variantes de Markov con resultados
+
+        Raises:
+            ValueError: Si el decaimiento no está en el intervalo (0, 1]
+        """
+        if not 0 < decaimiento <= 1:
+            raise ValueError("El decaimiento debe estar en el intervalo (0, 1]")
+        self.decaimiento = decaimiento
+
+        self._predictores = [
+            _PredictorIABasica(),
+            *(_PredictorMasIA(tamano) for tamano in ventanas),
+            *(_PredictorMarkov(orden, False) for orden in ordenes_markov),
+            *(_PredictorMarkov(orden, True) for orden in ordenes_markov_resultados),
+            _PredictorAleatorio(),
+        ]
+        self._propuestas_base = np.zeros(len(self._predictores), dtype=np.intp)
+        self._variantes = None
+        self.puntuaciones = np.zeros(len(self._predictores) * len(_ROTACIONES))
+        self._rondas_vistas = 0
+
+    @property
+    def num_variantes(self):
+        """int: Número total de variantes evaluadas en cada ronda."""
+        return self.puntuaciones.size
+
+    def __call__(self, historial_usuario, historial_juego, rng=random):
+        """
+        Obtiene la acción de la computadora según la variante mejor puntuada.
+
+        Args:
+            historial_usuario (list | VistaHistorial): Acciones PREVIAS del usuario
+            historial_juego (list | VistaHistorial): Resultados de esas rondas (perspectiva del usuario)
+            rng (random.Random): Generador aleatorio a utilizar (por defecto, el módulo random)
+
+        Returns:
+            AccionJuego: La acción elegida por la computadora
+        """
+        # Puntuar las variantes de la ronda anterior con la acción que jugó el usuario
+        if len(historial_usuario) > self._rondas_vistas and self._variantes is not None:
+            accion_usuario = historial_usuario[-1]
+            self.puntuaciones *= self.decaimiento
+            self.puntuaciones += _PUNTOS[self._variantes, accion_usuario]
+            for predictor, accion_propuesta in zip(self._predictores, self._propuestas_base.tolist()):
+                predictor.registrar(accion_propuesta, accion_usuario)
+        self._rondas_vistas = len(historial_usuario)
+
+        # Nuevas propuestas base y sus variantes rotadas, todas a la vez
+        for indice, predictor in enumerate(self._predictores):
+            self._propuestas_base[indice] = predictor.proponer(historial_usuario, historial_juego, rng)
+        self._variantes = ((self._propuestas_base[:, None] + _ROTACIONES) % len(AccionJuego)).ravel()
+
+        # Sin ninguna ronda puntuada todas las variantes empatan: elección aleatoria
+        if not self.puntuaciones.any():
+            return AccionJuego(rng.randrange(len(AccionJuego)))
+        return AccionJuego(int(self._variantes[self.puntuaciones.argmax()]))
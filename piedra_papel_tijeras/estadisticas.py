@@ -0,0 +1,404 @@
+"""
+Piedra, Papel y Tijeras - Estadísticas globales y clasificación en vivo
+=======================================================================
+Agregador de los resultados de todas las partidas de un proceso, aunque se
+jueguen en muchos hilos o tareas a la vez: tasa de victorias de cada IA,
+clasificación de los jugadores y rondas totales.
+
+Características:
+- Un fragmento de contadores por trabajador (hilo, bucle de eventos o tarea):
+  registrar una ronda son unas pocas operaciones en estructuras que solo
+  escribe su dueño, sin cerrojos ni contención entre trabajadores
+- Memoria acotada: cada fragmento conserva los contadores de como mucho
+  MAX_JUGADORES_ESTADISTICAS jugadores y olvida a los que llevan más tiempo
+  sin jugar, así que la clasificación es la de los jugadores recientes
+- Un fusionador periódico (hilo propio o llamada explícita) publica una
+  instantánea inmutable con una sola asignación: los lectores la consultan
+  sin cerrojos y nunca ven una fusión a medias
+- Fusión incremental: cada fragmento marca los jugadores que han cambiado y
+  solo se recalculan sus totales; la clasificación se mantiene con un
+  conjunto acotado de candidatos a los mejores y solo se reconstruye entera
+  cuando esos candidatos ya no bastan
+- Los contadores de los fragmentos son acumulados (no se vacían al fusionar)
+  y los totales se recalculan a partir de ellos, así que ninguna ronda se
+  pierde aunque se registre mientras se fusiona; como mucho aparece en la
+  instantánea siguiente
+- Clasificación por victorias - derrotas (y, a igualdad, más victorias),
+  igual que la del torneo
+- Consultable en el servidor con la orden ESTADISTICAS (opción --estadisticas)
+
+Los resultados se guardan desde la perspectiva del usuario (ResultadoJuego):
+las victorias de una IA son las derrotas de sus rivales.
+"""
+
+import heapq
+import json
+import threading
+import time
+from collections import OrderedDict
+
+from .nucleo import ResultadoJuego
+
+# Segundos entre dos fusiones del hilo fusionador
+INTERVALO_FUSION = 1.0
+
+# Jugadores que se incluyen en la clasificación publicada
+TAMANO_CLASIFICACION = 10
+
+# Jugadores con contadores propios en cada fragmento (los menos recientes se olvidan)
+MAX_JUGADORES_ESTADISTICAS = 50_000
+
+# Candidatos a la clasificación que conserva el fusionador entre dos reconstrucciones
+CANDIDATOS_CLASIFICACION = 1024
+
+
+def _puntuacion(conteos):
+    """Clave de la clasificación: victorias - derrotas y, a igualdad, más victorias."""
+    victorias = conteos[ResultadoJuego.Victoria]
+    return victorias - conteos[ResultadoJuego.Derrota], victorias
+
+
+class FragmentoEstadisticas:
+    """Contadores de un solo trabajador: solo su dueño escribe en ellos."""
+
+    __slots__ = ("estrategias", "jugadores", "cambiados", "max_jugadores", "_cambiados_previos")
+
+    def __init__(self, max_jugadores=MAX_JUGADORES_ESTADISTICAS):
+        """
+        Args:
+            max_jugadores (int): Jugadores cuyos contadores se conservan (los menos recientes se olvidan)
+        """
+        # estrategias[nombre][resultado] y jugadores[id][resultado]: rondas con ese resultado para el usuario
+        self.estrategias = {}
+        # Del jugador que lleva más tiempo sin jugar al más reciente
+        self.jugadores = OrderedDict()
+        # Jugadores con contadores nuevos desde la última fusión (el fusionador sustituye el conjunto)
+        self.cambiados = set()
+        self.max_jugadores = max_jugadores
+        # Marcas de la fusión anterior, que el fusionador vuelve a revisar (solo lo usa él)
+        self._cambiados_previos = ()
+
+    def registrar(self, jugador, estrategia, resultado):
+        """
+        Cuenta una ronda terminada.
+
+        Args:
+            jugador (Hashable): Identificador del jugador (por ejemplo, el id de su sesión)
+            estrategia (str): Nombre de la IA contra la que ha jugado
+            resultado (ResultadoJuego): El resultado desde la perspectiva del usuario
+        """
+        conteos = self.estrategias.get(estrategia)
+        if conteos is None:
+            conteos = self.estrategias[estrategia] = [0] * len(ResultadoJuego)
+        conteos[resultado] += 1
+
+        jugadores = self.jugadores
+        conteos = jugadores.get(jugador)
+        if conteos is None:
+            conteos = jugadores[jugador] = [0] * len(ResultadoJuego)
+            if len(jugadores) > self.max_jugadores:
+                # Se olvida al que lleva más tiempo sin jugar; la marca hace que salga de los totales
+                olvidado, _ = jugadores.popitem(last=False)
+                self.cambiados.add(olvidado)
+        else:
+            jugadores.move_to_end(jugador)
+        conteos[resultado] += 1
+        self.cambiados.add(jugador)
+
+
+class InstantaneaEstadisticas:
+    """Estadísticas fusionadas en un momento dado; no cambia una vez creada."""
+
+    __slots__ = ("momento", "rondas", "estrategias", "num_jugadores", "clasificacion")
+
+    def __init__(self, estrategias, num_jugadores=0, clasificacion=(), momento=None):
+        """
+        Args:
+            estrategias (dict): Conteos por resultado de cada IA
+            num_jugadores (int): Jugadores con contadores en la fusión
+            clasificacion (Iterable[tuple]): Tuplas (jugador, victorias, derrotas, empates) de los
+                mejores jugadores, de mejor a peor
+            momento (float | None): Marca de tiempo de la fusión (None = ahora)
+        """
+        self.momento = time.time() if momento is None else momento
+        self.estrategias = {nombre: tuple(conteos) for nombre, conteos in estrategias.items()}
+        self.rondas = sum(map(sum, self.estrategias.values()))
+        self.num_jugadores = num_jugadores
+        self.clasificacion = tuple(clasificacion)
+
+    def tasa_victorias(self, estrategia):
+        """
+        Calcula la fracción de rondas que ha ganado una IA.
+
+        Args:
+            estrategia (str): Nombre de la IA
+
+        Returns:
+            float: Victorias de la IA (derrotas del usuario) entre rondas jugadas (0 si no ha jugado)
+        """
+        conteos = self.estrategias.get(estrategia)
+        if not conteos:
+            return 0.0
+        return conteos[ResultadoJuego.Derrota] / sum(conteos)
+
+    def posicion(self, jugador):
+        """
+        Obtiene el puesto de un jugador en la clasificación publicada.
+
+        Args:
+            jugador (Hashable): Identificador del jugador
+
+        Returns:
+            int | None: Puesto empezando en 1 (None si no está entre los mejores)
+        """
+        for puesto, (mejor, *_) in enumerate(self.clasificacion, 1):
+            if mejor == jugador:
+                return puesto
+        return None
+
+    def mejores(self, cantidad=TAMANO_CLASIFICACION):
+        """
+        Obtiene la cabeza de la clasificación.
+
+        Args:
+            cantidad (int): Número de jugadores (como mucho, los publicados)
+
+        Returns:
+            list: Tuplas (jugador, victorias, derrotas, empates) de los mejores jugadores
+        """
+        return list(self.clasificacion[:cantidad])
+
+    def como_dict(self, cantidad=TAMANO_CLASIFICACION):
+        """
+        Args:
+            cantidad (int): Jugadores de la clasificación que se incluyen
+
+        Returns:
+            dict: Rondas totales, conteos y tasa de victorias de cada IA y mejores jugadores
+        """
+        return {
+            "momento": self.momento,
+            "rondas": self.rondas,
+            "estrategias": {
+                nombre: {**{resultado.name: conteos[resultado] for resultado in ResultadoJuego},
+                         "tasa_victorias": self.tasa_victorias(nombre)}
+                for nombre, conteos in self.estrategias.items()
+            },
+            "jugadores": self.num_jugadores,
+            "clasificacion": [
+                {"jugador": jugador, "victorias": victorias, "derrotas": derrotas, "empates": empates}
+                for jugador, victorias, derrotas, empates in self.mejores(cantidad)
+            ],
+        }
+
+    def como_json(self, cantidad=TAMANO_CLASIFICACION):
+        """
+        Args:
+            cantidad (int): Jugadores de la clasificación que se incluyen
+
+        Returns:
+            str: El volcado de como_dict() en JSON
+        """
+        return json.dumps(self.como_dict(cantidad), ensure_ascii=False)
+
+
+class AgregadorEstadisticas:
+    """Reparte fragmentos a los trabajadores y publica su suma como una instantánea."""
+
+    def __init__(self, tamano_clasificacion=TAMANO_CLASIFICACION, max_jugadores=MAX_JUGADORES_ESTADISTICAS):
+        """
+        Args:
+            tamano_clasificacion (int): Jugadores de la clasificación publicada
+            max_jugadores (int): Jugadores con contadores propios en cada fragmento
+        """
+        self.tamano_clasificacion = tamano_clasificacion
+        self.max_jugadores = max_jugadores
+        self._fragmentos = []
+        self._locales = threading.local()
+        self._detener = threading.Event()
+        self._hilo = None
+        # Estado del fusionador (solo lo usa quien fusiona): totales por jugador y candidatos a
+        # la clasificación; fuera de los candidatos ningún jugador supera la puntuación _umbral
+        self._totales = {}
+        self._candidatos = {}
+        self._umbral = None
+        # Los lectores solo leen este atributo: se sustituye entero en cada fusión
+        self.instantanea = InstantaneaEstadisticas({})
+
+    def nuevo_fragmento(self):
+        """
+        Crea el fragmento de un trabajador nuevo.
+
+        Returns:
+            FragmentoEstadisticas: Fragmento que solo debe escribir ese trabajador
+        """
+        fragmento = FragmentoEstadisticas(self.max_jugadores)
+        # list.append es atómico: no hace falta cerrojo para dar de alta el fragmento
+        self._fragmentos.append(fragmento)
+        return fragmento
+
+    def fragmento(self):
+        """
+        Obtiene el fragmento del hilo actual, creándolo la primera vez.
+
+        Todas las tareas de un mismo bucle de eventos comparten el fragmento
+        de su hilo, ya que nunca se ejecutan a la vez.
+
+        Returns:
+            FragmentoEstadisticas: El fragmento del hilo actual
+        """
+        fragmento = getattr(self._locales, "fragmento", None)
+        if fragmento is None:
+            fragmento = self._locales.fragmento = self.nuevo_fragmento()
+        return fragmento
+
+    def fusionar(self):
+        """
+        Suma los fragmentos y publica el resultado como instantánea.
+
+        Solo se recalculan los jugadores marcados como cambiados. Las marcas
+        de la fusión anterior se revisan otra vez: así se recogen también las
+        de una ronda que se registraba justo mientras se sustituía el conjunto.
+        Recalcular un jugador dos veces da el mismo total.
+
+        Returns:
+            InstantaneaEstadisticas: La instantánea publicada
+        """
+        fragmentos = tuple(self._fragmentos)
+        estrategias = {}
+        cambiados = set()
+        for fragmento in fragmentos:
+            # copy() y tuple() son atómicos, así que no les afecta que el dueño siga registrando
+            for nombre, conteos in fragmento.estrategias.copy().items():
+                acumulados = estrategias.setdefault(nombre, [0] * len(ResultadoJuego))
+                for resultado, conteo in enumerate(tuple(conteos)):
+                    acumulados[resultado] += conteo
+            marcados, fragmento.cambiados = fragmento.cambiados, set()
+            marcados = tuple(marcados)
+            cambiados.update(marcados, fragmento._cambiados_previos)
+            fragmento._cambiados_previos = marcados
+
+        for jugador in cambiados:
+            self._recalcular(jugador, fragmentos)
+
+        self.instantanea = InstantaneaEstadisticas(estrategias, len(self._totales), self._clasificacion())
+        return self.instantanea
+
+    def _recalcular(self, jugador, fragmentos):
+        """Suma los contadores de un jugador en todos los fragmentos y actualiza los candidatos."""
+        total = None
+        for fragmento in fragmentos:
+            conteos = fragmento.jugadores.get(jugador)
+            if conteos is not None:
+                conteos = tuple(conteos)
+                total = conteos if total is None else tuple(map(sum, zip(total, conteos)))
+        if total is None:
+            # Olvidado por todos los fragmentos
+            self._totales.pop(jugador, None)
+            self._candidatos.pop(jugador, None)
+            return
+        self._totales[jugador] = total
+        puntuacion = _puntuacion(total)
+        if jugador in self._candidatos or self._umbral is None or puntuacion > self._umbral:
+            self._candidatos[jugador] = puntuacion
+
+    def _clasificacion(self):
+        """Obtiene los mejores jugadores, reconstruyendo los candidatos solo si ya no bastan."""
+        cantidad = self.tamano_clasificacion
+        # Los mejores están entre los candidatos si al menos `cantidad` de ellos llegan al umbral
+        # (ningún otro jugador lo supera); si no, o si hay demasiados candidatos, se reconstruyen
+        demasiados = len(self._candidatos) > 2 * CANDIDATOS_CLASIFICACION
+        insuficientes = self._umbral is not None and sum(
+            puntuacion >= self._umbral for puntuacion in self._candidatos.values()) < cantidad
+        if demasiados or insuficientes:
+            self._reconstruir_candidatos()
+
+        mejores = heapq.nlargest(cantidad, self._candidatos, key=self._candidatos.__getitem__)
+        return [(jugador, *self._totales[jugador]) for jugador in mejores]
+
+    def _reconstruir_candidatos(self):
+        """Elige como candidatos los CANDIDATOS_CLASIFICACION mejores de todos los totales."""
+        totales = self._totales
+        candidatos = heapq.nlargest(CANDIDATOS_CLASIFICACION, totales,
+                                    key=lambda jugador: _puntuacion(totales[jugador]))
+        self._candidatos = {jugador: _puntuacion(totales[jugador]) for jugador in candidatos}
+        # Con todos los jugadores entre los candidatos no hace falta umbral
+        self._umbral = (self._candidatos[candidatos[-1]]
+                        if len(candidatos) < len(totales) else None)
+
+    def iniciar(self, intervalo=INTERVALO_FUSION):
+        """
+        Arranca un hilo que fusiona los fragmentos periódicamente.
+
+        Args:
+            intervalo (float): Segundos entre dos fusiones
+
+        Raises:
+            RuntimeError: Si el hilo fusionador ya está en marcha
+        """
+        if self._hilo is not None:
+            raise RuntimeError("El fusionador de estadísticas ya está en marcha")
+        self._detener.clear()
+
+        def fusionar_periodicamente():
+            while not self._detener.wait(intervalo):
+                self.fusionar()
+
+        self._hilo = threading.Thread(target=fusionar_periodicamente, name="fusion-estadisticas", daemon=True)
+        self._hilo.start()
+
+    def detener(self):
+        """Detiene el hilo fusionador (si está en marcha) y publica una última fusión."""
+        if self._hilo is not None:
+            self._detener.set()
+            self._hilo.join()
+            self._hilo = None
+        self.fusionar()
+
+
+def main():
+    """Función principal que juega partidas en varios hilos y muestra las estadísticas globales."""
+    import argparse
+    import random
+
+    from .nucleo import AccionJuego
+    from .sesiones import SesionJuego
+    from .simulacion import JUGADORES
+
+    parser = argparse.ArgumentParser(description="Estadísticas globales de partidas en varios hilos")
+    parser.add_argument("estrategias", nargs="*", metavar="estrategia", default=list(JUGADORES),
+                        help=f"IA de las partidas ({', '.join(JUGADORES)})")
+    parser.add_argument("--hilos", type=int, default=4, help="Hilos que juegan a la vez")
+    parser.add_argument("--partidas", type=int, default=100, help="Partidas por hilo")
+    parser.add_argument("--rondas", type=int, default=100, help="Rondas por partida")
+    parser.add_argument("--semilla", type=int, default=0, help="Semilla de las partidas")
+    argumentos = parser.parse_args()
+    desconocidas = [nombre for nombre in argumentos.estrategias if nombre not in JUGADORES]
+    if desconocidas:
+        parser.error(f"Estrategias desconocidas: {', '.join(desconocidas)}")
+
+    agregador = AgregadorEstadisticas()
+
+    def trabajar(hilo):
+        fragmento = agregador.fragmento()
+        rng = random.Random(f"{argumentos.semilla}-{hilo}")
+        for partida in range(argumentos.partidas):
+            id_sesion = hilo * argumentos.partidas + partida
+            sesion = SesionJuego(id_sesion, rng.choice(argumentos.estrategias), semilla=rng.getrandbits(64))
+            for _ in range(argumentos.rondas):
+                _, resultado = sesion.jugar(AccionJuego(rng.randrange(len(AccionJuego))))
+                fragmento.registrar(id_sesion, sesion.nombre_estrategia, resultado)
+
+    agregador.iniciar()
+    hilos = [threading.Thread(target=trabajar, args=(hilo,)) for hilo in range(argumentos.hilos)]
+    for hilo in hilos:
+        hilo.start()
+    for hilo in hilos:
+        hilo.join()
+    agregador.detener()
+
+    print(json.dumps(agregador.instantanea.como_dict(), ensure_ascii=False, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,400 @@
+"""
+Piedra, Papel y Tijeras - Protocolo común de estrategias
+========================================================
+Interfaz única para las IA del juego: cada estrategia recibe las rondas de
+una en una con observar() y decide con siguiente_accion(), manteniendo su
+propio estado incremental en lugar de recibir historiales completos.
+
+Características:
+- Protocolo Estrategia: observar(usuario, computadora, resultado) / siguiente_accion()
+- Las estrategias que solo dependen de un estado pequeño (la última ronda o
+  una ventana corta de acciones) se compilan en una tabla precalculada:
+  decidir es leer una posición de la tabla
+- Estrategias incluidas: aleatoria (versión 3), IA básica (versión 4),
+  gana-repite/pierde-cambia, frecuencias recientes (versión 5), Markov y el
+  modelo bayesiano de Dirichlet con olvido
+- Adaptador JugadorEstrategia para usar cualquier estrategia en la simulación,
+  el torneo o el servidor
+- Registro ESTRATEGIAS por nombre para intercambiarlas y compararlas
+- Todas aceptan unas ReglasJuego para jugar a variantes de N acciones
+  (Lagarto-Spock, N = 7, N = 101...) sin cambiar su lógica
+
+Estrategias HONESTAS: siguiente_accion() se llama antes de conocer la acción
+actual del usuario, que solo llega después con observar().
+"""
+
+from functools import lru_cache
+from typing import Protocol, runtime_checkable
+
+from .azar import FlujoAleatorio, GeneradorReanudable
+from .dirichlet import EstrategiaDirichlet
+from .markov import ORDEN_MARKOV, EstrategiaMarkov
+from .nucleo import ResultadoJuego
+from .reglas import REGLAS_CLASICAS
+from .ventana import VentanaFrecuencias
+
+# Tamaño de ventana por defecto de la estrategia de frecuencias (igual que la versión 5)
+TAMANO_VENTANA_FRECUENCIAS = 5
+
+# Contenidos de ventana distintos hasta los que la estrategia de frecuencias usa una tabla precalculada
+MAX_ESTADOS_FRECUENCIAS = 1 << 16
+
+
+@runtime_checkable
+class Estrategia(Protocol):
+    """Interfaz común de las IA: estado incremental ronda a ronda."""
+
+    def observar(self, accion_usuario, accion_computadora, resultado):
+        """
+        Incorpora una ronda terminada.
+
+        Args:
+            accion_usuario (AccionJuego): La acción del usuario
+            accion_computadora (AccionJuego): La acción de la computadora
+            resultado (ResultadoJuego): El resultado desde la perspectiva del usuario
+        """
+        ...
+
+    def siguiente_accion(self):
+        """
+        Elige la acción de la computadora para la próxima ronda.
+
+        Returns:
+            AccionJuego: La acción elegida
+        """
+        ...
+
+
+@lru_cache(maxsize=None)
+def compilar_tabla(regla, reglas=REGLAS_CLASICAS):
+    """
+    Precalcula la decisión de una regla para cada estado posible.
+
+    El estado es la última ronda: 0 antes de la primera ronda y
+    1 + accion_computadora * N + accion_usuario después. Cada tabla se
+    compila una sola vez por regla y juego.
+
+    Args:
+        regla (callable): Función (reglas, accion_computadora, accion_usuario, resultado) ->
+            acciones candidatas, o None para elegir entre todas; también se llama con
+            (reglas, None, None, None) para el estado inicial
+        reglas (ReglasJuego): Reglas del juego (por defecto, el clásico de 3 acciones)
+
+    Returns:
+        tuple: Para cada estado, tupla de acciones candidatas (una sola si la decisión es determinista)
+    """
+    acciones = reglas.acciones
+    todas = tuple(acciones)
+    # Las tuplas de candidatas iguales se comparten entre estados (importa con N grande)
+    compartidas = {todas: todas}
+
+    def candidatas(*ronda):
+        opciones = regla(reglas, *ronda)
+        if opciones is None:
+            return todas
+        opciones = (opciones,) if isinstance(opciones, acciones) else tuple(opciones)
+        return compartidas.setdefault(opciones, opciones)
+
+    tabla = [candidatas(None, None, None)]
+    for accion_computadora in acciones:
+        for accion_usuario in acciones:
+            resultado = reglas.tabla_resultados[accion_usuario][accion_computadora]
+            tabla.append(candidatas(accion_computadora, accion_usuario, resultado))
+    return tuple(tabla)
+
+
+def regla_ia_basica(reglas, accion_computadora, accion_usuario, resultado):
+    """
+    Regla de la IA de la versión 4.
+
+    - Primera ronda o empate: acción aleatoria
+    - Si el usuario ganó: cualquier acción distinta de la que perdió
+    - Si el usuario perdió: repetir la acción ganadora
+    """
+    if resultado == ResultadoJuego.Victoria:
+        return [accion for accion in reglas.acciones if accion != accion_computadora]
+    if resultado == ResultadoJuego.Derrota:
+        return accion_computadora
+    return None
+
+
+def regla_gana_repite(reglas, accion_computadora, accion_usuario, resultado):
+    """
+    Gana-repite / pierde-cambia.
+
+    - Primera ronda: acción aleatoria
+    - Si la computadora ganó: repetir la acción
+    - Si perdió o empató: cambiar a la acción que vence a la última del usuario
+    """
+    if resultado is None:
+        return None
+    if resultado == ResultadoJuego.Derrota:
+        return accion_computadora
+    return reglas.obtener_accion_ganadora(accion_usuario)
+
+
+# Tablas precompiladas de las reglas incluidas para el juego clásico
+TABLA_IA_BASICA = compilar_tabla(regla_ia_basica)
+TABLA_GANA_REPITE = compilar_tabla(regla_gana_repite)
+
+
+class EstrategiaTabla:
+    """Estrategia cuya decisión depende solo de la última ronda, leída de una tabla precalculada."""
+
+    __slots__ = ("tabla", "_num_acciones", "_estado", "_rng")
+
+    def __init__(self, tabla, semilla=None, reglas=REGLAS_CLASICAS):
+        """
+        Args:
+            tabla (tuple): Tabla devuelta por compilar_tabla() para estas reglas
+            semilla (int | None): Semilla del generador aleatorio propio
+            reglas (ReglasJuego): Reglas del juego con el que se compiló la tabla
+        """
+        self.tabla = tabla
+        self._num_acciones = reglas.num_acciones
+        self._estado = 0
+        self._rng = GeneradorReanudable(semilla)
+
+    def observar(self, accion_usuario, accion_computadora, resultado):
+        self._estado = 1 + accion_computadora * self._num_acciones + accion_usuario
+
+    def siguiente_accion(self):
+        candidatas = self.tabla[self._estado]
+        # Solo se consume el generador aleatorio si hay varias candidatas
+        return candidatas[0] if len(candidatas) == 1 else self._rng.choice(candidatas)
+
+    def exportar_estado(self):
+        """
+        Returns:
+            tuple: (índice del estado actual en la tabla, posición del generador aleatorio)
+        """
+        return self._estado, self._rng.exportar_estado()
+
+    def importar_estado(self, estado, rondas_vistas=0):
+        """
+        Args:
+            estado (tuple): Estado devuelto por exportar_estado()
+            rondas_vistas (int): No se usa; se acepta por compatibilidad con los jugadores
+        """
+        self._estado, posicion_rng = estado
+        self._rng.importar_estado(posicion_rng)
+
+
+class EstrategiaAleatoria:
+    """Acción aleatoria en cada ronda (versión 3)."""
+
+    __slots__ = ("_acciones", "_flujo")
+
+    def __init__(self, semilla=None, reglas=REGLAS_CLASICAS):
+        """
+        Args:
+            semilla (int | None): Semilla del flujo aleatorio propio
+            reglas (ReglasJuego): Reglas del juego (por defecto, el clásico de 3 acciones)
+        """
+        self._acciones = tuple(reglas.acciones)
+        # Acciones precalculadas por bloques: decidir es leer el siguiente byte
+        self._flujo = FlujoAleatorio(semilla, reglas.num_acciones)
+
+    def observar(self, accion_usuario, accion_computadora, resultado):
+        pass
+
+    def siguiente_accion(self):
+        return self._acciones[self._flujo.siguiente()]
+
+    def exportar_estado(self):
+        """
+        Returns:
+            int: Acciones ya sacadas del flujo aleatorio
+        """
+        return self._flujo.exportar_estado()
+
+    def importar_estado(self, estado, rondas_vistas=0):
+        """
+        Args:
+            estado (int | None): Posición devuelta por exportar_estado() (None = no mover el flujo)
+            rondas_vistas (int): No se usa; se acepta por compatibilidad con los jugadores
+        """
+        if estado is not None:
+            self._flujo.importar_estado(estado)
+
+
+@lru_cache(maxsize=None)
+def compilar_tabla_frecuencias(tamano_ventana, reglas=REGLAS_CLASICAS):
+    """
+    Precalcula la respuesta de la estrategia de frecuencias a cada contenido posible de la ventana.
+
+    El contenido de una ventana con L acciones se codifica como un número en
+    base N (la acción más antigua es la cifra más significativa) y se sitúa
+    en la tabla a partir de la posición N^0 + N^1 + ... + N^(L-1).
+
+    Args:
+        tamano_ventana (int): Tamaño de la ventana
+        reglas (ReglasJuego): Reglas del juego
+
+    Returns:
+        tuple | None: (desplazamientos por longitud, respuestas), o None si hay más de
+            MAX_ESTADOS_FRECUENCIAS contenidos posibles
+    """
+    num_acciones = reglas.num_acciones
+    desplazamientos = [0]
+    for longitud in range(tamano_ventana):
+        desplazamientos.append(desplazamientos[-1] + num_acciones ** longitud)
+    if desplazamientos[-1] + num_acciones ** tamano_ventana > MAX_ESTADOS_FRECUENCIAS:
+        return None
+
+    respuestas = [None]
+    for longitud in range(1, tamano_ventana + 1):
+        for valor in range(num_acciones ** longitud):
+            contenido = bytes(valor // num_acciones ** (longitud - 1 - posicion) % num_acciones
+                              for posicion in range(longitud))
+            moda = VentanaFrecuencias.desde_bytes(tamano_ventana, contenido, reglas.acciones).moda()
+            respuestas.append(reglas.obtener_accion_ganadora(moda))
+    return tuple(desplazamientos), tuple(respuestas)
+
+
+class EstrategiaFrecuencias:
+    """Vence a la acción más frecuente del usuario en sus últimas rondas (versión 5)."""
+
+    __slots__ = ("_reglas", "_ventana", "_tabla", "_desplazamientos", "_tamano", "_modulo",
+                 "_longitud", "_valor", "_rng")
+
+    def __init__(self, semilla=None, tamano_ventana=TAMANO_VENTANA_FRECUENCIAS, reglas=REGLAS_CLASICAS):
+        """
+        Args:
+            semilla (int | None): Semilla del generador aleatorio propio
+            tamano_ventana (int): Número de acciones recientes del usuario que se analizan
+            reglas (ReglasJuego): Reglas del juego (por defecto, el clásico de 3 acciones)
+        """
+        self._reglas = reglas
+        self._rng = GeneradorReanudable(semilla)
+        self._tamano = tamano_ventana
+        self._modulo = reglas.num_acciones ** tamano_ventana
+        self._longitud = 0
+        self._valor = 0
+        compilada = compilar_tabla_frecuencias(tamano_ventana, reglas)
+        if compilada is None:
+            # Demasiados contenidos posibles: se mantiene la ventana con sus recuentos
+            self._tabla = None
+            self._ventana = VentanaFrecuencias(tamano_ventana, reglas.acciones)
+        else:
+            # La ventana se reduce a su contenido codificado y decidir es leer la tabla
+            self._desplazamientos, self._tabla = compilada
+            self._ventana = None
+
+    def observar(self, accion_usuario, accion_computadora, resultado):
+        if self._tabla is None:
+            self._ventana.append(accion_usuario)
+        elif self._longitud < self._tamano:
+            self._longitud += 1
+            self._valor = self._valor * self._reglas.num_acciones + accion_usuario
+        else:
+            self._valor = (self._valor * self._reglas.num_acciones + accion_usuario) % self._modulo
+
+    def siguiente_accion(self):
+        if self._tabla is not None:
+            if self._longitud:
+                return self._tabla[self._desplazamientos[self._longitud] + self._valor]
+        elif self._ventana:
+            return self._reglas.obtener_accion_ganadora(self._ventana.moda())
+        return self._reglas.acciones(self._rng.randrange(self._reglas.num_acciones))
+
+    def exportar_estado(self):
+        """
+        Returns:
+            tuple: (acciones de la ventana, de la más antigua a la más reciente,
+                posición del generador aleatorio)
+        """
+        if self._tabla is None:
+            return bytes(self._ventana), self._rng.exportar_estado()
+        num_acciones = self._reglas.num_acciones
+        ventana = bytes(self._valor // num_acciones ** (self._longitud - 1 - posicion) % num_acciones
+                        for posicion in range(self._longitud))
+        return ventana, self._rng.exportar_estado()
+
+    def importar_estado(self, estado, rondas_vistas=0):
+        """
+        Args:
+            estado (tuple): Estado devuelto por exportar_estado()
+            rondas_vistas (int): No se usa; se acepta por compatibilidad con los jugadores
+        """
+        ventana, posicion_rng = estado
+        self._rng.importar_estado(posicion_rng)
+        if self._tabla is None:
+            self._ventana = VentanaFrecuencias.desde_bytes(self._tamano, ventana, self._reglas.acciones)
+            return
+        self._longitud = 0
+        self._valor = 0
+        for accion in ventana[-self._tamano:]:
+            self.observar(accion, None, None)
+
+
+def crear_estrategia_markov(semilla=None, orden=ORDEN_MARKOV, usar_resultados=False, reglas=REGLAS_CLASICAS):
+    """
+    Crea una EstrategiaMarkov con su propio generador aleatorio.
+
+    Args:
+        semilla (int | None): Semilla del generador aleatorio propio
+        orden (int): Número de rondas previas que forman el contexto
+        usar_resultados (bool): Si el contexto incluye también los resultados
+        reglas (ReglasJuego): Reglas del juego (por defecto, el clásico de 3 acciones)
+
+    Returns:
+        EstrategiaMarkov: La estrategia, que ya cumple el protocolo Estrategia
+    """
+    return EstrategiaMarkov(orden, usar_resultados, GeneradorReanudable(semilla), reglas)
+
+
+# Estrategias registradas por nombre: nombre => función que crea la estrategia a partir de
+# una semilla y, opcionalmente, de las reglas del juego
+ESTRATEGIAS = {
+    "aleatoria": EstrategiaAleatoria,
+    "ia_basica": lambda semilla=None, reglas=REGLAS_CLASICAS: EstrategiaTabla(
+        compilar_tabla(regla_ia_basica, reglas), semilla, reglas),
+    "gana_repite": lambda semilla=None, reglas=REGLAS_CLASICAS: EstrategiaTabla(
+        compilar_tabla(regla_gana_repite, reglas), semilla, reglas),
+    "frecuencias": lambda semilla=None, reglas=REGLAS_CLASICAS: EstrategiaFrecuencias(semilla, reglas=reglas),
+    "markov": lambda semilla=None, reglas=REGLAS_CLASICAS: crear_estrategia_markov(semilla, reglas=reglas),
+    "dirichlet": lambda semilla=None, reglas=REGLAS_CLASICAS: EstrategiaDirichlet(
+        rng=GeneradorReanudable(semilla), reglas=reglas),
+}
+
+
+class JugadorEstrategia:
+    """Adaptador que usa una Estrategia como jugador de simulacion.simular()."""
+
+    __slots__ = ("estrategia", "_rondas_vistas")
+
+    # Todas las estrategias exportan su estado (protocolo Estrategia)
+    compactable = True
+
+    def __init__(self, estrategia):
+        """
+        Args:
+            estrategia (Estrategia): La estrategia que decide las acciones
+        """
+        self.estrategia = estrategia
+        self._rondas_vistas = 0
+
+    def __call__(self, acciones_propias, acciones_rival, resultados_rival):
+        # Pasar a la estrategia solo las rondas que aún no ha visto
+        observar = self.estrategia.observar
+        for ronda in range(self._rondas_vistas, len(acciones_propias)):
+            observar(acciones_rival[ronda], acciones_propias[ronda], resultados_rival[ronda])
+        self._rondas_vistas = len(acciones_propias)
+        return self.estrategia.siguiente_accion()
+
+    def exportar_estado(self):
+        """
+        Returns:
+            Estado devuelto por exportar_estado() de la estrategia
+        """
+        return self.estrategia.exportar_estado()
+
+    def importar_estado(self, estado, rondas_vistas=0):
+        """
+        Args:
+            estado: Estado devuelto por exportar_estado()
+            rondas_vistas (int): Longitud del historial que se considera ya leída
+        """
+        self.estrategia.importar_estado(estado, rondas_vistas)
+        self._rondas_vistas = rondas_vistas
@@ -0,0 +1,473 @@
+"""
+Piedra, Papel y Tijeras - Análisis de explotabilidad
+====================================================
+Calcula cuánto se puede ganar a cada IA y con qué secuencia de jugadas:
+la mejor respuesta contra la estrategia, su tasa de victorias esperada y
+el ciclo de jugadas que la explota.
+
+Características:
+- Programación dinámica sobre la máquina de estados de la estrategia cuando
+  su estado es pequeño (IA básica, gana-repite, frecuencias, aleatoria):
+  la mejor respuesta es exacta para el horizonte indicado
+- Evaluación exacta de la política encontrada propagando la distribución de
+  estados, sin muestreo
+- Simulación masiva en paralelo para las estrategias de estado grande
+  (Markov): se enfrentan todos los ciclos de jugadas hasta una longitud dada
+  contra muchas partidas con semillas derivadas, repartidas entre procesos
+- Resultados reproducibles con independencia del número de procesos
+- Una línea JSON por estrategia analizada
+
+Modelo de estrategia (MaquinaEstados):
+    estados 0..S-1 con estado inicial 0; en cada estado la IA elige al azar
+    (uniformemente) entre sus acciones candidatas, y tras la ronda pasa al
+    estado transiciones[estado][accion_usuario * N + accion_computadora].
+"""
+
+import json
+import os
+import random
+from itertools import product
+
+from .azar import derivar_semilla
+from .estrategias import (
+    TAMANO_VENTANA_FRECUENCIAS,
+    compilar_tabla,
+    compilar_tabla_frecuencias,
+    regla_gana_repite,
+    regla_ia_basica,
+)
+from .jugar_lotes import ESTRATEGIAS_VERSIONES, crear_estrategia
+from .nucleo import ResultadoJuego
+from .reglas import REGLAS_CLASICAS
+
+# Puntos que suma el explotador con cada resultado, indexados por ResultadoJuego
+PUNTOS_OBJETIVO = {
+    "victorias": (1, 0, 0),
+    "diferencia": (1, -1, 0),
+}
+
+# Rondas del horizonte de la programación dinámica y de la evaluación de la política
+RONDAS_ANALISIS = 1000
+
+# Longitud máxima de los ciclos de jugadas probados en la simulación
+LONGITUD_MAXIMA_CICLO = 4
+
+
+class MaquinaEstados:
+    """Modelo finito de una estrategia: decisión y transición de cada estado."""
+
+    __slots__ = ("reglas", "num_estados", "decisiones", "transiciones")
+
+    def __init__(self, reglas, decisiones, transiciones):
+        """
+        Args:
+            reglas (ReglasJuego): Reglas del juego
+            decisiones (Sequence[tuple]): Acciones candidatas de la IA en cada estado
+            transiciones (Sequence[Sequence[int]]): Estado siguiente de cada estado para cada
+                ronda (accion_usuario * N + accion_computadora)
+        """
+        self.reglas = reglas
+        self.num_estados = len(decisiones)
+        self.decisiones = tuple(decisiones)
+        self.transiciones = tuple(transiciones)
+
+
+def maquina_tabla(tabla, reglas=REGLAS_CLASICAS):
+    """
+    Máquina de estados de una estrategia compilada con compilar_tabla().
+
+    Args:
+        tabla (tuple): Tabla de candidatas por estado (0 = inicio, 1 + c * N + u después)
+        reglas (ReglasJuego): Reglas con las que se compiló la tabla
+
+    Returns:
+        MaquinaEstados: La máquina, con los mismos estados que la tabla
+    """
+    num_acciones = reglas.num_acciones
+    # El estado siguiente solo depende de la ronda jugada, no del estado actual
+    siguientes = tuple(1 + c * num_acciones + u for u in range(num_acciones) for c in range(num_acciones))
+    return MaquinaEstados(reglas, tabla, [siguientes] * len(tabla))
+
+
+def maquina_frecuencias(tamano_ventana=TAMANO_VENTANA_FRECUENCIAS, reglas=REGLAS_CLASICAS):
+    """
+    Máquina de estados de la estrategia de frecuencias (versión 5).
+
+    Args:
+        tamano_ventana (int): Tamaño de la ventana de la estrategia
+        reglas (ReglasJuego): Reglas del juego
+
+    Returns:
+        MaquinaEstados | None: La máquina, o None si la estrategia no tiene tabla precalculada
+    """
+    compilada = compilar_tabla_frecuencias(tamano_ventana, reglas)
+    if compilada is None:
+        return None
+    desplazamientos, respuestas = compilada
+    num_acciones = reglas.num_acciones
+    modulo = num_acciones ** tamano_ventana
+
+    # Los estados son las posiciones de la tabla: desplazamiento de la longitud + contenido
+    decisiones = [tuple(reglas.acciones)]
+    transiciones = []
+    for longitud in range(tamano_ventana + 1):
+        for valor in range(num_acciones ** longitud):
+            if longitud:
+                decisiones.append((respuestas[desplazamientos[longitud] + valor],))
+            nueva_longitud = min(longitud + 1, tamano_ventana)
+            siguientes = tuple(desplazamientos[nueva_longitud] + (valor * num_acciones + u) % modulo
+                               for u in range(num_acciones) for _ in range(num_acciones))
+            transiciones.append(siguientes)
+    return MaquinaEstados(reglas, decisiones, transiciones)
+
+
+def maquina_aleatoria(reglas=REGLAS_CLASICAS):
+    """
+    Máquina de estados de la estrategia aleatoria: un único estado sin memoria.
+
+    Args:
+        reglas (ReglasJuego): Reglas del juego
+
+    Returns:
+        MaquinaEstados: La máquina
+    """
+    return MaquinaEstados(reglas, [tuple(reglas.acciones)], [(0,) * reglas.num_acciones ** 2])
+
+
+# Estrategias de ESTRATEGIAS cuyo estado se puede analizar con programación dinámica:
+# nombre => función que crea su máquina a partir de las reglas del juego
+MAQUINAS = {
+    "aleatoria": maquina_aleatoria,
+    "ia_basica": lambda reglas=REGLAS_CLASICAS: maquina_tabla(compilar_tabla(regla_ia_basica, reglas), reglas),
+    "gana_repite": lambda reglas=REGLAS_CLASICAS: maquina_tabla(compilar_tabla(regla_gana_repite, reglas), reglas),
+    "frecuencias": lambda reglas=REGLAS_CLASICAS: maquina_frecuencias(reglas=reglas),
+}
+
+
+def mejor_respuesta(maquina, rondas=RONDAS_ANALISIS, objetivo="victorias"):
+    """
+    Calcula la mejor respuesta contra una máquina de estados por programación dinámica.
+
+    Se resuelve el problema de horizonte finito hacia atrás: el valor de
+    cada estado con h rondas por jugar es el máximo, para cada acción del
+    explotador, de los puntos esperados de la ronda más el valor del estado
+    siguiente con h - 1 rondas.
+
+    Args:
+        maquina (MaquinaEstados): Modelo de la estrategia
+        rondas (int): Horizonte, en rondas
+        objetivo (str): Clave de PUNTOS_OBJETIVO que se maximiza
+
+    Returns:
+        tuple: (política, valor) — la acción del explotador en cada estado con el
+            horizonte completo y los puntos esperados en las rondas desde el estado inicial
+    """
+    reglas = maquina.reglas
+    num_acciones = reglas.num_acciones
+    puntos = PUNTOS_OBJETIVO[objetivo]
+    # Puntos de cada ronda, indexados por accion_usuario * N + accion_computadora
+    pagos = [puntos[resultado] for fila in reglas.tabla_resultados for resultado in fila]
+    estados = range(maquina.num_estados)
+    acciones = range(num_acciones)
+
+    valores = [0.0] * maquina.num_estados
+    politica = [0] * maquina.num_estados
+    for _ in range(rondas):
+        nuevos = [0.0] * maquina.num_estados
+        for estado in estados:
+            candidatas = maquina.decisiones[estado]
+            siguientes = maquina.transiciones[estado]
+            mejor_valor = None
+            for accion in acciones:
+                base = accion * num_acciones
+                valor = sum(pagos[base + c] + valores[siguientes[base + c]] for c in candidatas) / len(candidatas)
+                if mejor_valor is None or valor > mejor_valor:
+                    mejor_valor = valor
+                    politica[estado] = accion
+            nuevos[estado] = mejor_valor
+        valores = nuevos
+
+    return tuple(reglas.acciones(accion) for accion in politica), valores[0]
+
+
+def evaluar_politica(maquina, politica, rondas=RONDAS_ANALISIS):
+    """
+    Calcula exactamente los resultados esperados de una política contra una máquina.
+
+    Args:
+        maquina (MaquinaEstados): Modelo de la estrategia
+        politica (Sequence[int]): Acción del explotador en cada estado
+        rondas (int): Rondas de la partida
+
+    Returns:
+        list: Rondas esperadas de cada ResultadoJuego (desde la perspectiva del explotador)
+    """
+    num_acciones = maquina.reglas.num_acciones
+    resultados = maquina.reglas.tabla_resultados
+    esperados = [0.0] * len(ResultadoJuego)
+
+    # Distribución de probabilidad del estado de la IA, solo con los estados alcanzables
+    distribucion = {0: 1.0}
+    for _ in range(rondas):
+        nueva = {}
+        for estado, probabilidad in distribucion.items():
+            accion = politica[estado]
+            candidatas = maquina.decisiones[estado]
+            siguientes = maquina.transiciones[estado]
+            parte = probabilidad / len(candidatas)
+            for c in candidatas:
+                esperados[resultados[accion][c]] += parte
+                siguiente = siguientes[accion * num_acciones + c]
+                nueva[siguiente] = nueva.get(siguiente, 0.0) + parte
+        distribucion = nueva
+    return esperados
+
+
+def secuencia_explotadora(maquina, politica, longitud, semilla=0):
+    """
+    Juega la política contra la máquina y devuelve las jugadas del explotador.
+
+    Las elecciones al azar de la IA se toman de un generador con semilla; si
+    la partida entra en un ciclo de estados en los que la IA es determinista,
+    se devuelve también ese ciclo, que se repite indefinidamente.
+
+    Args:
+        maquina (MaquinaEstados): Modelo de la estrategia
+        politica (Sequence[int]): Acción del explotador en cada estado
+        longitud (int): Rondas a jugar
+        semilla (int): Semilla de las elecciones al azar de la IA
+
+    Returns:
+        tuple: (jugadas del explotador, ciclo final de jugadas o None)
+    """
+    num_acciones = maquina.reglas.num_acciones
+    rng = random.Random(semilla)
+    secuencia = []
+    visitados = {}
+    ciclo = None
+    estado = 0
+    for ronda in range(longitud):
+        if ciclo is None and estado in visitados:
+            inicio = visitados[estado]
+            # Solo es un ciclo seguro si la IA no elige al azar en ninguno de sus estados
+            if all(len(maquina.decisiones[e]) == 1 for e, indice in visitados.items() if indice >= inicio):
+                ciclo = secuencia[inicio:]
+        visitados.setdefault(estado, ronda)
+        accion = politica[estado]
+        candidatas = maquina.decisiones[estado]
+        c = candidatas[0] if len(candidatas) == 1 else rng.choice(candidatas)
+        secuencia.append(accion)
+        estado = maquina.transiciones[estado][accion * num_acciones + c]
+    return secuencia, ciclo
+
+
+def analizar_maquina(maquina, rondas=RONDAS_ANALISIS, objetivo="victorias", longitud_secuencia=20, semilla=0):
+    """
+    Calcula la mejor respuesta contra una máquina y la evalúa.
+
+    Args:
+        maquina (MaquinaEstados): Modelo de la estrategia
+        rondas (int): Horizonte de la programación dinámica y de la evaluación
+        objetivo (str): Clave de PUNTOS_OBJETIVO que se maximiza
+        longitud_secuencia (int): Jugadas de la secuencia explotadora de ejemplo
+        semilla (int): Semilla de las elecciones al azar de la IA en la secuencia de ejemplo
+
+    Returns:
+        dict: Método, tasas esperadas, secuencia explotadora y ciclo
+    """
+    politica, _ = mejor_respuesta(maquina, rondas, objetivo)
+    esperados = evaluar_politica(maquina, politica, rondas)
+    secuencia, ciclo = secuencia_explotadora(maquina, politica, max(longitud_secuencia, maquina.num_estados + 1),
+                                             semilla)
+    return {
+        "metodo": "programacion_dinamica",
+        "estados": maquina.num_estados,
+        "rondas": rondas,
+        "tasa_victorias": esperados[ResultadoJuego.Victoria] / rondas,
+        "tasas": {resultado.name: esperados[resultado] / rondas for resultado in ResultadoJuego},
+        "secuencia": [accion.name for accion in secuencia[:longitud_secuencia]],
+        "ciclo": [accion.name for accion in ciclo] if ciclo else None,
+    }
+
+
+def ciclos_candidatos(num_acciones, longitud_maxima=LONGITUD_MAXIMA_CICLO):
+    """
+    Genera los ciclos de jugadas distintos hasta una longitud.
+
+    Se omiten los que repiten un ciclo más corto (por ejemplo 0101 = 01).
+
+    Args:
+        num_acciones (int): Número de acciones del juego
+        longitud_maxima (int): Longitud máxima de los ciclos
+
+    Returns:
+        list: Ciclos como tuplas de valores de acción
+    """
+    ciclos = []
+    for longitud in range(1, longitud_maxima + 1):
+        for ciclo in product(range(num_acciones), repeat=longitud):
+            if not any(longitud % periodo == 0 and ciclo == ciclo[:periodo] * (longitud // periodo)
+                       for periodo in range(1, longitud)):
+                ciclos.append(ciclo)
+    return ciclos
+
+
+def jugar_ciclos(tareas):
+    """
+    Juega un fragmento de partidas de ciclos contra una estrategia dentro de un proceso.
+
+    Args:
+        tareas (list): Tuplas (nombre_estrategia, ciclo, semilla, num_rondas)
+
+    Returns:
+        dict: {ciclo: [victorias, derrotas, empates]} del explotador
+    """
+    resultados = REGLAS_CLASICAS.tabla_resultados
+    acciones = tuple(REGLAS_CLASICAS.acciones)
+    tabla = {}
+    for nombre, ciclo, semilla, num_rondas in tareas:
+        estrategia = crear_estrategia(nombre, semilla)
+        siguiente_accion = estrategia.siguiente_accion
+        observar = estrategia.observar
+        conteos = tabla.setdefault(ciclo, [0] * len(ResultadoJuego))
+        jugadas = [acciones[accion] for accion in ciclo]
+        for ronda in range(num_rondas):
+            accion_usuario = jugadas[ronda % len(jugadas)]
+            accion_computadora = siguiente_accion()
+            resultado = resultados[accion_usuario][accion_computadora]
+            observar(accion_usuario, accion_computadora, resultado)
+            conteos[resultado] += 1
+    return tabla
+
+
+def explotar_por_simulacion(nombre, rondas=RONDAS_ANALISIS, partidas=8, longitud_maxima=LONGITUD_MAXIMA_CICLO,
+                            objetivo="victorias", semilla=0, num_procesos=None):
+    """
+    Busca el ciclo de jugadas que más gana a una estrategia enfrentándolos todos en paralelo.
+
+    Args:
+        nombre (str): Estrategia de ESTRATEGIAS (o versión de ESTRATEGIAS_VERSIONES)
+        rondas (int): Rondas de cada partida
+        partidas (int): Partidas de cada ciclo, cada una con su propia semilla
+        longitud_maxima (int): Longitud máxima de los ciclos
+        objetivo (str): Clave de PUNTOS_OBJETIVO con la que se ordenan los ciclos
+        semilla (int): Semilla del análisis, para reproducir los resultados
+        num_procesos (int | None): Número de procesos (por defecto, os.cpu_count())
+
+    Returns:
+        dict: Método, tasas del mejor ciclo y los mejores ciclos ordenados
+    """
+    puntos = PUNTOS_OBJETIVO[objetivo]
+    tareas = [
+        (nombre, ciclo, derivar_semilla(semilla, nombre, indice), rondas)
+        for ciclo in ciclos_candidatos(len(REGLAS_CLASICAS), longitud_maxima)
+        for indice in range(partidas)
+    ]
+    num_procesos = num_procesos or os.cpu_count() or 1
+    # Reparto intercalado para equilibrar los ciclos largos y cortos entre procesos
+    fragmentos = [tareas[i::num_procesos] for i in range(num_procesos) if tareas[i::num_procesos]]
+
+    if len(fragmentos) <= 1:
+        tablas = list(map(jugar_ciclos, fragmentos))
+    else:
+        from concurrent.futures import ProcessPoolExecutor
+
+        with ProcessPoolExecutor(max_workers=len(fragmentos)) as ejecutor:
+            tablas = list(ejecutor.map(jugar_ciclos, fragmentos))
+
+    totales = {}
+    for tabla in tablas:
+        for ciclo, conteos in tabla.items():
+            acumulado = totales.setdefault(ciclo, [0] * len(ResultadoJuego))
+            for resultado in ResultadoJuego:
+                acumulado[resultado] += conteos[resultado]
+
+    total_rondas = rondas * partidas
+    clasificados = sorted(totales.items(), key=lambda fila: (-sum(map(int.__mul__, puntos, fila[1])), fila[0]))
+    mejor_ciclo, mejores_conteos = clasificados[0]
+    acciones = REGLAS_CLASICAS.acciones
+    return {
+        "metodo": "simulacion",
+        "ciclos_probados": len(totales),
+        "rondas": total_rondas,
+        "tasa_victorias": mejores_conteos[ResultadoJuego.Victoria] / total_rondas,
+        "tasas": {resultado.name: mejores_conteos[resultado] / total_rondas for resultado in ResultadoJuego},
+        "ciclo": [acciones(accion).name for accion in mejor_ciclo],
+        "mejores": [
+            {"ciclo": [acciones(accion).name for accion in ciclo],
+             "tasa_victorias": conteos[ResultadoJuego.Victoria] / total_rondas}
+            for ciclo, conteos in clasificados[:5]
+        ],
+    }
+
+
+def analizar(nombre, metodo="auto", rondas=RONDAS_ANALISIS, objetivo="victorias", partidas=8,
+             longitud_maxima=LONGITUD_MAXIMA_CICLO, semilla=0, num_procesos=None):
+    """
+    Analiza la explotabilidad de una estrategia con el método adecuado a su estado.
+
+    Args:
+        nombre (str): Estrategia de ESTRATEGIAS (o versión de ESTRATEGIAS_VERSIONES)
+        metodo (str): "auto", "programacion_dinamica" o "simulacion"
+        rondas (int): Horizonte / rondas de cada partida
+        objetivo (str): Clave de PUNTOS_OBJETIVO que se maximiza
+        partidas (int): Partidas por ciclo en la simulación
+        longitud_maxima (int): Longitud máxima de los ciclos de la simulación
+        semilla (int): Semilla del análisis
+        num_procesos (int | None): Procesos de la simulación
+
+    Returns:
+        dict: Informe con la estrategia, el método usado y sus resultados
+
+    Raises:
+        ValueError: Si se pide programación dinámica para una estrategia sin máquina de estados
+    """
+    nombre_estrategia = ESTRATEGIAS_VERSIONES.get(nombre, nombre)
+    maquina = MAQUINAS[nombre_estrategia]() if nombre_estrategia in MAQUINAS and metodo != "simulacion" else None
+    if metodo == "programacion_dinamica" and maquina is None:
+        raise ValueError(f"La estrategia {nombre} no tiene una máquina de estados analizable")
+
+    if maquina is not None:
+        informe = analizar_maquina(maquina, rondas, objetivo, semilla=semilla)
+    else:
+        informe = explotar_por_simulacion(nombre_estrategia, rondas, partidas, longitud_maxima,
+                                          objetivo, semilla, num_procesos)
+    return {"estrategia": nombre, **informe}
+
+
+def main():
+    """Función principal que analiza la explotabilidad de las estrategias desde la línea de comandos."""
+    import argparse
+
+    from .estrategias import ESTRATEGIAS
+
+    nombres = [*ESTRATEGIAS, *ESTRATEGIAS_VERSIONES]
+    parser = argparse.ArgumentParser(description="Mejor respuesta y tasa de victorias contra cada IA")
+    parser.add_argument("estrategias", nargs="*", metavar="estrategia",
+                        help=f"Estrategias a analizar (por defecto, todas las de ESTRATEGIAS): {', '.join(nombres)}")
+    parser.add_argument("--metodo", choices=["auto", "programacion_dinamica", "simulacion"], default="auto",
+                        help="Método de búsqueda de la mejor respuesta")
+    parser.add_argument("--rondas", type=int, default=RONDAS_ANALISIS, help="Rondas del horizonte o de cada partida")
+    parser.add_argument("--objetivo", choices=PUNTOS_OBJETIVO, default="victorias",
+                        help="Victorias, o victorias menos derrotas")
+    parser.add_argument("--partidas", type=int, default=8, help="Partidas por ciclo en la simulación")
+    parser.add_argument("--longitud-ciclo", type=int, default=LONGITUD_MAXIMA_CICLO,
+                        help="Longitud máxima de los ciclos de la simulación")
+    parser.add_argument("--semilla", type=int, default=0, help="Semilla del análisis")
+    parser.add_argument("--procesos", type=int, default=None, help="Número de procesos de la simulación")
+    argumentos = parser.parse_args()
+
+    for nombre in argumentos.estrategias or ESTRATEGIAS:
+        if nombre not in nombres:
+            parser.error(f"Estrategia desconocida: {nombre}")
+        try:
+            informe = analizar(nombre, argumentos.metodo, argumentos.rondas, argumentos.objetivo,
+                               argumentos.partidas, argumentos.longitud_ciclo, argumentos.semilla,
+                               argumentos.procesos)
+        except ValueError as error:
+            parser.error(str(error))
+        print(json.dumps(informe, ensure_ascii=False))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,154 @@
+"""
+Piedra, Papel y Tijeras - Historial compacto de partidas
+========================================================
+Almacén del historial de una partida que guarda cada ronda en un único byte
+en lugar de listas de objetos IntEnum.
+
+Características:
+- Un byte por ronda: acción del usuario, acción de la computadora y resultado
+- Vistas por campo (acciones del usuario, de la computadora, resultados) sin copias
+- Índices negativos y cortes que devuelven nuevas vistas, también sin copias
+- Las vistas sustituyen a las listas que reciben las estrategias de las versiones 4 y 5
+
+Formato de cada byte:
+    bits 0-1: acción del usuario
+    bits 2-3: acción de la computadora
+    bits 4-5: resultado desde la perspectiva del usuario
+"""
+
+from .nucleo import AccionJuego, ResultadoJuego
+
+# Resultado visto desde el otro jugador: la victoria de uno es la derrota del otro
+RESULTADO_RIVAL = {
+    ResultadoJuego.Victoria: ResultadoJuego.Derrota,
+    ResultadoJuego.Derrota: ResultadoJuego.Victoria,
+    ResultadoJuego.Empate: ResultadoJuego.Empate,
+}
+
+
+def _tabla_decodificacion(desplazamiento, valores):
+    """Precalcula el valor de un campo para cada uno de los 256 bytes posibles."""
+    # El valor 3 de un campo de 2 bits nunca se escribe: se decodifica como None
+    valores = (*valores, None)
+    return tuple(valores[(byte >> desplazamiento) & 0b11] for byte in range(256))
+
+
+_DECODIFICAR_USUARIO = _tabla_decodificacion(0, AccionJuego)
+_DECODIFICAR_COMPUTADORA = _tabla_decodificacion(2, AccionJuego)
+_DECODIFICAR_RESULTADO = _tabla_decodificacion(4, ResultadoJuego)
+_DECODIFICAR_RESULTADO_RIVAL = _tabla_decodificacion(4, (RESULTADO_RIVAL[resultado] for resultado in ResultadoJuego))
+
+
+class VistaHistorial:
+    """Vista de solo lectura de un campo del historial, sin copiar los datos."""
+
+    __slots__ = ("_rondas", "_decodificar", "_inicio", "_fin")
+
+    def __init__(self, rondas, decodificar, inicio=0, fin=None):
+        """
+        Args:
+            rondas (bytearray): Bytes del historial
+            decodificar (tuple): Tabla que convierte cada byte en el valor del campo
+            inicio (int): Primera ronda de la vista
+            fin (int | None): Ronda siguiente a la última (None = sigue creciendo con el historial)
+        """
+        self._rondas = rondas
+        self._decodificar = decodificar
+        self._inicio = inicio
+        self._fin = fin
+
+    def __len__(self):
+        fin = len(self._rondas) if self._fin is None else self._fin
+        return fin - self._inicio
+
+    def __getitem__(self, indice):
+        # Camino rápido: vista completa y viva, indexada igual que el bytearray
+        if not self._inicio and self._fin is None and not isinstance(indice, slice):
+            return self._decodificar[self._rondas[indice]]
+
+        longitud = len(self)
+
+        if isinstance(indice, slice):
+            inicio, fin, paso = indice.indices(longitud)
+            if paso != 1:
+                raise ValueError("Las vistas del historial solo admiten cortes con paso 1")
+            return VistaHistorial(self._rondas, self._decodificar,
+                                  self._inicio + inicio, self._inicio + max(inicio, fin))
+
+        if indice < 0:
+            indice += longitud
+        if not 0 <= indice < longitud:
+            raise IndexError("Índice fuera del historial")
+        return self._decodificar[self._rondas[self._inicio + indice]]
+
+    def __iter__(self):
+        rondas = self._rondas
+        decodificar = self._decodificar
+        for posicion in range(self._inicio, self._inicio + len(self)):
+            yield decodificar[rondas[posicion]]
+
+    def __repr__(self):
+        return f"VistaHistorial({list(self)!r})"
+
+
+class HistorialPartida:
+    """Historial de una partida con un byte por ronda."""
+
+    __slots__ = ("_rondas",)
+
+    def __init__(self, rondas=b""):
+        """
+        Args:
+            rondas (bytes): Rondas ya codificadas con las que iniciar el historial
+        """
+        self._rondas = bytearray(rondas)
+
+    def append(self, accion_usuario, accion_computadora, resultado):
+        """
+        Añade una ronda al historial.
+
+        Args:
+            accion_usuario (AccionJuego): La acción elegida por el usuario
+            accion_computadora (AccionJuego): La acción elegida por la computadora
+            resultado (ResultadoJuego): El resultado desde la perspectiva del usuario
+        """
+        self._rondas.append(accion_usuario | accion_computadora << 2 | resultado << 4)
+
+    @property
+    def acciones_usuario(self):
+        """VistaHistorial: Acciones del usuario en cada ronda."""
+        return VistaHistorial(self._rondas, _DECODIFICAR_USUARIO)
+
+    @property
+    def acciones_computadora(self):
+        """VistaHistorial: Acciones de la computadora en cada ronda."""
+        return VistaHistorial(self._rondas, _DECODIFICAR_COMPUTADORA)
+
+    @property
+    def resultados(self):
+        """VistaHistorial: Resultados desde la perspectiva del usuario (como historial_juego)."""
+        return VistaHistorial(self._rondas, _DECODIFICAR_RESULTADO)
+
+    @property
+    def resultados_computadora(self):
+        """VistaHistorial: Resultados desde la perspectiva de la computadora."""
+        return VistaHistorial(self._rondas, _DECODIFICAR_RESULTADO_RIVAL)
+
+    def __len__(self):
+        return len(self._rondas)
+
+    def __getitem__(self, indice):
+        """
+        Obtiene una ronda del historial.
+
+        Args:
+            indice (int): Posición de la ronda (admite índices negativos)
+
+        Returns:
+            tuple: (accion_usuario, accion_computadora, resultado)
+        """
+        byte = self._rondas[indice]
+        return (_DECODIFICAR_USUARIO[byte], _DECODIFICAR_COMPUTADORA[byte], _DECODIFICAR_RESULTADO[byte])
+
+    def __bytes__(self):
+        return bytes(self._rondas)
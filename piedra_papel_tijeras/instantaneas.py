@@ -0,0 +1,245 @@
+"""
+Piedra, Papel y Tijeras - Instantáneas binarias de sesiones
+===========================================================
+Guarda muchas sesiones compactadas en un único archivo binario y las vuelve
+a leer, para que un proceso se pueda reiniciar sin que los jugadores pierdan
+lo que su IA había aprendido.
+
+Características:
+- Por sesión: identificador, IA, semilla, rondas jugadas, cola del historial
+  (un byte por ronda, igual que HistorialPartida) y estado exportado de la IA,
+  que incluye la posición de su generador aleatorio (GeneradorReanudable):
+  la sesión restaurada sigue exactamente donde lo dejó
+- Formato propio, etiquetado y sin pickle: enteros de longitud variable
+  (zigzag + LEB128), reales de 8 bytes, bytes, texto, tuplas y diccionarios;
+  los valores de AccionJuego se guardan como enteros de un byte
+- Escritura por bloques de 1 MiB en un archivo temporal que se renombra al
+  terminar: un fallo a mitad de escritura no estropea la instantánea anterior
+- Lectura del archivo de una vez y decodificación sobre un memoryview, sin
+  copias intermedias: cientos de miles de sesiones en pocos segundos
+- Versión en la cabecera: un archivo de otra versión se rechaza con un
+  mensaje claro en lugar de restaurar estados incorrectos
+
+Formato del archivo:
+    MAGIA_INSTANTANEA (8 bytes, el último es la versión), CABECERA_INSTANTANEA
+    (número de sesiones) y, por cada sesión, REGISTRO_INSTANTANEA seguido de
+    la tupla (IA, semilla, cola del historial, estado) codificada con codificar_valor()
+"""
+
+import os
+import struct
+
+# Identificador del formato; el último byte es la versión
+MAGIA_INSTANTANEA = b"PPTSNAP\x01"
+
+# <sesiones: uint64>
+CABECERA_INSTANTANEA = struct.Struct("<Q")
+
+# <id_sesion: uint64> <rondas_jugadas: uint64> <bytes del resto del registro: uint32>
+REGISTRO_INSTANTANEA = struct.Struct("<QQI")
+
+# Bytes acumulados en memoria antes de cada escritura en el archivo
+TAMANO_BUFFER_INSTANTANEA = 1 << 20
+
+# Etiqueta de tipo que precede a cada valor codificado
+_NULO, _FALSO, _VERDADERO, _ENTERO, _REAL, _BYTES, _TEXTO, _TUPLA, _DICCIONARIO = range(9)
+
+# Reales en doble precisión (factor de olvido de la IA dirichlet)
+_FORMATO_REAL = struct.Struct("<d")
+
+
+def _escribir_natural(salida, numero):
+    """Añade un entero no negativo en LEB128 (7 bits por byte, el bit alto indica que sigue otro)."""
+    while numero >= 0x80:
+        salida.append(numero & 0x7F | 0x80)
+        numero >>= 7
+    salida.append(numero)
+
+
+def _leer_natural(datos, posicion):
+    """Lee un entero LEB128 y devuelve (entero, posición siguiente)."""
+    numero = 0
+    desplazamiento = 0
+    while True:
+        byte = datos[posicion]
+        posicion += 1
+        numero |= (byte & 0x7F) << desplazamiento
+        if byte < 0x80:
+            return numero, posicion
+        desplazamiento += 7
+
+
+def codificar_valor(valor, salida):
+    """
+    Añade un valor al final de un buffer en el formato etiquetado de las instantáneas.
+
+    Args:
+        valor: None, bool, int, float, bytes, str, tuple/list o dict de estos tipos
+        salida (bytearray): Buffer de salida
+
+    Raises:
+        TypeError: Si el valor (o alguno de sus elementos) no tiene un tipo admitido
+    """
+    if valor is None:
+        salida.append(_NULO)
+    elif valor is True or valor is False:
+        salida.append(_VERDADERO if valor else _FALSO)
+    elif isinstance(valor, int):
+        # Zigzag: los negativos pequeños también ocupan pocos bytes
+        salida.append(_ENTERO)
+        _escribir_natural(salida, valor << 1 if valor >= 0 else (-valor << 1) - 1)
+    elif isinstance(valor, float):
+        salida.append(_REAL)
+        salida += _FORMATO_REAL.pack(valor)
+    elif isinstance(valor, (bytes, bytearray, memoryview)):
+        salida.append(_BYTES)
+        _escribir_natural(salida, len(valor))
+        salida += valor
+    elif isinstance(valor, str):
+        codificado = valor.encode()
+        salida.append(_TEXTO)
+        _escribir_natural(salida, len(codificado))
+        salida += codificado
+    elif isinstance(valor, (tuple, list)):
+        salida.append(_TUPLA)
+        _escribir_natural(salida, len(valor))
+        for elemento in valor:
+            codificar_valor(elemento, salida)
+    elif isinstance(valor, dict):
+        salida.append(_DICCIONARIO)
+        _escribir_natural(salida, len(valor))
+        for clave, elemento in valor.items():
+            codificar_valor(clave, salida)
+            codificar_valor(elemento, salida)
+    else:
+        raise TypeError(f"Tipo no admitido en una instantánea: {type(valor).__name__}")
+
+
+def decodificar_valor(datos, posicion=0):
+    """
+    Lee un valor escrito con codificar_valor().
+
+    Args:
+        datos (bytes | memoryview): Datos codificados
+        posicion (int): Posición donde empieza el valor
+
+    Returns:
+        tuple: (valor, posición siguiente); las listas se leen como tuplas
+
+    Raises:
+        ValueError: Si la etiqueta de tipo no es válida
+        IndexError: Si los datos están truncados
+    """
+    etiqueta = datos[posicion]
+    posicion += 1
+    if etiqueta == _ENTERO:
+        numero, posicion = _leer_natural(datos, posicion)
+        return (numero >> 1 if not numero & 1 else -((numero + 1) >> 1)), posicion
+    if etiqueta in (_BYTES, _TEXTO):
+        longitud, posicion = _leer_natural(datos, posicion)
+        fin = posicion + longitud
+        if fin > len(datos):
+            raise IndexError("Datos truncados")
+        contenido = bytes(datos[posicion:fin])
+        return (contenido if etiqueta == _BYTES else contenido.decode()), fin
+    if etiqueta == _TUPLA:
+        longitud, posicion = _leer_natural(datos, posicion)
+        elementos = []
+        for _ in range(longitud):
+            elemento, posicion = decodificar_valor(datos, posicion)
+            elementos.append(elemento)
+        return tuple(elementos), posicion
+    if etiqueta == _DICCIONARIO:
+        longitud, posicion = _leer_natural(datos, posicion)
+        diccionario = {}
+        for _ in range(longitud):
+            clave, posicion = decodificar_valor(datos, posicion)
+            diccionario[clave], posicion = decodificar_valor(datos, posicion)
+        return diccionario, posicion
+    if etiqueta == _REAL:
+        return _FORMATO_REAL.unpack_from(datos, posicion)[0], posicion + _FORMATO_REAL.size
+    if etiqueta == _NULO:
+        return None, posicion
+    if etiqueta in (_FALSO, _VERDADERO):
+        return etiqueta == _VERDADERO, posicion
+    raise ValueError(f"Etiqueta de tipo desconocida: {etiqueta}")
+
+
+def guardar_sesiones(ruta, compactas):
+    """
+    Escribe una instantánea con muchas sesiones compactadas, de forma atómica.
+
+    Args:
+        ruta (str | os.PathLike): Ruta del archivo
+        compactas (Iterable[SesionCompacta]): Sesiones a guardar
+
+    Returns:
+        int: Número de sesiones guardadas
+
+    Raises:
+        TypeError: Si el estado de alguna IA contiene tipos no admitidos
+    """
+    temporal = f"{ruta}.tmp"
+    num_sesiones = 0
+    with open(temporal, "wb") as archivo:
+        archivo.write(MAGIA_INSTANTANEA)
+        # El número de sesiones se conoce al final: se reserva su sitio y se escribe después
+        archivo.write(CABECERA_INSTANTANEA.pack(0))
+        bloque = bytearray()
+        cuerpo = bytearray()
+        for compacta in compactas:
+            cuerpo.clear()
+            codificar_valor((compacta.nombre_estrategia, compacta.semilla, compacta.cola_historial,
+                             compacta.estado_jugador), cuerpo)
+            bloque += REGISTRO_INSTANTANEA.pack(compacta.id_sesion, compacta.rondas_jugadas, len(cuerpo))
+            bloque += cuerpo
+            num_sesiones += 1
+            if len(bloque) >= TAMANO_BUFFER_INSTANTANEA:
+                archivo.write(bloque)
+                bloque.clear()
+        archivo.write(bloque)
+        archivo.seek(len(MAGIA_INSTANTANEA))
+        archivo.write(CABECERA_INSTANTANEA.pack(num_sesiones))
+    os.replace(temporal, ruta)
+    return num_sesiones
+
+
+def leer_sesiones(ruta):
+    """
+    Lee una instantánea escrita con guardar_sesiones().
+
+    Args:
+        ruta (str | os.PathLike): Ruta del archivo
+
+    Yields:
+        tuple: (id_sesion, nombre_estrategia, semilla, rondas_jugadas, cola_historial, estado_jugador),
+            en el orden de los argumentos de SesionCompacta
+
+    Raises:
+        ValueError: Si el archivo no es una instantánea, es de otra versión o está truncado
+    """
+    with open(ruta, "rb") as archivo:
+        contenido = archivo.read()
+
+    if contenido[:len(MAGIA_INSTANTANEA) - 1] != MAGIA_INSTANTANEA[:-1]:
+        raise ValueError(f"{ruta} no es una instantánea de sesiones de Piedra, Papel y Tijeras")
+    if len(contenido) < len(MAGIA_INSTANTANEA) + CABECERA_INSTANTANEA.size:
+        raise ValueError(f"La instantánea {ruta} está truncada")
+    if contenido[len(MAGIA_INSTANTANEA) - 1] != MAGIA_INSTANTANEA[-1]:
+        raise ValueError(f"Versión de instantánea no soportada: {contenido[len(MAGIA_INSTANTANEA) - 1]}")
+
+    datos = memoryview(contenido)
+    posicion = len(MAGIA_INSTANTANEA)
+    (num_sesiones,) = CABECERA_INSTANTANEA.unpack_from(datos, posicion)
+    posicion += CABECERA_INSTANTANEA.size
+    try:
+        for _ in range(num_sesiones):
+            id_sesion, rondas_jugadas, longitud = REGISTRO_INSTANTANEA.unpack_from(datos, posicion)
+            posicion += REGISTRO_INSTANTANEA.size
+            (nombre_estrategia, semilla, cola_historial, estado_jugador), fin = decodificar_valor(datos, posicion)
+            if fin != posicion + longitud:
+                raise ValueError(f"Registro de la sesión {id_sesion} corrupto")
+            posicion = fin
+            yield id_sesion, nombre_estrategia, semilla, rondas_jugadas, cola_historial, estado_jugador
+    except (struct.error, IndexError):
+        raise ValueError(f"La instantánea {ruta} está truncada") from None
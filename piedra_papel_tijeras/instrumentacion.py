@@ -0,0 +1,329 @@
+"""
+Piedra, Papel y Tijeras - Instrumentación del bucle de juego
+============================================================
+Capa opcional de medida que registra cuánto tarda cada fase de una ronda
+(entrada, decisión de la IA, evaluación y mensajes) y cuenta los eventos
+relevantes, para saber dónde se va la latencia en lugar de suponerlo.
+
+Características:
+- Histogramas de latencia con cubetas fijas: registrar una medida es una
+  búsqueda binaria y un incremento, sin guardar las muestras
+- Contadores de rondas, entradas inválidas, etc., y rondas por segundo
+- Coste nulo cuando está desactivada: las funciones solo se envuelven si se
+  instrumenta la versión (o el servidor recibe una Instrumentacion)
+- Volcado bajo demanda en JSON o en el formato de texto de Prometheus,
+  también con la señal SIGUSR1 en sistemas POSIX
+
+Fases medidas en las versiones numeradas:
+    entrada      obtener_accion_usuario() (o input() en las versiones 1 y 2)
+    decision     obtener_accion_computadora()
+    evaluacion   evaluar_juego(), incluido el mensaje del resultado
+    renderizado  cada print() del módulo
+"""
+
+import builtins
+import json
+import signal
+import sys
+import time
+from bisect import bisect_left
+from collections import Counter
+from functools import wraps
+
+# Límites superiores de las cubetas de latencia, en nanosegundos (de 1 µs a 1 s)
+LIMITES_LATENCIA_NS = (
+    1_000, 2_500, 5_000, 10_000, 25_000, 50_000, 100_000, 250_000, 500_000,
+    1_000_000, 2_500_000, 5_000_000, 10_000_000, 25_000_000, 100_000_000, 1_000_000_000,
+)
+
+# Prefijo de las métricas en formato Prometheus
+PREFIJO_PROMETHEUS = "ppt"
+
+
+class HistogramaLatencias:
+    """Histograma de duraciones con cubetas fijas."""
+
+    __slots__ = ("limites", "cubetas", "suma_ns", "total")
+
+    def __init__(self, limites=LIMITES_LATENCIA_NS):
+        """
+        Args:
+            limites (tuple): Límites superiores de las cubetas en nanosegundos, ordenados
+        """
+        self.limites = limites
+        # Una cubeta por límite y una más para lo que los supera a todos
+        self.cubetas = [0] * (len(limites) + 1)
+        self.suma_ns = 0
+        self.total = 0
+
+    def registrar(self, duracion_ns):
+        """
+        Añade una medida al histograma.
+
+        Args:
+            duracion_ns (int): Duración en nanosegundos
+        """
+        self.cubetas[bisect_left(self.limites, duracion_ns)] += 1
+        self.suma_ns += duracion_ns
+        self.total += 1
+
+    def percentil(self, fraccion):
+        """
+        Estima un percentil con el límite superior de la cubeta que lo contiene.
+
+        Args:
+            fraccion (float): Percentil entre 0 y 1 (0.99 = p99)
+
+        Returns:
+            int | None: Cota superior en nanosegundos (None si no hay medidas o supera el último límite)
+        """
+        if not self.total:
+            return None
+        objetivo = fraccion * self.total
+        acumulado = 0
+        for limite, conteo in zip(self.limites, self.cubetas):
+            acumulado += conteo
+            if acumulado >= objetivo:
+                return limite
+        return None
+
+    def como_dict(self):
+        """
+        Returns:
+            dict: Cubetas, total, media y percentiles p50/p99 en nanosegundos
+        """
+        return {
+            "limites_ns": list(self.limites),
+            "cubetas": list(self.cubetas),
+            "total": self.total,
+            "media_ns": self.suma_ns / self.total if self.total else 0.0,
+            "p50_ns": self.percentil(0.5),
+            "p99_ns": self.percentil(0.99),
+        }
+
+
+class Instrumentacion:
+    """Histogramas por fase y contadores de eventos del bucle de juego."""
+
+    def __init__(self, limites=LIMITES_LATENCIA_NS, reloj=time.perf_counter_ns):
+        """
+        Args:
+            limites (tuple): Límites de las cubetas de los histogramas en nanosegundos
+            reloj (callable): Función que devuelve el instante actual en nanosegundos
+        """
+        self.limites = limites
+        self.reloj = reloj
+        self.fases = {}
+        self.contadores = Counter()
+        self._inicio = reloj()
+
+    def registrar(self, fase, duracion_ns):
+        """
+        Añade la duración de una fase a su histograma.
+
+        Args:
+            fase (str): Nombre de la fase
+            duracion_ns (int): Duración en nanosegundos
+        """
+        histograma = self.fases.get(fase)
+        if histograma is None:
+            histograma = self.fases[fase] = HistogramaLatencias(self.limites)
+        histograma.registrar(duracion_ns)
+
+    def contar(self, evento, cantidad=1):
+        """
+        Incrementa el contador de un evento.
+
+        Args:
+            evento (str): Nombre del evento (por ejemplo "rondas" o "entradas_invalidas")
+            cantidad (int): Incremento
+        """
+        self.contadores[evento] += cantidad
+
+    def medir_fase(self, fase, funcion, evento=None, errores=(), evento_error=None):
+        """
+        Envuelve una función para medir cada llamada como una fase.
+
+        Args:
+            fase (str): Nombre de la fase
+            funcion (callable): Función a envolver
+            evento (str | None): Contador que se incrementa en cada llamada terminada sin error
+            errores (tuple): Excepciones que se cuentan en evento_error antes de propagarlas
+            evento_error (str | None): Contador de las llamadas que lanzan alguno de esos errores
+
+        Returns:
+            callable: La función envuelta
+        """
+        reloj = self.reloj
+
+        @wraps(funcion)
+        def medida(*args, **kwargs):
+            inicio = reloj()
+            try:
+                resultado = funcion(*args, **kwargs)
+            except errores:
+                self.contar(evento_error)
+                raise
+            finally:
+                self.registrar(fase, reloj() - inicio)
+            if evento is not None:
+                self.contar(evento)
+            return resultado
+
+        return medida
+
+    def rondas_por_segundo(self):
+        """
+        Returns:
+            float: Rondas registradas por segundo desde que se creó la instrumentación
+        """
+        segundos = (self.reloj() - self._inicio) / 1e9
+        return self.contadores["rondas"] / segundos if segundos > 0 else 0.0
+
+    def como_dict(self):
+        """
+        Returns:
+            dict: Contadores, rondas por segundo e histogramas de cada fase
+        """
+        return {
+            "contadores": dict(self.contadores),
+            "rondas_por_segundo": self.rondas_por_segundo(),
+            "fases": {fase: histograma.como_dict() for fase, histograma in self.fases.items()},
+        }
+
+    def como_json(self):
+        """
+        Returns:
+            str: El volcado de como_dict() en JSON
+        """
+        return json.dumps(self.como_dict(), ensure_ascii=False)
+
+    def como_prometheus(self, prefijo=PREFIJO_PROMETHEUS):
+        """
+        Genera las métricas en el formato de texto de Prometheus.
+
+        Args:
+            prefijo (str): Prefijo de los nombres de métrica
+
+        Returns:
+            str: Métricas con contadores (_total), rondas por segundo e histogramas en segundos
+        """
+        lineas = []
+        for evento, valor in sorted(self.contadores.items()):
+            lineas.append(f"# TYPE {prefijo}_{evento}_total counter")
+            lineas.append(f"{prefijo}_{evento}_total {valor}")
+
+        lineas.append(f"# TYPE {prefijo}_rondas_por_segundo gauge")
+        lineas.append(f"{prefijo}_rondas_por_segundo {self.rondas_por_segundo()}")
+
+        nombre = f"{prefijo}_fase_duracion_segundos"
+        lineas.append(f"# TYPE {nombre} histogram")
+        for fase, histograma in sorted(self.fases.items()):
+            acumulado = 0
+            for limite, conteo in zip(histograma.limites, histograma.cubetas):
+                acumulado += conteo
+                lineas.append(f'{nombre}_bucket{{fase="{fase}",le="{limite / 1e9:g}"}} {acumulado}')
+            lineas.append(f'{nombre}_bucket{{fase="{fase}",le="+Inf"}} {histograma.total}')
+            lineas.append(f'{nombre}_sum{{fase="{fase}"}} {histograma.suma_ns / 1e9}')
+            lineas.append(f'{nombre}_count{{fase="{fase}"}} {histograma.total}')
+
+        return "\n".join(lineas) + "\n"
+
+    def volcar(self, formato="json", archivo=None):
+        """
+        Escribe las métricas en un flujo.
+
+        Args:
+            formato (str): "json" o "prometheus"
+            archivo (TextIO | None): Flujo de salida (por defecto, la salida de error)
+        """
+        texto = self.como_prometheus() if formato == "prometheus" else self.como_json() + "\n"
+        (archivo or sys.stderr).write(texto)
+
+    def volcar_con_senal(self, formato="json", archivo=None, senal=None):
+        """
+        Vuelca las métricas cada vez que el proceso recibe una señal (SIGUSR1 por defecto).
+
+        No hace nada en sistemas sin esa señal (Windows).
+
+        Args:
+            formato (str): "json" o "prometheus"
+            archivo (TextIO | None): Flujo de salida (por defecto, la salida de error)
+            senal (int | None): Señal a atender
+        """
+        senal = senal if senal is not None else getattr(signal, "SIGUSR1", None)
+        if senal is not None:
+            signal.signal(senal, lambda *_: self.volcar(formato, archivo))
+
+
+def instrumentar_version(modulo, instrumentacion):
+    """
+    Sustituye las funciones del bucle de una versión numerada por versiones medidas.
+
+    Se envuelven las variables globales del módulo, de modo que main() usa
+    las versiones medidas sin modificar su código. print() e input() se
+    sustituyen solo dentro del módulo.
+
+    Args:
+        modulo (module): Versión cargada con cargar_version()
+        instrumentacion (Instrumentacion): Destino de las medidas
+    """
+    medir = instrumentacion.medir_fase
+
+    if hasattr(modulo, "obtener_accion_usuario"):
+        modulo.obtener_accion_usuario = medir("entrada", modulo.obtener_accion_usuario,
+                                              errores=(ValueError,), evento_error="entradas_invalidas")
+    else:
+        # Versiones 1 y 2: la entrada se lee directamente con input() en main()
+        modulo.input = medir("entrada", builtins.input)
+
+    if hasattr(modulo, "OpcionIncorrectaException"):
+        # Versión 2: contar cada vez que main() lanza la excepción de opción inválida
+        excepcion = modulo.OpcionIncorrectaException
+
+        class OpcionIncorrectaContada(excepcion):
+            def __init__(self, *args):
+                instrumentacion.contar("entradas_invalidas")
+                super().__init__(*args)
+
+        modulo.OpcionIncorrectaException = OpcionIncorrectaContada
+
+    if hasattr(modulo, "obtener_accion_computadora"):
+        modulo.obtener_accion_computadora = medir("decision", modulo.obtener_accion_computadora)
+
+    modulo.evaluar_juego = medir("evaluacion", modulo.evaluar_juego, evento="rondas")
+    modulo.print = medir("renderizado", builtins.print)
+
+
+def main():
+    """Función principal que juega una versión instrumentada y vuelca sus métricas al terminar."""
+    import argparse
+
+    from .versiones import cargar_version
+
+    parser = argparse.ArgumentParser(description="Juega una versión con instrumentación y muestra sus métricas")
+    parser.add_argument("version", help="Versión a jugar, por ejemplo 5_Mas_IA")
+    parser.add_argument("--formato", choices=["json", "prometheus"], default="json", help="Formato del volcado")
+    parser.add_argument("--salida", help="Archivo donde escribir las métricas (por defecto, la salida de error)")
+    argumentos = parser.parse_args()
+
+    instrumentacion = Instrumentacion()
+    modulo = cargar_version(argumentos.version)
+    instrumentar_version(modulo, instrumentacion)
+    instrumentacion.volcar_con_senal(argumentos.formato)
+
+    try:
+        modulo.main()
+    except (EOFError, KeyboardInterrupt):
+        # Entrada redirigida agotada o interrupción: se vuelcan igualmente las métricas
+        pass
+
+    if argumentos.salida:
+        with open(argumentos.salida, "w", encoding="utf-8") as archivo:
+            instrumentacion.volcar(argumentos.formato, archivo)
+    else:
+        instrumentacion.volcar(argumentos.formato)
+
+
+if __name__ == "__main__":
+    main()
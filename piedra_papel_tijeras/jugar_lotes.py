@@ -0,0 +1,267 @@
+"""
+Piedra, Papel y Tijeras - Partidas por lotes sin interacción
+============================================================
+Juega contra una IA una secuencia de jugadas leída de la entrada estándar o
+de un archivo, sin preguntas entre rondas, y escribe los resultados en
+bloque.
+
+Características:
+- Entrada en texto (una jugada por línea: 0/1/2 o piedra/papel/tijeras) o en
+  binario (un byte por jugada)
+- IA elegida por estrategia (ESTRATEGIAS) o por versión (3, 4 y 5)
+- Lectura y escritura por fragmentos con buffers grandes: memoria constante
+  aunque la entrada tenga millones de rondas
+- Salida en CSV, JSON Lines, texto del juego o bitácora binaria (que se puede
+  encadenar con analisis)
+- Cada fragmento se convierte de una vez: las líneas de salida de las 9
+  combinaciones posibles se precalculan y las columnas se separan con bytes.translate()
+- Las jugadas inválidas se descartan y se cuentan, como en el juego interactivo
+"""
+
+import json
+import sys
+from itertools import repeat
+
+from .bitacora import FORMATO_REGISTRO, MAGIA_BITACORA
+from .estrategias import ESTRATEGIAS
+from .nucleo import MENSAJES_RONDA, TABLA_RESULTADOS, AccionJuego, ResultadoJuego
+from .versiones import VERSION_IA_BASICA, VERSION_MAS_IA
+
+# Bytes leídos de la entrada en cada fragmento
+TAMANO_FRAGMENTO = 1 << 20
+
+# IA equivalente a cada versión numerada
+ESTRATEGIAS_VERSIONES = {
+    "3_Codigo_Limpio": "aleatoria",
+    VERSION_IA_BASICA: "ia_basica",
+    VERSION_MAS_IA: "frecuencias",
+}
+
+# Jugadas válidas en la entrada de texto (en minúsculas) y su acción
+JUGADAS_TEXTO = {
+    **{str(accion.value).encode(): accion.value for accion in AccionJuego},
+    **{accion.name.lower().encode(): accion.value for accion in AccionJuego},
+}
+
+# Cada ronda se codifica en un byte: accion_usuario * N + accion_computadora
+_NUM_ACCIONES = len(AccionJuego)
+_COMBINACIONES = [(u, c) for u in AccionJuego for c in AccionJuego]
+
+# Tablas de bytes.translate() que extraen cada columna del código de ronda
+_COLUMNA_USUARIO = bytes(u for u, _ in _COMBINACIONES).ljust(256, b"\0")
+_COLUMNA_COMPUTADORA = bytes(c for _, c in _COMBINACIONES).ljust(256, b"\0")
+_COLUMNA_RESULTADO = bytes(TABLA_RESULTADOS[u][c] for u, c in _COMBINACIONES).ljust(256, b"\0")
+
+# Línea de salida de cada código de ronda, ya codificada, por formato de texto
+LINEAS_SALIDA = {
+    "csv": tuple(f"{u.name},{c.name},{TABLA_RESULTADOS[u][c].name}\n".encode()
+                 for u, c in _COMBINACIONES),
+    "jsonl": tuple((json.dumps({"usuario": u.name, "computadora": c.name,
+                                "resultado": TABLA_RESULTADOS[u][c].name}) + "\n").encode()
+                   for u, c in _COMBINACIONES),
+    "texto": tuple(f"{MENSAJES_RONDA[u][c]}\n".encode() for u, c in _COMBINACIONES),
+}
+
+# Cabecera de cada formato de salida
+CABECERAS_SALIDA = {
+    "csv": b"usuario,computadora,resultado\n",
+    "jsonl": b"",
+    "texto": b"",
+    "binario": MAGIA_BITACORA,
+}
+
+FORMATOS_SALIDA = tuple(CABECERAS_SALIDA)
+
+
+def crear_estrategia(nombre, semilla=None):
+    """
+    Crea la IA indicada por su nombre de estrategia o de versión.
+
+    Args:
+        nombre (str): Clave de ESTRATEGIAS o de ESTRATEGIAS_VERSIONES
+        semilla (int | None): Semilla del generador aleatorio de la IA
+
+    Returns:
+        Estrategia: La IA lista para jugar
+
+    Raises:
+        ValueError: Si el nombre no corresponde a ninguna estrategia ni versión
+    """
+    nombre = ESTRATEGIAS_VERSIONES.get(nombre, nombre)
+    if nombre not in ESTRATEGIAS:
+        raise ValueError(f"Estrategia desconocida: {nombre}")
+    return ESTRATEGIAS[nombre](semilla)
+
+
+def leer_jugadas_texto(archivo, tamano_fragmento=TAMANO_FRAGMENTO):
+    """
+    Lee jugadas en texto, separadas por saltos de línea o espacios.
+
+    Args:
+        archivo (BinaryIO): Flujo binario de entrada
+        tamano_fragmento (int): Bytes leídos de cada vez
+
+    Yields:
+        tuple: (acciones del fragmento en bytes, número de jugadas inválidas descartadas)
+    """
+    obtener = JUGADAS_TEXTO.__getitem__
+    resto = b""
+    while datos := archivo.read(tamano_fragmento):
+        datos = resto + datos
+        # La última palabra puede estar partida: se completa con el siguiente fragmento
+        corte = max(datos.rfind(b"\n"), datos.rfind(b" "))
+        if corte < 0:
+            resto = datos
+            continue
+        resto = datos[corte + 1:]
+        yield _convertir_palabras(datos[:corte].lower().split(), obtener)
+    if resto.strip():
+        yield _convertir_palabras(resto.lower().split(), obtener)
+
+
+def _convertir_palabras(palabras, obtener):
+    """Convierte las palabras de un fragmento en acciones, descartando las inválidas."""
+    try:
+        return bytes(map(obtener, palabras)), 0
+    except KeyError:
+        # Camino lento solo para los fragmentos con alguna jugada inválida
+        acciones = bytes(JUGADAS_TEXTO[palabra] for palabra in palabras if palabra in JUGADAS_TEXTO)
+        return acciones, len(palabras) - len(acciones)
+
+
+def leer_jugadas_binario(archivo, tamano_fragmento=TAMANO_FRAGMENTO):
+    """
+    Lee jugadas empaquetadas, un byte por jugada con el valor de AccionJuego.
+
+    Args:
+        archivo (BinaryIO): Flujo binario de entrada
+        tamano_fragmento (int): Bytes leídos de cada vez
+
+    Yields:
+        tuple: (acciones del fragmento en bytes, número de jugadas inválidas descartadas)
+    """
+    invalidas = bytes(range(_NUM_ACCIONES, 256))
+    while datos := archivo.read(tamano_fragmento):
+        acciones = datos.translate(None, invalidas)
+        yield acciones, len(datos) - len(acciones)
+
+
+def jugar_fragmento(estrategia, acciones_usuario):
+    """
+    Juega una secuencia de rondas contra una estrategia.
+
+    Args:
+        estrategia (Estrategia): La IA rival (conserva su estado entre fragmentos)
+        acciones_usuario (bytes): Acciones del usuario
+
+    Returns:
+        bytes: Código de cada ronda (accion_usuario * N + accion_computadora)
+    """
+    siguiente_accion = estrategia.siguiente_accion
+    observar = estrategia.observar
+    resultados = TABLA_RESULTADOS
+    acciones = tuple(AccionJuego)
+    codigos = bytearray(len(acciones_usuario))
+    for ronda, accion_usuario in enumerate(acciones_usuario):
+        accion_computadora = siguiente_accion()
+        observar(acciones[accion_usuario], accion_computadora, resultados[accion_usuario][accion_computadora])
+        codigos[ronda] = accion_usuario * _NUM_ACCIONES + accion_computadora
+    return bytes(codigos)
+
+
+def formatear(codigos, formato, id_sesion=0, primera_ronda=0):
+    """
+    Convierte los códigos de un fragmento de rondas en la salida del formato indicado.
+
+    Args:
+        codigos (bytes): Códigos devueltos por jugar_fragmento()
+        formato (str): "csv", "jsonl", "texto" o "binario"
+        id_sesion (int): Sesión de los registros binarios
+        primera_ronda (int): Número de la primera ronda del fragmento en los registros binarios
+
+    Returns:
+        bytes: La salida del fragmento
+    """
+    if formato == "binario":
+        return b"".join(map(FORMATO_REGISTRO.pack, repeat(id_sesion, len(codigos)),
+                            range(primera_ronda, primera_ronda + len(codigos)),
+                            codigos.translate(_COLUMNA_USUARIO),
+                            codigos.translate(_COLUMNA_COMPUTADORA),
+                            codigos.translate(_COLUMNA_RESULTADO)))
+    return b"".join(map(LINEAS_SALIDA[formato].__getitem__, codigos))
+
+
+def jugar_lotes(entrada, salida, estrategia, formato_entrada="texto", formato_salida="csv",
+                id_sesion=0, tamano_fragmento=TAMANO_FRAGMENTO):
+    """
+    Juega todas las jugadas de un flujo y escribe los resultados fragmento a fragmento.
+
+    Args:
+        entrada (BinaryIO): Flujo binario con las jugadas
+        salida (BinaryIO): Flujo binario donde escribir los resultados
+        estrategia (Estrategia): La IA rival
+        formato_entrada (str): "texto" o "binario"
+        formato_salida (str): "csv", "jsonl", "texto" o "binario"
+        id_sesion (int): Sesión de los registros binarios
+        tamano_fragmento (int): Bytes de entrada leídos de cada vez
+
+    Returns:
+        dict: Rondas jugadas, jugadas inválidas y número de rondas por cada ResultadoJuego
+    """
+    leer = leer_jugadas_binario if formato_entrada == "binario" else leer_jugadas_texto
+    conteos = [0] * len(ResultadoJuego)
+    rondas = 0
+    invalidas = 0
+
+    salida.write(CABECERAS_SALIDA[formato_salida])
+    for acciones, descartadas in leer(entrada, tamano_fragmento):
+        codigos = jugar_fragmento(estrategia, acciones)
+        salida.write(formatear(codigos, formato_salida, id_sesion, rondas))
+        columna_resultados = codigos.translate(_COLUMNA_RESULTADO)
+        for resultado in ResultadoJuego:
+            conteos[resultado] += columna_resultados.count(resultado)
+        rondas += len(codigos)
+        invalidas += descartadas
+
+    return {
+        "rondas": rondas,
+        "invalidas": invalidas,
+        **{resultado.name: conteos[resultado] for resultado in ResultadoJuego},
+    }
+
+
+def main():
+    """Función principal que juega una secuencia de jugadas desde la línea de comandos."""
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Juega por lotes contra una IA de Piedra, Papel y Tijeras")
+    parser.add_argument("entrada", nargs="?", default="-",
+                        help="Archivo de jugadas (por defecto, '-' = entrada estándar)")
+    parser.add_argument("--estrategia", default="frecuencias",
+                        choices=[*ESTRATEGIAS, *ESTRATEGIAS_VERSIONES], help="IA rival, por estrategia o versión")
+    parser.add_argument("--semilla", type=int, help="Semilla de la IA, para repetir la partida")
+    parser.add_argument("--formato-entrada", choices=["texto", "binario"], default="texto",
+                        help="Una jugada por línea o un byte por jugada")
+    parser.add_argument("--formato", choices=FORMATOS_SALIDA, default="csv", help="Formato de salida")
+    parser.add_argument("--salida", help="Archivo de salida (por defecto, la salida estándar)")
+    parser.add_argument("--id-sesion", type=int, default=0, help="Sesión de los registros de la salida binaria")
+    argumentos = parser.parse_args()
+
+    estrategia = crear_estrategia(argumentos.estrategia, argumentos.semilla)
+    entrada = sys.stdin.buffer if argumentos.entrada == "-" else open(argumentos.entrada, "rb")
+    salida = open(argumentos.salida, "wb") if argumentos.salida else sys.stdout.buffer
+    try:
+        resumen = jugar_lotes(entrada, salida, estrategia, argumentos.formato_entrada,
+                              argumentos.formato, argumentos.id_sesion)
+    finally:
+        if entrada is not sys.stdin.buffer:
+            entrada.close()
+        if salida is not sys.stdout.buffer:
+            salida.close()
+
+    # Resumen en la salida de error para no mezclarlo con los resultados
+    print(json.dumps(resumen, ensure_ascii=False), file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
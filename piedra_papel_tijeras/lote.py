@@ -0,0 +1,77 @@
+"""
+Piedra, Papel y Tijeras - Evaluación por lotes
+==============================================
+Evaluación vectorizada de muchas rondas a la vez mediante NumPy.
+
+Características:
+- Evalúa arrays completos de acciones en un único paso vectorizado
+- Usa la misma tabla de resultados que la evaluación de una sola ronda
+- Admite cualquier juego de N acciones (ReglasJuego) con la misma consulta a la tabla
+- Sin bucles de Python ni mensajes por ronda
+- Recuento de resultados para análisis de partidas registradas
+"""
+
+import numpy as np
+
+from .nucleo import TABLA_RESULTADOS, ResultadoJuego
+
+# Versión NumPy de la tabla de resultados: _TABLA_RESULTADOS[usuario, computadora]
+_TABLA_RESULTADOS = np.array(TABLA_RESULTADOS, dtype=np.uint8)
+_TABLA_RESULTADOS_PLANA = _TABLA_RESULTADOS.ravel()
+_TIPO_INDICE = np.min_scalar_type(_TABLA_RESULTADOS.size)
+
+
+def evaluar_lote(acciones_usuario, acciones_computadora, reglas=None):
+    """
+    Determina el resultado de muchas rondas en un único paso vectorizado.
+
+    Args:
+        acciones_usuario (array-like): Valores de AccionJuego elegidos por el usuario
+        acciones_computadora (array-like): Valores de AccionJuego elegidos por la computadora
+        reglas (ReglasJuego | None): Reglas de un juego de N acciones (por defecto, el clásico)
+
+    Returns:
+        numpy.ndarray: Valores de ResultadoJuego (uint8) desde la perspectiva del usuario
+
+    Raises:
+        ValueError: Si los arrays no tienen la misma forma o contienen acciones fuera de rango
+    """
+    usuario = np.asarray(acciones_usuario)
+    computadora = np.asarray(acciones_computadora)
+
+    if usuario.shape != computadora.shape:
+        raise ValueError(f"Formas distintas: {usuario.shape} y {computadora.shape}")
+
+    if reglas is None:
+        tabla_plana, tipo_indice = _TABLA_RESULTADOS_PLANA, _TIPO_INDICE
+    else:
+        # Vista sin copia sobre la tabla plana de las reglas
+        tabla_plana = np.frombuffer(reglas.tabla_plana, dtype=np.uint8)
+        tipo_indice = np.min_scalar_type(tabla_plana.size)
+
+    # Los índices negativos no lanzan IndexError en NumPy, así que se validan aparte
+    num_acciones = _TABLA_RESULTADOS.shape[0] if reglas is None else reglas.num_acciones
+    if usuario.size and (min(usuario.min(), computadora.min()) < 0
+                         or max(usuario.max(), computadora.max()) >= num_acciones):
+        raise ValueError(f"Las acciones deben estar dentro del rango [0, {num_acciones - 1}]")
+
+    # Índice plano usuario * N + computadora con el tipo entero más pequeño posible
+    indices = usuario.astype(tipo_indice)
+    indices *= num_acciones
+    np.add(indices, computadora, out=indices, casting="unsafe")
+
+    return tabla_plana.take(indices)
+
+
+def contar_resultados(resultados):
+    """
+    Cuenta cuántas victorias, derrotas y empates hay en un array de resultados.
+
+    Args:
+        resultados (array-like): Valores de ResultadoJuego
+
+    Returns:
+        dict: Número de rondas por cada ResultadoJuego
+    """
+    conteos = np.bincount(np.asarray(resultados).ravel(), minlength=len(ResultadoJuego))
+    return {resultado: int(conteos[resultado]) for resultado in ResultadoJuego}
@@ -0,0 +1,216 @@
+"""
+Piedra, Papel y Tijeras - Estrategia de Markov de orden k
+=========================================================
+IA que predice la siguiente acción del usuario a partir de sus últimas k
+acciones (y opcionalmente de los últimos k resultados), usando una tabla de
+transiciones que se actualiza ronda a ronda.
+
+Características:
+- Misma firma que obtener_accion_computadora() de la versión 5
+- También cumple el protocolo Estrategia (observar / siguiente_accion) de estrategias.py
+- Tabla de transiciones plana (array) indexada por el contexto codificado
+- El contexto se mantiene como un número en base 3 (o 9 con resultados)
+  que se desplaza en cada ronda, sin recorrer el historial
+- Coste por ronda constante para cualquier orden k razonable (hasta ~6)
+- Juegos de N acciones (ReglasJuego): si la tabla densa sería demasiado
+  grande (N = 101, por ejemplo) se usa una tabla dispersa con los mismos conteos
+
+Estrategia HONESTA: solo se analizan rondas ya terminadas. La acción actual
+del usuario nunca forma parte del historial que recibe la estrategia.
+"""
+
+import random
+from array import array
+from collections import Counter, defaultdict
+
+from .azar import exportar_generador, importar_generador
+from .nucleo import ResultadoJuego
+from .reglas import REGLAS_CLASICAS
+
+# Orden por defecto: número de acciones previas que forman el contexto
+ORDEN_MARKOV = 3
+
+# Entradas máximas de la tabla densa de transiciones; por encima se usa una tabla dispersa
+MAX_ENTRADAS_DENSAS = 1 << 22
+
+
+class EstrategiaMarkov:
+    """IA de Markov de orden k con tabla de transiciones incremental."""
+
+    __slots__ = ("orden", "usar_resultados", "rng", "reglas", "_num_acciones", "_base", "_num_contextos",
+                 "_transiciones", "_contexto", "_rondas_contexto", "_rondas_vistas")
+
+    def __init__(self, orden=ORDEN_MARKOV, usar_resultados=False, rng=random, reglas=REGLAS_CLASICAS):
+        """
+        Args:
+            orden (int): Número de rondas previas que forman el contexto
+            usar_resultados (bool): Si el contexto incluye también el resultado de cada ronda
+            rng (random.Random): Generador aleatorio de siguiente_accion() (por defecto, el módulo random)
+            reglas (ReglasJuego): Reglas del juego (por defecto, el clásico de 3 acciones)
+
+        Raises:
+            ValueError: Si el orden no es positivo
+        """
+        if orden <= 0:
+            raise ValueError("El orden de la estrategia de Markov debe ser mayor que cero")
+        self.orden = orden
+        self.usar_resultados = usar_resultados
+        self.rng = rng
+        self.reglas = reglas
+        self._num_acciones = reglas.num_acciones
+        # Cada ronda del contexto es una acción (N símbolos) o una acción y un resultado (3N)
+        self._base = self._num_acciones * (len(ResultadoJuego) if usar_resultados else 1)
+        self._num_contextos = self._base ** orden
+        # Densa: _transiciones[contexto * N + accion] = veces que el usuario eligió accion tras contexto
+        # Dispersa: _transiciones[contexto][accion], solo con los contextos y acciones vistos
+        self._transiciones = self._tabla_vacia()
+        self._contexto = 0
+        # Rondas que forman el contexto actual (como máximo, el orden)
+        self._rondas_contexto = 0
+        # Posición del historial hasta la que ya se ha leído
+        self._rondas_vistas = 0
+
+    def __call__(self, historial_usuario, historial_juego, rng=random):
+        """
+        Obtiene la acción de la computadora a partir de la predicción de Markov.
+
+        Args:
+            historial_usuario (list | VistaHistorial): Acciones PREVIAS del usuario
+            historial_juego (list | VistaHistorial): Resultados de esas rondas (perspectiva del usuario)
+            rng (random.Random): Generador aleatorio a utilizar (por defecto, el módulo random)
+
+        Returns:
+            AccionJuego: La acción elegida por la computadora
+        """
+        self.observar_historial(historial_usuario, historial_juego)
+        return self._accion_para(self.predecir(), rng)
+
+    def _tabla_vacia(self):
+        """Tabla de transiciones a cero: densa (array) o dispersa (dict de Counter) según su tamaño."""
+        entradas = self._num_contextos * self._num_acciones
+        if entradas > MAX_ENTRADAS_DENSAS:
+            return defaultdict(Counter)
+        return array("I", bytes(4 * entradas))
+
+    def observar_historial(self, historial_usuario, historial_juego):
+        """
+        Incorpora a la tabla las rondas del historial que aún no se han visto.
+
+        El historial solo crece por el final, así que en cada ronda basta con
+        leer las últimas posiciones mediante índices.
+
+        Args:
+            historial_usuario (list | VistaHistorial): Acciones previas del usuario
+            historial_juego (list | VistaHistorial): Resultados de esas rondas
+        """
+        for ronda in range(self._rondas_vistas, len(historial_usuario)):
+            self._incorporar(historial_usuario[ronda], historial_juego[ronda])
+
+        self._rondas_vistas = max(self._rondas_vistas, len(historial_usuario))
+
+    def observar(self, accion_usuario, accion_computadora, resultado):
+        """
+        Incorpora una ronda terminada (protocolo Estrategia).
+
+        Args:
+            accion_usuario (AccionJuego): La acción del usuario
+            accion_computadora (AccionJuego): La acción de la computadora
+            resultado (ResultadoJuego): El resultado desde la perspectiva del usuario
+        """
+        self._incorporar(accion_usuario, resultado)
+        self._rondas_vistas += 1
+
+    def siguiente_accion(self):
+        """
+        Elige la acción de la próxima ronda (protocolo Estrategia).
+
+        Returns:
+            AccionJuego: La acción que vence a la predicha, o una aleatoria si no hay predicción
+        """
+        return self._accion_para(self.predecir(), self.rng)
+
+    def _incorporar(self, accion, resultado):
+        """Cuenta la acción del usuario tras el contexto actual y desplaza el contexto."""
+        if self._rondas_contexto < self.orden:
+            self._rondas_contexto += 1
+        elif isinstance(self._transiciones, dict):
+            self._transiciones[self._contexto][accion] += 1
+        else:
+            self._transiciones[self._contexto * self._num_acciones + accion] += 1
+
+        simbolo = accion * len(ResultadoJuego) + resultado if self.usar_resultados else accion
+        self._contexto = (self._contexto * self._base + simbolo) % self._num_contextos
+
+    def _accion_para(self, accion_predicha, rng):
+        """Vence a la acción predicha; sin predicción, elige al azar."""
+        # Sin contexto completo o sin datos para este contexto => elección aleatoria
+        if accion_predicha is None:
+            return self.reglas.acciones(rng.randrange(self._num_acciones))
+        return self.reglas.obtener_accion_ganadora(accion_predicha)
+
+    def predecir(self):
+        """
+        Predice la siguiente acción del usuario según el contexto actual.
+
+        Returns:
+            IntEnum | None: La acción más probable, o None si aún no hay datos
+        """
+        if self._rondas_contexto < self.orden:
+            return None
+
+        if isinstance(self._transiciones, dict):
+            # Solo se recorren las acciones vistas tras el contexto; a igualdad, la de menor valor
+            conteos = self._transiciones.get(self._contexto)
+            if not conteos:
+                return None
+            maximo = max(conteos.values())
+            return self.reglas.acciones(min(accion for accion, conteo in conteos.items() if conteo == maximo))
+
+        inicio = self._contexto * self._num_acciones
+        conteos = self._transiciones[inicio:inicio + self._num_acciones]
+        maximo = max(conteos)
+        if not maximo:
+            return None
+        return self.reglas.acciones(conteos.index(maximo))
+
+    def exportar_estado(self):
+        """
+        Obtiene el estado mínimo necesario para continuar la predicción más adelante.
+
+        Returns:
+            tuple: (contexto, rondas del contexto, tabla de transiciones en bytes o,
+                si es dispersa, dict {contexto: {acción: conteo}}, posición del generador
+                aleatorio o None si no es un GeneradorReanudable)
+        """
+        if isinstance(self._transiciones, dict):
+            transiciones = {contexto: dict(conteos) for contexto, conteos in self._transiciones.items()}
+        else:
+            transiciones = self._transiciones.tobytes()
+        return self._contexto, self._rondas_contexto, transiciones, exportar_generador(self.rng)
+
+    def importar_estado(self, estado, rondas_vistas=0):
+        """
+        Restaura un estado obtenido con exportar_estado().
+
+        Args:
+            estado (tuple): Estado devuelto por exportar_estado()
+            rondas_vistas (int): Longitud del historial que se considera ya leída
+
+        Raises:
+            ValueError: Si la tabla no corresponde al orden de esta estrategia
+        """
+        contexto, rondas_contexto, transiciones, posicion_rng = estado
+        if isinstance(self._transiciones, dict):
+            if not isinstance(transiciones, dict):
+                raise ValueError("El estado no corresponde a esta estrategia de Markov")
+            transiciones = defaultdict(Counter, {contexto: Counter(conteos)
+                                                 for contexto, conteos in transiciones.items()})
+        elif len(transiciones) != len(self._transiciones) * self._transiciones.itemsize:
+            raise ValueError("El estado no corresponde a esta estrategia de Markov")
+        else:
+            transiciones = array("I", transiciones)
+        self._contexto = contexto
+        self._rondas_contexto = rondas_contexto
+        self._transiciones = transiciones
+        self._rondas_vistas = rondas_vistas
+        importar_generador(self.rng, posicion_rng)
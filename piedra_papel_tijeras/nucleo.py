@@ -0,0 +1,113 @@
+"""
+Piedra, Papel y Tijeras - Núcleo del juego
+==========================================
+Definiciones compartidas por las distintas versiones del juego.
+
+Características:
+- Enums para acciones y resultados del juego
+- Tabla de resultados 3x3 precalculada (perspectiva del usuario)
+- Tabla de la acción que vence a cada acción
+- Evaluación de una ronda mediante una simple consulta a la tabla
+- Mensajes descriptivos de las 9 rondas posibles, precalculados al importar
+"""
+
+from enum import IntEnum
+
+
+class AccionJuego(IntEnum):
+    """Enum que representa las acciones posibles en el juego."""
+    Piedra = 0
+    Papel = 1
+    Tijeras = 2
+
+
+class ResultadoJuego(IntEnum):
+    """Enum que representa los posibles resultados del juego."""
+    Victoria = 0
+    Derrota = 1
+    Empate = 2
+
+
+# Resultado para el usuario según (accion_usuario - accion_computadora) % 3:
+# 0 => misma acción, 1 => la acción del usuario vence, 2 => la acción del usuario pierde
+RESULTADOS_POR_DIFERENCIA = (ResultadoJuego.Empate, ResultadoJuego.Victoria, ResultadoJuego.Derrota)
+
+# Tabla de resultados precalculada: TABLA_RESULTADOS[accion_usuario][accion_computadora]
+TABLA_RESULTADOS = tuple(
+    tuple(RESULTADOS_POR_DIFERENCIA[(accion_usuario - accion_computadora) % len(AccionJuego)]
+          for accion_computadora in AccionJuego)
+    for accion_usuario in AccionJuego
+)
+
+# Diccionario que define qué acción vence a otra
+Victorias = {
+    AccionJuego.Piedra: AccionJuego.Papel,    # Papel vence a Piedra
+    AccionJuego.Papel: AccionJuego.Tijeras,   # Tijeras vence a Papel
+    AccionJuego.Tijeras: AccionJuego.Piedra   # Piedra vence a Tijeras
+}
+
+# Frase que describe cómo vence cada acción, indexada por la acción ganadora
+FRASES_VICTORIA = {
+    AccionJuego.Piedra: "La piedra rompe las tijeras",
+    AccionJuego.Papel: "El papel envuelve la piedra",
+    AccionJuego.Tijeras: "Las tijeras cortan el papel",
+}
+
+
+def evaluar_ronda(eleccion_usuario, eleccion_computadora):
+    """
+    Determina el resultado de una ronda sin mostrar ningún mensaje.
+
+    Args:
+        eleccion_usuario (AccionJuego): La acción elegida por el usuario
+        eleccion_computadora (AccionJuego): La acción elegida por la computadora
+
+    Returns:
+        ResultadoJuego: El resultado del juego para el usuario (Victoria/Derrota/Empate)
+    """
+    return TABLA_RESULTADOS[eleccion_usuario][eleccion_computadora]
+
+
+def _formatear_ronda(eleccion_usuario, eleccion_computadora):
+    """Construye el mensaje de una ronda (solo se usa para precalcular MENSAJES_RONDA)."""
+    resultado_juego = evaluar_ronda(eleccion_usuario, eleccion_computadora)
+
+    if resultado_juego == ResultadoJuego.Empate:
+        return f"El usuario y la computadora eligieron {AccionJuego(eleccion_usuario).name}. ¡Empate!"
+    if resultado_juego == ResultadoJuego.Victoria:
+        return f"{FRASES_VICTORIA[eleccion_usuario]}. ¡Ganaste!"
+    return f"{FRASES_VICTORIA[eleccion_computadora]}. ¡Perdiste!"
+
+
+# Mensaje de cada ronda posible: MENSAJES_RONDA[accion_usuario][accion_computadora]
+MENSAJES_RONDA = tuple(
+    tuple(_formatear_ronda(accion_usuario, accion_computadora) for accion_computadora in AccionJuego)
+    for accion_usuario in AccionJuego
+)
+
+
+def describir_ronda(eleccion_usuario, eleccion_computadora):
+    """
+    Obtiene el mensaje que describe el resultado de una ronda.
+
+    Args:
+        eleccion_usuario (AccionJuego): La acción elegida por el usuario
+        eleccion_computadora (AccionJuego): La acción elegida por la computadora
+
+    Returns:
+        str: El mensaje del resultado desde la perspectiva del usuario
+    """
+    return MENSAJES_RONDA[eleccion_usuario][eleccion_computadora]
+
+
+def obtener_accion_ganadora(accion_juego):
+    """
+    Obtiene la acción que vence a la acción dada.
+
+    Args:
+        accion_juego (AccionJuego): La acción contra la que queremos ganar
+
+    Returns:
+        AccionJuego: La acción ganadora
+    """
+    return Victorias[accion_juego]
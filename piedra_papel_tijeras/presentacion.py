@@ -0,0 +1,31 @@
+"""
+Piedra, Papel y Tijeras - Presentación de mensajes
+==================================================
+Textos del juego precalculados al importar, para no formatear cadenas en
+cada ronda.
+
+Características:
+- Mensajes de las 9 rondas posibles, de la elección de la computadora y de
+  las preguntas al usuario, calculados una sola vez
+- Respuestas del protocolo del servidor precalculadas para cada jugada
+"""
+
+from .nucleo import AccionJuego, ResultadoJuego
+
+# Opciones tal como se muestran al usuario: "Piedra[0], Papel[1], Tijeras[2]"
+OPCIONES_JUEGO_STR = ", ".join(f"{accion_juego.name}[{accion_juego.value}]" for accion_juego in AccionJuego)
+
+# Preguntas y avisos al usuario
+MENSAJE_ELECCION_USUARIO = f"\nElige una opción ({OPCIONES_JUEGO_STR}): "
+MENSAJE_OTRA_RONDA = "\n¿Otra ronda? (s/n): "
+MENSAJE_SELECCION_INVALIDA = f"Selección inválida. ¡Elige una opción dentro del rango [0, {len(AccionJuego) - 1}]!"
+MENSAJE_DESPEDIDA = "\n¡Gracias por jugar! Hasta luego."
+
+# Anuncio de la acción de la computadora, indexado por la acción
+MENSAJES_ELECCION_COMPUTADORA = tuple(f"La computadora eligió {accion.name}." for accion in AccionJuego)
+
+# Respuesta del servidor a una jugada: RESPUESTAS_JUGADA[accion_computadora][resultado]
+RESPUESTAS_JUGADA = tuple(
+    tuple(f"{accion.value} {resultado.value}" for resultado in ResultadoJuego)
+    for accion in AccionJuego
+)
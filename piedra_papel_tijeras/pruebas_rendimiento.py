@@ -0,0 +1,472 @@
+"""
+Piedra, Papel y Tijeras - Pruebas de rendimiento
+================================================
+Mide el coste de las operaciones principales del juego y guarda los
+resultados en JSON para poder comparar ejecuciones y detectar regresiones.
+
+Características:
+- evaluar_juego() de cada versión numerada (con la salida descartada)
+- obtener_accion_computadora() de cada versión y cada jugador registrado,
+  con historiales de 10, 1.000 y 100.000 rondas
+- obtener_accion_ganadora() de la versión 5 y del núcleo compartido
+- Sesiones completas de principio a fin (SesionJuego) y simulación sin E/S
+- Juegos de N acciones (ReglasJuego con N = 3, 5, 7 y 101): evaluación,
+  mejor respuesta y decisión de cada estrategia registrada
+- Tiempo de arranque: coste de importar el núcleo, las herramientas y las
+  versiones numeradas medido con python -X importtime en un proceso nuevo,
+  con presupuestos absolutos que también se señalan como regresión
+- Comparación con una ejecución anterior: marca los casos que empeoran más
+  de una tolerancia y termina con código de error
+
+Cada caso se mide con timeit: se ajusta el número de llamadas para que cada
+repetición dure al menos TIEMPO_MINIMO y se informa la mediana por llamada.
+"""
+
+import argparse
+import contextlib
+import json
+import os
+import platform
+import random
+import statistics
+import subprocess
+import sys
+import timeit
+from datetime import datetime, timezone
+
+from .estrategias import ESTRATEGIAS
+from .historial import HistorialPartida
+from .nucleo import AccionJuego, evaluar_ronda, obtener_accion_ganadora
+from .reglas import ReglasJuego
+from .sesiones import SesionJuego
+from .simulacion import JUGADORES, JugadorAleatorio, simular
+from .ventana import VentanaFrecuencias
+from .versiones import VERSION_IA_BASICA, VERSION_MAS_IA, cargar_version
+
+# Longitudes de historial con las que se mide cada estrategia
+LONGITUDES_HISTORIAL = (10, 1_000, 100_000)
+
+# Rondas de cada sesión completa
+RONDAS_SESION = 1_000
+
+# Número de acciones de los juegos cíclicos que se miden
+NUMEROS_ACCIONES = (3, 5, 7, 101)
+
+# Repeticiones de cada medida (se informa la mediana) y duración mínima de cada una
+REPETICIONES = 5
+TIEMPO_MINIMO = 0.05
+
+# Empeoramiento relativo a partir del cual un caso se considera una regresión
+TOLERANCIA_REGRESION = 0.25
+
+# Versiones cuya función evaluar_juego() se mide y tipo de acciones que reciben
+VERSIONES_EVALUAR_JUEGO = {
+    "1_Basico": "texto",
+    "2_Control_Errores": "texto",
+    "3_Codigo_Limpio": "enum",
+    VERSION_IA_BASICA: "enum",
+    VERSION_MAS_IA: "enum",
+}
+
+# Módulos del paquete cuyo tiempo de importación se mide
+MODULOS_ARRANQUE = (
+    "piedra_papel_tijeras.nucleo",
+    "piedra_papel_tijeras.presentacion",
+    "piedra_papel_tijeras.estrategias",
+    "piedra_papel_tijeras.simulacion",
+    "piedra_papel_tijeras.torneo",
+    "piedra_papel_tijeras.servidor",
+)
+
+# Versiones numeradas cuyo tiempo de carga se mide
+VERSIONES_ARRANQUE = ("3_Codigo_Limpio", VERSION_IA_BASICA, VERSION_MAS_IA)
+
+# Tiempo máximo de importación en microsegundos: superarlo cuenta como regresión
+PRESUPUESTOS_ARRANQUE = {
+    "arranque[piedra_papel_tijeras.nucleo]": 5_000,
+    "arranque[3_Codigo_Limpio]": 10_000,
+    f"arranque[{VERSION_IA_BASICA}]": 10_000,
+    f"arranque[{VERSION_MAS_IA}]": 10_000,
+}
+
+
+def medir(funcion, repeticiones=REPETICIONES, tiempo_minimo=TIEMPO_MINIMO):
+    """
+    Mide el tiempo por llamada de una función sin argumentos.
+
+    Args:
+        funcion (callable): Función a medir
+        repeticiones (int): Número de repeticiones de la medida
+        tiempo_minimo (float): Duración mínima de cada repetición en segundos
+
+    Returns:
+        dict: Mediana y mínimo en nanosegundos por llamada, y llamadas por repetición
+    """
+    temporizador = timeit.Timer(funcion)
+    llamadas = 1
+    while True:
+        if temporizador.timeit(llamadas) >= tiempo_minimo:
+            break
+        llamadas *= 10 if llamadas < 1000 else 2
+    tiempos = [tiempo / llamadas * 1e9 for tiempo in temporizador.repeat(repeticiones, llamadas)]
+    return {
+        "ns_por_llamada": statistics.median(tiempos),
+        "ns_minimo": min(tiempos),
+        "llamadas": llamadas,
+    }
+
+
+def tiempo_importacion(codigo, ya_importados=frozenset()):
+    """
+    Ejecuta código en un intérprete nuevo y mide lo que tarda en importar.
+
+    Se suma el tiempo acumulado de cada importación de primer nivel que
+    informa python -X importtime, sin contar las del propio arranque del
+    intérprete (ya_importados).
+
+    Args:
+        codigo (str): Código a ejecutar con python -c
+        ya_importados (frozenset): Módulos que el intérprete importa antes de ejecutar el código
+
+    Returns:
+        int: Microsegundos dedicados a las importaciones del código
+
+    Raises:
+        subprocess.CalledProcessError: Si el código termina con error
+    """
+    proceso = subprocess.run([sys.executable, "-X", "importtime", "-c", codigo],
+                             capture_output=True, text=True, check=True)
+    total = 0
+    for linea in proceso.stderr.splitlines():
+        if not linea.startswith("import time:"):
+            continue
+        _, acumulado, modulo = linea.split("|")
+        # Solo las importaciones de primer nivel: las anidadas ya están en su acumulado
+        if not modulo.startswith("  ") and modulo.strip() not in ya_importados:
+            acumulado = acumulado.strip()
+            if acumulado.isdigit():
+                total += int(acumulado)
+    return total
+
+
+def modulos_de_arranque():
+    """
+    Returns:
+        frozenset: Módulos que importa un intérprete vacío al arrancar
+    """
+    proceso = subprocess.run([sys.executable, "-X", "importtime", "-c", "pass"],
+                             capture_output=True, text=True, check=True)
+    return frozenset(linea.split("|")[-1].strip() for linea in proceso.stderr.splitlines()
+                     if linea.startswith("import time:"))
+
+
+def medir_arranque(funcion, repeticiones=REPETICIONES, tiempo_minimo=TIEMPO_MINIMO):
+    """
+    Repite una medida de importación (cada una en un proceso nuevo).
+
+    Args:
+        funcion (callable): Función que devuelve los microsegundos de importación
+        repeticiones (int): Número de procesos lanzados
+        tiempo_minimo (float): No se usa; cada proceso ya es una medida completa
+
+    Returns:
+        dict: Mediana y mínimo en nanosegundos, con el mismo formato que medir()
+    """
+    tiempos = [funcion() * 1000 for _ in range(repeticiones)]
+    return {
+        "ns_por_llamada": statistics.median(tiempos),
+        "ns_minimo": min(tiempos),
+        "llamadas": 1,
+    }
+
+
+def historial_aleatorio(num_rondas, semilla=0):
+    """
+    Construye un historial de rondas con acciones aleatorias de ambos jugadores.
+
+    Args:
+        num_rondas (int): Número de rondas del historial
+        semilla (int): Semilla de las acciones
+
+    Returns:
+        HistorialPartida: El historial generado
+    """
+    rng = random.Random(semilla)
+    historial = HistorialPartida()
+    for _ in range(num_rondas):
+        accion_usuario = AccionJuego(rng.randrange(len(AccionJuego)))
+        accion_computadora = AccionJuego(rng.randrange(len(AccionJuego)))
+        historial.append(accion_usuario, accion_computadora, evaluar_ronda(accion_usuario, accion_computadora))
+    return historial
+
+
+def casos_evaluar_juego():
+    """Genera los casos de evaluar_juego() de cada versión y de evaluar_ronda() del núcleo."""
+    for nombre_version, tipo in VERSIONES_EVALUAR_JUEGO.items():
+        version = cargar_version(nombre_version)
+        if tipo == "texto":
+            acciones = [(u, c) for u in (version.PIEDRA, version.PAPEL, version.TIJERAS)
+                        for c in (version.PIEDRA, version.PAPEL, version.TIJERAS)]
+        else:
+            acciones = [(u, c) for u in version.AccionJuego for c in version.AccionJuego]
+
+        def evaluar_todas(evaluar=version.evaluar_juego, acciones=acciones):
+            for accion_usuario, accion_computadora in acciones:
+                evaluar(accion_usuario, accion_computadora)
+
+        # Se mide el recorrido de las 9 combinaciones: el tiempo por ronda es 1/9
+        yield f"evaluar_juego[{nombre_version}]", {"combinaciones": len(acciones)}, evaluar_todas
+
+    acciones = [(u, c) for u in AccionJuego for c in AccionJuego]
+
+    def evaluar_ronda_todas():
+        for accion_usuario, accion_computadora in acciones:
+            evaluar_ronda(accion_usuario, accion_computadora)
+
+    yield "evaluar_ronda[nucleo]", {"combinaciones": len(acciones)}, evaluar_ronda_todas
+
+
+def casos_accion_ganadora():
+    """Genera los casos de obtener_accion_ganadora() de la versión 5 y del núcleo."""
+    version = cargar_version(VERSION_MAS_IA)
+    for origen, funcion in ((VERSION_MAS_IA, version.obtener_accion_ganadora), ("nucleo", obtener_accion_ganadora)):
+        acciones = list(AccionJuego)
+
+        def ganadoras(funcion=funcion, acciones=acciones):
+            for accion in acciones:
+                funcion(accion)
+
+        yield f"obtener_accion_ganadora[{origen}]", {"acciones": len(acciones)}, ganadoras
+
+
+def casos_estrategias(longitudes=LONGITUDES_HISTORIAL):
+    """
+    Genera los casos de decisión de la computadora con historiales de distinta longitud.
+
+    Las funciones de las versiones 4 y 5 reciben lo mismo que en su main().
+    Los jugadores registrados se preparan primero con todo el historial y
+    después se mide la decisión de la ronda siguiente (su coste en régimen).
+    """
+    yield "obtener_accion_computadora[3_Codigo_Limpio]", {"historial": 0}, \
+        cargar_version("3_Codigo_Limpio").obtener_accion_computadora
+
+    ia_basica = cargar_version(VERSION_IA_BASICA)
+    mas_ia = cargar_version(VERSION_MAS_IA)
+    for longitud in longitudes:
+        historial = historial_aleatorio(longitud)
+        parametros = {"historial": longitud}
+
+        yield f"obtener_accion_computadora[{VERSION_IA_BASICA}]", parametros, \
+            lambda historial=historial: ia_basica.obtener_accion_computadora(
+                historial.resultados, historial.acciones_computadora)
+
+        ventana = VentanaFrecuencias.desde_bytes(mas_ia.NUMERO_ACCIONES_RECIENTES,
+                                                 bytes(historial.acciones_usuario))
+        yield f"obtener_accion_computadora[{VERSION_MAS_IA}]", parametros, \
+            lambda historial=historial, ventana=ventana: mas_ia.obtener_accion_computadora(
+                ventana, historial.resultados)
+
+        for nombre, crear_jugador in JUGADORES.items():
+            jugador = crear_jugador(0)
+            argumentos = (historial.acciones_computadora, historial.acciones_usuario, historial.resultados)
+            jugador(*argumentos)
+            yield f"jugador[{nombre}]", parametros, lambda jugador=jugador, argumentos=argumentos: jugador(*argumentos)
+
+
+def casos_sesiones(num_rondas=RONDAS_SESION):
+    """Genera los casos de partidas completas: sesiones del servidor y simulación sin E/S."""
+    rng = random.Random(0)
+    acciones = [AccionJuego(rng.randrange(len(AccionJuego))) for _ in range(num_rondas)]
+    parametros = {"rondas": num_rondas}
+
+    for nombre in JUGADORES:
+        def jugar_sesion(nombre=nombre):
+            sesion = SesionJuego(1, nombre, semilla=0)
+            for accion in acciones:
+                sesion.jugar(accion)
+
+        yield f"sesion[{nombre}]", parametros, jugar_sesion
+
+    yield "simular[aleatorio-mas_ia]", parametros, \
+        lambda: simular(JugadorAleatorio(0), JUGADORES["mas_ia"](1), num_rondas)
+
+
+def casos_reglas(numeros_acciones=NUMEROS_ACCIONES, num_rondas=RONDAS_SESION):
+    """
+    Genera los casos de juegos de N acciones: deberían costar lo mismo para cualquier N.
+
+    Las estrategias se preparan con num_rondas rondas aleatorias y después se
+    mide su decisión de la ronda siguiente.
+    """
+    for num_acciones in numeros_acciones:
+        reglas = ReglasJuego.ciclico(num_acciones)
+        parametros = {"acciones": num_acciones}
+        rng = random.Random(0)
+        rondas = [(rng.randrange(num_acciones), rng.randrange(num_acciones)) for _ in range(num_rondas)]
+
+        yield "reglas.evaluar", parametros, \
+            lambda reglas=reglas, ronda=rondas[0]: reglas.evaluar(*ronda)
+        yield "reglas.obtener_accion_ganadora", parametros, \
+            lambda reglas=reglas, accion=rondas[0][0]: reglas.obtener_accion_ganadora(accion)
+
+        for nombre, crear_estrategia in ESTRATEGIAS.items():
+            estrategia = crear_estrategia(0, reglas=reglas)
+            for accion_usuario, accion_computadora in rondas:
+                estrategia.observar(reglas.acciones(accion_usuario), reglas.acciones(accion_computadora),
+                                    reglas.evaluar(accion_usuario, accion_computadora))
+            yield f"estrategia[{nombre}]", parametros, estrategia.siguiente_accion
+
+
+def casos_arranque():
+    """Genera los casos de importación de los módulos del paquete y de carga de las versiones numeradas."""
+    ya_importados = modulos_de_arranque()
+    directorio = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    prefijo = f"import sys; sys.path.insert(0, {directorio!r}); "
+
+    for modulo in MODULOS_ARRANQUE:
+        codigo = f"{prefijo}import {modulo}"
+        yield f"arranque[{modulo}]", {}, lambda codigo=codigo: tiempo_importacion(codigo, ya_importados)
+
+    for nombre_version in VERSIONES_ARRANQUE:
+        codigo = f"{prefijo}from piedra_papel_tijeras.versiones import cargar_version; cargar_version({nombre_version!r})"
+        yield f"arranque[{nombre_version}]", {}, lambda codigo=codigo: tiempo_importacion(codigo, ya_importados)
+
+
+# Grupos de casos por nombre, en el orden en que se ejecutan
+GRUPOS = {
+    "evaluar_juego": casos_evaluar_juego,
+    "accion_ganadora": casos_accion_ganadora,
+    "estrategias": casos_estrategias,
+    "sesiones": casos_sesiones,
+    "reglas": casos_reglas,
+    "arranque": casos_arranque,
+}
+
+# Grupos que no se miden con timeit: sus casos devuelven ya la medida
+MEDIDAS_GRUPO = {
+    "arranque": medir_arranque,
+}
+
+
+def ejecutar(grupos=tuple(GRUPOS), filtro=None, repeticiones=REPETICIONES, tiempo_minimo=TIEMPO_MINIMO,
+             progreso=None):
+    """
+    Ejecuta los casos de los grupos indicados.
+
+    La salida por pantalla de las funciones medidas (mensajes de evaluar_juego)
+    se descarta para medir solo la lógica y la escritura en sí.
+
+    Args:
+        grupos (Iterable[str]): Nombres de GRUPOS a ejecutar
+        filtro (str | None): Solo se ejecutan los casos cuyo nombre lo contiene
+        repeticiones (int): Repeticiones de cada medida
+        tiempo_minimo (float): Duración mínima de cada repetición en segundos
+        progreso (TextIO | None): Flujo donde mostrar cada resultado según se obtiene
+
+    Returns:
+        dict: Entorno de ejecución y lista de resultados
+    """
+    resultados = []
+    with open(os.devnull, "w") as nulo:
+        for grupo in grupos:
+            for nombre, parametros, funcion in GRUPOS[grupo]():
+                if filtro and filtro not in nombre:
+                    continue
+                with contextlib.redirect_stdout(nulo):
+                    medida = MEDIDAS_GRUPO.get(grupo, medir)(funcion, repeticiones, tiempo_minimo)
+                resultado = {"grupo": grupo, "nombre": nombre, "parametros": parametros, **medida}
+                resultados.append(resultado)
+                if progreso is not None:
+                    print(f"{_clave(resultado):<60} {medida['ns_por_llamada']:>14,.0f} ns", file=progreso)
+
+    return {
+        "fecha": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "implementacion": platform.python_implementation(),
+        "plataforma": platform.platform(),
+        "resultados": resultados,
+    }
+
+
+def _clave(resultado):
+    """Identifica un caso por su nombre y sus parámetros."""
+    parametros = ",".join(f"{clave}={valor}" for clave, valor in sorted(resultado["parametros"].items()))
+    return f"{resultado['nombre']}({parametros})"
+
+
+def comparar(actual, referencia, tolerancia=TOLERANCIA_REGRESION):
+    """
+    Compara dos ejecuciones y obtiene los casos que han empeorado.
+
+    Args:
+        actual (dict): Resultado de ejecutar()
+        referencia (dict): Resultado de una ejecución anterior
+        tolerancia (float): Empeoramiento relativo permitido (0.25 = 25 % más lento)
+
+    Returns:
+        list: Tuplas (caso, ns de referencia, ns actuales) de los casos más lentos que lo permitido
+    """
+    anteriores = {_clave(resultado): resultado["ns_por_llamada"] for resultado in referencia["resultados"]}
+    regresiones = []
+    for resultado in actual["resultados"]:
+        clave = _clave(resultado)
+        if clave in anteriores and resultado["ns_por_llamada"] > anteriores[clave] * (1 + tolerancia):
+            regresiones.append((clave, anteriores[clave], resultado["ns_por_llamada"]))
+    return regresiones
+
+
+def exceder_presupuestos(actual, presupuestos=PRESUPUESTOS_ARRANQUE):
+    """
+    Obtiene los casos que superan su presupuesto absoluto.
+
+    Args:
+        actual (dict): Resultado de ejecutar()
+        presupuestos (dict): Nombre del caso => máximo en microsegundos
+
+    Returns:
+        list: Tuplas (caso, presupuesto en ns, ns actuales) de los casos que lo superan
+    """
+    excedidos = []
+    for resultado in actual["resultados"]:
+        presupuesto = presupuestos.get(resultado["nombre"])
+        if presupuesto is not None and resultado["ns_por_llamada"] > presupuesto * 1000:
+            excedidos.append((_clave(resultado), presupuesto * 1000, resultado["ns_por_llamada"]))
+    return excedidos
+
+
+def main():
+    """Función principal que ejecuta las pruebas de rendimiento desde la línea de comandos."""
+    parser = argparse.ArgumentParser(description="Pruebas de rendimiento de Piedra, Papel y Tijeras")
+    parser.add_argument("--grupos", nargs="+", choices=list(GRUPOS), default=list(GRUPOS),
+                        help="Grupos de casos a ejecutar")
+    parser.add_argument("--filtro", help="Ejecutar solo los casos cuyo nombre contiene este texto")
+    parser.add_argument("--repeticiones", type=int, default=REPETICIONES, help="Repeticiones de cada medida")
+    parser.add_argument("--tiempo-minimo", type=float, default=TIEMPO_MINIMO,
+                        help="Duración mínima de cada repetición en segundos")
+    parser.add_argument("--salida", help="Archivo JSON donde guardar los resultados (por defecto, la salida estándar)")
+    parser.add_argument("--comparar", help="Archivo JSON de una ejecución anterior con la que comparar")
+    parser.add_argument("--tolerancia", type=float, default=TOLERANCIA_REGRESION,
+                        help="Empeoramiento relativo permitido antes de considerar una regresión")
+    argumentos = parser.parse_args()
+
+    informe = ejecutar(argumentos.grupos, argumentos.filtro, argumentos.repeticiones,
+                       argumentos.tiempo_minimo, progreso=sys.stderr)
+
+    if argumentos.salida:
+        with open(argumentos.salida, "w", encoding="utf-8") as archivo:
+            json.dump(informe, archivo, ensure_ascii=False, indent=2)
+    else:
+        print(json.dumps(informe, ensure_ascii=False, indent=2))
+
+    regresiones = exceder_presupuestos(informe)
+    if argumentos.comparar:
+        with open(argumentos.comparar, encoding="utf-8") as archivo:
+            regresiones += comparar(informe, json.load(archivo), argumentos.tolerancia)
+    for clave, anterior, actual in regresiones:
+        print(f"REGRESIÓN {clave}: {anterior:,.0f} ns -> {actual:,.0f} ns", file=sys.stderr)
+    if regresiones:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
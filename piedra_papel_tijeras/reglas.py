@@ -0,0 +1,158 @@
+"""
+Piedra, Papel y Tijeras - Motor de reglas de N acciones
+=======================================================
+Generaliza las reglas del juego a cualquier número de acciones: juegos
+cíclicos con un número impar de acciones (Piedra, Papel, Tijeras, Lagarto,
+Spock y variantes mayores) o una matriz de dominancia arbitraria.
+
+Características:
+- Tabla de resultados NxN precalculada: evaluar una ronda es una consulta O(1)
+- Tabla de la mejor acción contra cada acción, también O(1)
+- Tabla plana en bytes que la evaluación por lotes usa sin convertirla
+- Enum de acciones propio para cada juego, con los nombres indicados
+- Validación de la matriz: ninguna acción se vence a sí misma ni hay dos
+  acciones que se venzan mutuamente
+
+En un juego cíclico de N acciones (N impar), la acción a vence a la b si
+(a - b) % N está entre 1 y (N - 1) / 2: cada acción vence a la mitad de las
+demás y pierde contra la otra mitad. Con N = 3 es el juego clásico.
+"""
+
+from enum import IntEnum
+
+from .nucleo import AccionJuego, ResultadoJuego
+
+
+def crear_acciones(nombres, nombre_enum="Accion"):
+    """
+    Crea un enum de acciones con valores consecutivos desde 0.
+
+    Args:
+        nombres (Iterable[str]): Nombre de cada acción, en orden
+        nombre_enum (str): Nombre de la clase del enum
+
+    Returns:
+        type[IntEnum]: El enum de acciones
+    """
+    return IntEnum(nombre_enum, [(nombre, valor) for valor, nombre in enumerate(nombres)])
+
+
+class ReglasJuego:
+    """Reglas de un juego de N acciones con sus tablas precalculadas."""
+
+    __slots__ = ("acciones", "num_acciones", "tabla_resultados", "tabla_plana",
+                 "acciones_ganadoras", "tabla_ganadoras")
+
+    def __init__(self, acciones, vence):
+        """
+        Args:
+            acciones (type[IntEnum]): Enum con las acciones del juego (valores 0..N-1)
+            vence (Sequence[Sequence[bool]]): Matriz NxN; vence[a][b] es True si a vence a b
+
+        Raises:
+            ValueError: Si la matriz no es NxN, alguna acción se vence a sí misma o
+                dos acciones se vencen mutuamente
+        """
+        num_acciones = len(acciones)
+        if len(vence) != num_acciones or any(len(fila) != num_acciones for fila in vence):
+            raise ValueError(f"La matriz de dominancia debe ser de {num_acciones}x{num_acciones}")
+        for a in range(num_acciones):
+            if vence[a][a]:
+                raise ValueError(f"La acción {acciones(a).name} no puede vencerse a sí misma")
+            for b in range(a + 1, num_acciones):
+                if vence[a][b] and vence[b][a]:
+                    raise ValueError(f"Las acciones {acciones(a).name} y {acciones(b).name} se vencen mutuamente")
+
+        self.acciones = acciones
+        self.num_acciones = num_acciones
+
+        # Resultado para el usuario: tabla_resultados[accion_usuario][accion_computadora]
+        self.tabla_resultados = tuple(
+            tuple(ResultadoJuego.Victoria if vence[u][c] else
+                  ResultadoJuego.Derrota if vence[c][u] else ResultadoJuego.Empate
+                  for c in range(num_acciones))
+            for u in range(num_acciones)
+        )
+        # La misma tabla aplanada (usuario * N + computadora), para la evaluación por lotes
+        self.tabla_plana = bytes(resultado for fila in self.tabla_resultados for resultado in fila)
+
+        # Todas las acciones que vencen a cada acción
+        self.acciones_ganadoras = tuple(
+            tuple(acciones(g) for g in range(num_acciones) if vence[g][a])
+            for a in range(num_acciones)
+        )
+        # Mejor respuesta a cada acción: de las que la vencen, la que más acciones vence en total;
+        # a igualdad, la siguiente en orden cíclico. Si ninguna la vence, empatar con ella.
+        victorias_totales = [sum(map(bool, fila)) for fila in vence]
+        self.tabla_ganadoras = tuple(
+            min(ganadoras, key=lambda g, a=a: (-victorias_totales[g], (g - a) % num_acciones))
+            if ganadoras else acciones(a)
+            for a, ganadoras in enumerate(self.acciones_ganadoras)
+        )
+
+    @classmethod
+    def ciclico(cls, acciones):
+        """
+        Crea las reglas de un juego cíclico.
+
+        Args:
+            acciones (int | Sequence[str] | type[IntEnum]): Número de acciones, sus nombres o su enum
+
+        Returns:
+            ReglasJuego: Las reglas del juego
+
+        Raises:
+            ValueError: Si el número de acciones no es impar o es menor que 3
+        """
+        if isinstance(acciones, int):
+            acciones = crear_acciones(f"Accion{valor}" for valor in range(acciones))
+        elif not (isinstance(acciones, type) and issubclass(acciones, IntEnum)):
+            acciones = crear_acciones(acciones)
+
+        num_acciones = len(acciones)
+        if num_acciones < 3 or num_acciones % 2 == 0:
+            raise ValueError("Un juego cíclico necesita un número impar de acciones, como mínimo 3")
+
+        mitad = num_acciones // 2
+        vence = [[1 <= (a - b) % num_acciones <= mitad for b in range(num_acciones)]
+                 for a in range(num_acciones)]
+        return cls(acciones, vence)
+
+    def evaluar(self, accion_usuario, accion_computadora):
+        """
+        Determina el resultado de una ronda.
+
+        Args:
+            accion_usuario (int): La acción del usuario
+            accion_computadora (int): La acción de la computadora
+
+        Returns:
+            ResultadoJuego: El resultado desde la perspectiva del usuario
+        """
+        return self.tabla_resultados[accion_usuario][accion_computadora]
+
+    def obtener_accion_ganadora(self, accion):
+        """
+        Obtiene la mejor acción contra la acción dada.
+
+        Args:
+            accion (int): La acción contra la que queremos ganar
+
+        Returns:
+            IntEnum: La acción ganadora
+        """
+        return self.tabla_ganadoras[accion]
+
+    def __len__(self):
+        return self.num_acciones
+
+    def __repr__(self):
+        return f"ReglasJuego({', '.join(accion.name for accion in self.acciones)})"
+
+
+# Juego clásico: mismas tablas que nucleo (TABLA_RESULTADOS y Victorias)
+REGLAS_CLASICAS = ReglasJuego.ciclico(AccionJuego)
+
+# Piedra, Papel, Tijeras, Lagarto, Spock, ordenadas para que la regla cíclica
+# reproduzca las del juego original (el papel refuta a Spock, el lagarto envenena a Spock...)
+REGLAS_LAGARTO_SPOCK = ReglasJuego.ciclico(("Piedra", "Spock", "Papel", "Lagarto", "Tijeras"))
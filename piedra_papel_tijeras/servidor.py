@@ -0,0 +1,438 @@
+"""
+Piedra, Papel y Tijeras - Servidor de red asíncrono
+===================================================
+Servidor TCP basado en asyncio (solo librería estándar) que atiende muchas
+partidas simultáneas en un único bucle de eventos.
+
+Características:
+- Una sesión por conexión, con su propio historial y su propia IA
+- Las sesiones sobreviven a la desconexión y se pueden retomar con RETOMAR
+- Memoria acotada: las sesiones inactivas se compactan y se restauran al reconectar
+- Instantánea opcional (--instantanea): las sesiones se guardan periódicamente
+  y al detener el servidor, y se cargan al arrancar (ver instantaneas.py)
+- Bitácora binaria opcional con todas las rondas jugadas (ver bitacora.py); al
+  reabrirla, las sesiones nuevas siguen al mayor identificador ya registrado
+- Instrumentación opcional: latencia de cada jugada, rondas y entradas inválidas
+  (ver instrumentacion.py), consultable con METRICAS o en un archivo Prometheus
+- Estadísticas globales opcionales (ver estadisticas.py): tasa de victorias de
+  cada IA, clasificación de los jugadores y rondas totales, consultables con
+  ESTADISTICAS sin frenar las jugadas
+- IA a elegir entre los jugadores registrados (ia_basica, mas_ia, markov, dirichlet...),
+  con el factor de olvido de la IA dirichlet configurable por despliegue
+- Libro de aperturas opcional (--libro), cargado al arrancar, para que las
+  sesiones nuevas no empiecen jugando al azar
+- Protocolo de texto por líneas, utilizable incluso desde telnet/netcat
+- Ninguna operación bloqueante: la IA decide en microsegundos y la E/S es asíncrona
+
+Protocolo (una orden por línea):
+    HOLA <estrategia>  -> OK <id_sesion> <estrategia>
+    RETOMAR <id>       -> OK <id_sesion> <estrategia>   (continúa una sesión anterior)
+    <accion>           -> <accion_computadora> <resultado>   (valores de AccionJuego / ResultadoJuego)
+    METRICAS           -> <métricas en JSON, en una sola línea>   (solo con instrumentación)
+    ESTADISTICAS       -> <estadísticas globales en JSON, en una sola línea>   (solo con --estadisticas)
+    SALIR              -> ADIOS y cierre de la conexión
+    Cualquier error    -> ERROR <mensaje>
+
+La IA elige su acción antes de mirar la acción recibida del usuario, por lo
+que sigue siendo HONESTA aunque el servidor conozca la acción actual.
+"""
+
+import asyncio
+import os
+import sys
+import threading
+import time
+
+from .apertura import cargar_libro
+from .bitacora import EscritorBitacora
+from .dirichlet import configurar_decaimiento
+from .estadisticas import AgregadorEstadisticas
+from .instantaneas import guardar_sesiones
+from .instrumentacion import Instrumentacion
+from .nucleo import AccionJuego
+from .presentacion import MENSAJE_SELECCION_INVALIDA, RESPUESTAS_JUGADA
+from .sesiones import ESTRATEGIA_POR_DEFECTO, GestorSesiones
+from .simulacion import JUGADORES
+
+# Dirección de escucha por defecto
+HOST_POR_DEFECTO = "127.0.0.1"
+PUERTO_POR_DEFECTO = 8765
+
+# Conexiones pendientes de aceptar; debe ser alto para soportar miles de jugadores
+BACKLOG_SERVIDOR = 4096
+
+# Segundos entre dos pasadas de expulsión de sesiones inactivas
+INTERVALO_MANTENIMIENTO = 10.0
+
+# Segundos mínimos entre dos instantáneas periódicas de las sesiones
+INTERVALO_INSTANTANEA = 300.0
+
+# Máximo de archivos abiertos que se pide al sistema (cada conexión usa un descriptor)
+LIMITE_DESCRIPTORES = 65536
+
+# Respuesta a una línea que no es una orden ni una acción válida
+RESPUESTA_ACCION_INVALIDA = f"ERROR {MENSAJE_SELECCION_INVALIDA}"
+
+
+def informar_error(tarea, error):
+    """
+    Informa en la salida de error de un fallo que no detiene el servidor.
+
+    Args:
+        tarea (str): Descripción de la tarea que ha fallado
+        error (Exception): El error producido
+    """
+    print(f"=== Error en {tarea}: {error} ===", file=sys.stderr)
+
+
+def ampliar_limite_descriptores(limite=LIMITE_DESCRIPTORES):
+    """
+    Sube el límite de archivos abiertos hasta el máximo permitido (solo en sistemas POSIX).
+
+    Si el sistema no deja subirlo, el servidor sigue con el límite actual.
+
+    Args:
+        limite (int): Límite máximo a pedir cuando el sistema no impone ninguno o lo tiene más alto
+    """
+    try:
+        import resource
+    except ImportError:
+        return
+    limite_actual, limite_maximo = resource.getrlimit(resource.RLIMIT_NOFILE)
+    if limite_maximo != resource.RLIM_INFINITY:
+        limite = min(limite, limite_maximo)
+    if limite_actual == resource.RLIM_INFINITY or limite_actual >= limite:
+        return
+    try:
+        resource.setrlimit(resource.RLIMIT_NOFILE, (limite, limite_maximo))
+    except (ValueError, OSError) as error:
+        informar_error("la ampliación del límite de descriptores", error)
+
+
+class ServidorJuego:
+    """Servidor que asocia una SesionJuego a cada conexión activa."""
+
+    def __init__(self, estrategia_por_defecto=ESTRATEGIA_POR_DEFECTO, gestor=None, bitacora=None,
+                 instrumentacion=None, ruta_metricas=None, estadisticas=None, ruta_instantanea=None):
+        """
+        Args:
+            estrategia_por_defecto (str): IA de las sesiones que no envían HOLA
+            gestor (GestorSesiones | None): Gestor de sesiones (por defecto, uno con los límites por defecto)
+            bitacora (EscritorBitacora | None): Bitácora donde registrar cada ronda (None = sin registro)
+            instrumentacion (Instrumentacion | None): Destino de las métricas (None = sin medidas)
+            ruta_metricas (str | None): Archivo Prometheus que se reescribe en cada mantenimiento
+            estadisticas (AgregadorEstadisticas | None): Agregador de las estadísticas globales
+                (None = sin estadísticas)
+            ruta_instantanea (str | None): Archivo donde se guardan las sesiones periódicamente
+                (None = sin instantáneas)
+        """
+        self.estrategia_por_defecto = estrategia_por_defecto
+        self.gestor = gestor or GestorSesiones()
+        self.bitacora = bitacora
+        self.instrumentacion = instrumentacion
+        self.ruta_metricas = ruta_metricas
+        self.estadisticas = estadisticas
+        self.ruta_instantanea = ruta_instantanea
+        self._ultima_instantanea = time.monotonic()
+        # Una instantánea en segundo plano y la final al detenerse no escriben a la vez el mismo archivo
+        self._cerrojo_instantanea = threading.Lock()
+        # Todas las conexiones se atienden en el mismo bucle de eventos: un solo fragmento
+        self._fragmento_estadisticas = estadisticas.nuevo_fragmento() if estadisticas is not None else None
+        if instrumentacion is not None:
+            # Tiempo total de cada orden, incluida la interpretación de la línea
+            self.procesar_linea = instrumentacion.medir_fase("procesado", self.procesar_linea)
+
+    def crear_sesion(self, nombre_estrategia=None):
+        """
+        Crea y registra una sesión nueva.
+
+        Args:
+            nombre_estrategia (str | None): IA de la sesión (por defecto, la del servidor)
+
+        Returns:
+            SesionJuego: La sesión creada
+
+        Raises:
+            ValueError: Si la estrategia no está registrada
+        """
+        return self.gestor.crear(nombre_estrategia or self.estrategia_por_defecto)
+
+    def cerrar_sesion(self, sesion):
+        """
+        Desvincula una sesión de su conexión; queda en el gestor hasta que se expulse.
+
+        Args:
+            sesion (SesionJuego): La sesión a cerrar
+        """
+        self.gestor.liberar(sesion)
+
+    def procesar_linea(self, sesion, linea):
+        """
+        Procesa una orden del protocolo y genera la respuesta.
+
+        Args:
+            sesion (SesionJuego | None): Sesión actual (None si aún no se ha creado)
+            linea (str): Orden recibida, sin el salto de línea
+
+        Returns:
+            tuple: (sesion, respuesta); respuesta es None si hay que cerrar la conexión
+        """
+        orden, _, argumento = linea.strip().partition(" ")
+
+        if orden.upper() == "SALIR":
+            return sesion, None
+
+        if orden.upper() == "HOLA":
+            if sesion is not None:
+                return sesion, "ERROR La sesión ya está iniciada"
+            try:
+                sesion = self.crear_sesion(argumento.strip() or None)
+            except ValueError as error:
+                return sesion, f"ERROR {error}"
+            return sesion, f"OK {sesion.id_sesion} {sesion.nombre_estrategia}"
+
+        if orden.upper() == "RETOMAR":
+            if sesion is not None:
+                return sesion, "ERROR La sesión ya está iniciada"
+            try:
+                sesion = self.gestor.retomar(int(argumento))
+            except (ValueError, KeyError):
+                return sesion, f"ERROR Sesión desconocida: {argumento.strip()}"
+            except RuntimeError as error:
+                return sesion, f"ERROR {error}"
+            return sesion, f"OK {sesion.id_sesion} {sesion.nombre_estrategia}"
+
+        instrumentacion = self.instrumentacion
+        if orden.upper() == "METRICAS":
+            if instrumentacion is None:
+                return sesion, "ERROR La instrumentación está desactivada"
+            return sesion, instrumentacion.como_json()
+
+        if orden.upper() == "ESTADISTICAS":
+            if self.estadisticas is None:
+                return sesion, "ERROR Las estadísticas están desactivadas"
+            return sesion, self.estadisticas.instantanea.como_json()
+
+        try:
+            accion_usuario = AccionJuego(int(orden))
+        except ValueError:
+            if instrumentacion is not None:
+                instrumentacion.contar("entradas_invalidas")
+            return sesion, RESPUESTA_ACCION_INVALIDA
+
+        if sesion is None:
+            sesion = self.crear_sesion()
+        if instrumentacion is None:
+            accion_computadora, resultado = sesion.jugar(accion_usuario)
+        else:
+            # Decisión de la IA y evaluación de la ronda
+            inicio = instrumentacion.reloj()
+            accion_computadora, resultado = sesion.jugar(accion_usuario)
+            instrumentacion.registrar("jugada", instrumentacion.reloj() - inicio)
+            instrumentacion.contar("rondas")
+        self.gestor.registrar_actividad(sesion)
+        if self._fragmento_estadisticas is not None:
+            self._fragmento_estadisticas.registrar(sesion.id_sesion, sesion.nombre_estrategia, resultado)
+        if self.bitacora is not None:
+            self.bitacora.registrar(sesion.id_sesion, sesion.rondas_jugadas - 1,
+                                    accion_usuario, accion_computadora, resultado)
+        return sesion, RESPUESTAS_JUGADA[accion_computadora][resultado]
+
+    async def atender(self, lector, escritor):
+        """
+        Atiende una conexión hasta que el cliente envía SALIR o se desconecta.
+
+        Args:
+            lector (asyncio.StreamReader): Flujo de entrada de la conexión
+            escritor (asyncio.StreamWriter): Flujo de salida de la conexión
+        """
+        sesion = None
+        try:
+            while linea := await lector.readline():
+                sesion, respuesta = self.procesar_linea(sesion, linea.decode("utf-8", "replace"))
+                if respuesta is None:
+                    escritor.write(b"ADIOS\n")
+                    break
+                escritor.write(f"{respuesta}\n".encode())
+                await escritor.drain()
+        except ConnectionError:
+            pass
+        except ValueError:
+            # Línea más larga que el límite del lector: la conexión se cierra sin más
+            if self.instrumentacion is not None:
+                self.instrumentacion.contar("entradas_invalidas")
+        finally:
+            if sesion is not None:
+                self.cerrar_sesion(sesion)
+            escritor.close()
+
+    async def iniciar(self, host=HOST_POR_DEFECTO, puerto=PUERTO_POR_DEFECTO):
+        """
+        Empieza a aceptar conexiones.
+
+        Args:
+            host (str): Dirección de escucha
+            puerto (int): Puerto de escucha (0 = puerto libre elegido por el sistema)
+
+        Returns:
+            asyncio.Server: El servidor en marcha
+        """
+        return await asyncio.start_server(self.atender, host, puerto, backlog=BACKLOG_SERVIDOR)
+
+    async def mantener(self, intervalo=INTERVALO_MANTENIMIENTO, intervalo_instantanea=INTERVALO_INSTANTANEA):
+        """
+        Expulsa periódicamente las sesiones inactivas (y actualiza el archivo de
+        métricas y la instantánea de las sesiones, si los hay) hasta que se cancele la tarea.
+
+        Args:
+            intervalo (float): Segundos entre dos pasadas
+            intervalo_instantanea (float): Segundos mínimos entre dos instantáneas
+        """
+        while True:
+            await asyncio.sleep(intervalo)
+            # Un fallo en una tarea (disco lleno, permisos...) se informa sin detener las demás
+            # ni las pasadas siguientes
+            try:
+                self.gestor.mantenimiento()
+            except Exception as error:
+                informar_error("la expulsión de sesiones", error)
+            if self.instrumentacion is not None and self.ruta_metricas:
+                try:
+                    self.escribir_metricas()
+                except Exception as error:
+                    informar_error("la escritura de métricas", error)
+            if self.ruta_instantanea and time.monotonic() - self._ultima_instantanea >= intervalo_instantanea:
+                self._ultima_instantanea = time.monotonic()
+                try:
+                    # Las sesiones se compactan en el bucle; la codificación y la escritura, en otro hilo
+                    await asyncio.to_thread(self._escribir_instantanea, *self.gestor.instantanea())
+                except Exception as error:
+                    informar_error("la instantánea de sesiones", error)
+
+    def guardar_instantanea(self):
+        """
+        Guarda todas las sesiones en el archivo de instantánea.
+
+        Returns:
+            tuple: (sesiones guardadas, sesiones activas omitidas porque su IA no permite guardarlas)
+        """
+        self._ultima_instantanea = time.monotonic()
+        return self._escribir_instantanea(*self.gestor.instantanea())
+
+    def _escribir_instantanea(self, compactas, omitidas):
+        """Escribe las sesiones ya compactadas (se puede llamar desde otro hilo)."""
+        with self._cerrojo_instantanea:
+            return guardar_sesiones(self.ruta_instantanea, compactas), omitidas
+
+    def escribir_metricas(self):
+        """Reescribe el archivo de métricas en formato Prometheus de forma atómica."""
+        temporal = f"{self.ruta_metricas}.tmp"
+        with open(temporal, "w", encoding="utf-8") as archivo:
+            self.instrumentacion.volcar("prometheus", archivo)
+        os.replace(temporal, self.ruta_metricas)
+
+
+async def servir(host=HOST_POR_DEFECTO, puerto=PUERTO_POR_DEFECTO,
+                 estrategia_por_defecto=ESTRATEGIA_POR_DEFECTO, ruta_bitacora=None,
+                 instrumentar=False, ruta_metricas=None, semilla=None, ruta_libro=None,
+                 estadisticas=False, ruta_instantanea=None):
+    """
+    Ejecuta el servidor hasta que se interrumpa.
+
+    Args:
+        host (str): Dirección de escucha
+        puerto (int): Puerto de escucha
+        estrategia_por_defecto (str): IA de las sesiones que no envían HOLA
+        ruta_bitacora (str | None): Archivo donde registrar las rondas (None = sin registro)
+        instrumentar (bool): Si se miden las jugadas (implícito si se indica ruta_metricas)
+        ruta_metricas (str | None): Archivo Prometheus que se actualiza periódicamente
+        semilla (int | None): Semilla base de las sesiones (None = una nueva, que se muestra al arrancar)
+        ruta_libro (str | None): Libro de aperturas para las primeras rondas de cada sesión (None = sin libro)
+        estadisticas (bool): Si se agregan las estadísticas globales (orden ESTADISTICAS)
+        ruta_instantanea (str | None): Archivo de sesiones que se carga al arrancar (si existe) y
+            se guarda periódicamente y al detener el servidor (None = sin instantáneas)
+    """
+    # El libro se carga una sola vez y lo comparten todas las sesiones
+    libro = cargar_libro(ruta_libro) if ruta_libro else None
+    bitacora = EscritorBitacora(ruta_bitacora) if ruta_bitacora else None
+    instrumentacion = Instrumentacion() if instrumentar or ruta_metricas else None
+    if instrumentacion is not None:
+        # kill -USR1 <pid> vuelca las métricas en la salida de error
+        instrumentacion.volcar_con_senal("prometheus")
+    agregador = AgregadorEstadisticas() if estadisticas else None
+    if agregador is not None:
+        # Las fusiones corren en su propio hilo, fuera del bucle de eventos
+        agregador.iniciar()
+    gestor = GestorSesiones(semilla=semilla, libro=libro)
+    if bitacora is not None:
+        # La bitácora se amplía entre arranques: las sesiones nuevas no reutilizan sus identificadores
+        gestor.avanzar_ids(bitacora.mayor_id_sesion)
+    if ruta_instantanea and os.path.exists(ruta_instantanea):
+        # Las sesiones se cargan compactadas: la IA de cada una se restaura al reconectar
+        print(f"=== {gestor.cargar(ruta_instantanea)} sesiones cargadas de {ruta_instantanea} ===")
+    juego = ServidorJuego(estrategia_por_defecto, gestor=gestor, bitacora=bitacora,
+                          instrumentacion=instrumentacion, ruta_metricas=ruta_metricas,
+                          estadisticas=agregador, ruta_instantanea=ruta_instantanea)
+    servidor = await juego.iniciar(host, puerto)
+    direcciones = ", ".join(str(socket.getsockname()) for socket in servidor.sockets)
+    # La semilla base permite repetir cualquier sesión junto con la bitácora
+    print(f"=== Servidor de Piedra, Papel y Tijeras escuchando en {direcciones} "
+          f"(semilla {juego.gestor.semilla}) ===")
+    mantenimiento = asyncio.create_task(juego.mantener())
+    try:
+        async with servidor:
+            await servidor.serve_forever()
+    finally:
+        mantenimiento.cancel()
+        if ruta_instantanea:
+            guardadas, omitidas = juego.guardar_instantanea()
+            print(f"=== {guardadas} sesiones guardadas en {ruta_instantanea} ===")
+            if omitidas:
+                print(f"=== {omitidas} sesiones omitidas: su IA no permite guardarlas ===")
+        if agregador is not None:
+            agregador.detener()
+        if bitacora is not None:
+            bitacora.cerrar()
+
+
+def main():
+    """Función principal que arranca el servidor desde la línea de comandos."""
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Servidor de red de Piedra, Papel y Tijeras")
+    parser.add_argument("--host", default=HOST_POR_DEFECTO, help="Dirección de escucha")
+    parser.add_argument("--puerto", type=int, default=PUERTO_POR_DEFECTO, help="Puerto de escucha")
+    parser.add_argument("--estrategia", default=ESTRATEGIA_POR_DEFECTO, choices=list(JUGADORES),
+                        help="IA por defecto de las sesiones")
+    parser.add_argument("--bitacora", help="Archivo binario donde registrar todas las rondas")
+    parser.add_argument("--instrumentar", action="store_true",
+                        help="Medir las jugadas (orden METRICAS y señal SIGUSR1)")
+    parser.add_argument("--metricas", help="Archivo de métricas Prometheus que se actualiza periódicamente")
+    parser.add_argument("--estadisticas", action="store_true",
+                        help="Agregar la tasa de victorias de cada IA y la clasificación (orden ESTADISTICAS)")
+    parser.add_argument("--instantanea",
+                        help="Archivo de sesiones que se carga al arrancar y se guarda periódicamente y al salir")
+    parser.add_argument("--semilla", type=int, help="Semilla base de las sesiones, para repetirlas")
+    parser.add_argument("--libro", help="Libro de aperturas (ver apertura.py) para las primeras rondas")
+    parser.add_argument("--decaimiento", type=float,
+                        help="Factor de olvido por ronda de la IA dirichlet, en (0, 1]")
+    argumentos = parser.parse_args()
+
+    if argumentos.decaimiento is not None:
+        try:
+            configurar_decaimiento(argumentos.decaimiento)
+        except ValueError as error:
+            parser.error(str(error))
+
+    ampliar_limite_descriptores()
+    try:
+        asyncio.run(servir(argumentos.host, argumentos.puerto, argumentos.estrategia,
+                          argumentos.bitacora, argumentos.instrumentar, argumentos.metricas,
+                          argumentos.semilla, argumentos.libro, argumentos.estadisticas,
+                          argumentos.instantanea))
+    except KeyboardInterrupt:
+        print("\n¡Servidor detenido! Hasta luego.")
+
+
+if __name__ == "__main__":
+    main()
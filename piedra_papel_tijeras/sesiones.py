@@ -0,0 +1,477 @@
+"""
+Piedra, Papel y Tijeras - Gestión de sesiones con memoria acotada
+=================================================================
+Sesiones de juego y gestor que limita la memoria usada cuando un mismo
+proceso aloja muchas partidas.
+
+Características:
+- Cada sesión tiene su propio historial y su propia IA
+- El historial de una sesión activa se recorta a las últimas rondas cuando crece demasiado
+- Expulsión de sesiones por inactividad y por antigüedad de uso (LRU)
+- Presupuesto configurable de memoria total y de número de sesiones activas
+- Las sesiones expulsadas se compactan a la estadística suficiente de su IA
+  (ventana de recuentos, última acción y resultado...) y se restauran al
+  reconectar sin repetir todo el historial
+- Cada sesión tiene su propia semilla, derivada de la semilla del gestor y de
+  su identificador: con la misma semilla base, una sesión se repite bit a bit
+- Libro de aperturas opcional, compartido por todas las sesiones: sus primeras
+  rondas se responden con la estadística de partidas anteriores
+- Instantáneas: todas las sesiones se guardan en un archivo binario (ver
+  instantaneas.py) y se cargan al reiniciar como sesiones compactadas, que se
+  restauran al reconectar en el punto exacto en que se guardaron
+"""
+
+import itertools
+import time
+from collections import OrderedDict
+
+from .apertura import JugadorConApertura
+from .azar import derivar_semilla, semilla_nueva
+from .historial import HistorialPartida
+from .instantaneas import guardar_sesiones, leer_sesiones
+from .nucleo import TABLA_RESULTADOS
+from .simulacion import JUGADORES
+
+# Estrategia usada cuando no se indica ninguna
+ESTRATEGIA_POR_DEFECTO = "mas_ia"
+
+# Rondas que se conservan del historial al compactar (la IA básica necesita la última)
+RONDAS_COLA_HISTORIAL = 1
+
+# Rondas a partir de las cuales se recorta el historial de una sesión activa
+MAX_RONDAS_HISTORIAL = 4096
+
+# Estimación del coste fijo en memoria de una sesión activa y de una compactada (bytes)
+MEMORIA_BASE_SESION = 2048
+MEMORIA_BASE_COMPACTA = 256
+
+# Límites por defecto del gestor
+MAX_SESIONES_ACTIVAS = 10_000
+TIEMPO_INACTIVIDAD = 300.0
+PRESUPUESTO_MEMORIA = 64 * 1024 * 1024
+
+
+def _tamano_estado(estado):
+    """Estima en bytes el tamaño del estado exportado por un jugador."""
+    if isinstance(estado, (bytes, bytearray)):
+        return len(estado)
+    if isinstance(estado, tuple):
+        return sum(_tamano_estado(parte) for parte in estado)
+    if isinstance(estado, dict):
+        # Tabla dispersa: una clave y un valor enteros por entrada
+        return 16 * len(estado)
+    return 8
+
+
+def _rondas_observadas(historial):
+    """
+    Rondas del historial que el jugador ya ha incorporado a su estado.
+
+    Los jugadores leen las rondas nuevas al decidir la siguiente, así que
+    entre dos jugadas la última ronda aún no forma parte de su estado.
+    """
+    return max(0, len(historial) - 1)
+
+
+class SesionCompacta:
+    """Sesión expulsada: solo lo necesario para restaurarla."""
+
+    __slots__ = ("id_sesion", "nombre_estrategia", "semilla", "rondas_jugadas", "cola_historial",
+                 "estado_jugador")
+
+    def __init__(self, id_sesion, nombre_estrategia, semilla, rondas_jugadas, cola_historial, estado_jugador):
+        """
+        Args:
+            id_sesion (int): Identificador de la sesión
+            nombre_estrategia (str): Nombre de la IA en el registro JUGADORES
+            semilla (int | None): Semilla del generador aleatorio de la IA
+            rondas_jugadas (int): Rondas jugadas en total por la sesión
+            cola_historial (bytes): Últimas rondas del historial, ya codificadas
+            estado_jugador: Estado devuelto por exportar_estado() del jugador
+        """
+        self.id_sesion = id_sesion
+        self.nombre_estrategia = nombre_estrategia
+        self.semilla = semilla
+        self.rondas_jugadas = rondas_jugadas
+        self.cola_historial = cola_historial
+        self.estado_jugador = estado_jugador
+
+    def memoria_estimada(self):
+        """
+        Returns:
+            int: Memoria aproximada ocupada por la sesión compactada, en bytes
+        """
+        return MEMORIA_BASE_COMPACTA + len(self.cola_historial) + _tamano_estado(self.estado_jugador)
+
+
+class SesionJuego:
+    """Partida de un jugador: su historial y su propia IA."""
+
+    __slots__ = ("id_sesion", "nombre_estrategia", "semilla", "historial", "rondas_jugadas",
+                 "ultima_actividad", "_jugador")
+
+    def __init__(self, id_sesion, nombre_estrategia=ESTRATEGIA_POR_DEFECTO, semilla=None, libro=None):
+        """
+        Args:
+            id_sesion (int): Identificador único de la sesión
+            nombre_estrategia (str): Nombre de la IA en el registro JUGADORES
+            semilla (int | None): Semilla del generador aleatorio de la IA
+            libro (LibroAperturas | None): Libro con el que se responden las primeras rondas
+
+        Raises:
+            ValueError: Si la estrategia no está registrada
+        """
+        if nombre_estrategia not in JUGADORES:
+            raise ValueError(f"Estrategia desconocida: {nombre_estrategia}")
+        self.id_sesion = id_sesion
+        self.nombre_estrategia = nombre_estrategia
+        self.semilla = semilla
+        self.historial = HistorialPartida()
+        self.rondas_jugadas = 0
+        self.ultima_actividad = 0.0
+        self._jugador = JUGADORES[nombre_estrategia](semilla)
+        if libro is not None:
+            self._jugador = JugadorConApertura(self._jugador, libro)
+
+    @property
+    def compactable(self):
+        """bool: Si la IA de la sesión puede exportar su estado (atributo compactable del jugador)."""
+        return getattr(self._jugador, "compactable", False)
+
+    def jugar(self, accion_usuario):
+        """
+        Juega una ronda: la IA decide con el historial previo y se evalúa el resultado.
+
+        Args:
+            accion_usuario (AccionJuego): La acción elegida por el usuario
+
+        Returns:
+            tuple: (accion_computadora, resultado) con el resultado desde la perspectiva del usuario
+        """
+        historial = self.historial
+        # La IA decide solo con rondas ya terminadas (la acción actual aún no está en el historial)
+        accion_computadora = self._jugador(historial.acciones_computadora,
+                                           historial.acciones_usuario, historial.resultados)
+        resultado = TABLA_RESULTADOS[accion_usuario][accion_computadora]
+        historial.append(accion_usuario, accion_computadora, resultado)
+        self.rondas_jugadas += 1
+
+        if len(historial) >= MAX_RONDAS_HISTORIAL and self.compactable:
+            self.recortar_historial()
+
+        return accion_computadora, resultado
+
+    def compactar(self):
+        """
+        Reduce la sesión a la estadística suficiente de su IA.
+
+        Returns:
+            SesionCompacta: La sesión compactada
+
+        Raises:
+            TypeError: Si la IA de la sesión no puede exportar su estado
+        """
+        if not self.compactable:
+            raise TypeError(f"La estrategia {self.nombre_estrategia} no permite compactar la sesión")
+        cola_historial = bytes(self.historial)[-RONDAS_COLA_HISTORIAL:]
+        return SesionCompacta(self.id_sesion, self.nombre_estrategia, self.semilla, self.rondas_jugadas,
+                              cola_historial, self._jugador.exportar_estado())
+
+    @classmethod
+    def restaurar(cls, compacta, libro=None):
+        """
+        Reconstruye una sesión a partir de su versión compactada.
+
+        Args:
+            compacta (SesionCompacta): La sesión compactada
+            libro (LibroAperturas | None): El mismo libro de aperturas con el que se creó la sesión
+
+        Returns:
+            SesionJuego: La sesión lista para seguir jugando
+        """
+        # El estado de la IA incluye la posición de su generador aleatorio: con la misma
+        # semilla, la IA sigue el mismo flujo aleatorio que antes de compactarse
+        sesion = cls(compacta.id_sesion, compacta.nombre_estrategia, compacta.semilla, libro)
+        sesion.historial = HistorialPartida(compacta.cola_historial)
+        sesion.rondas_jugadas = compacta.rondas_jugadas
+        sesion._jugador.importar_estado(compacta.estado_jugador, _rondas_observadas(sesion.historial))
+        return sesion
+
+    def recortar_historial(self):
+        """Conserva solo las últimas rondas del historial sin que la IA pierda lo aprendido."""
+        compacta = self.compactar()
+        self.historial = HistorialPartida(compacta.cola_historial)
+        self._jugador.importar_estado(compacta.estado_jugador, _rondas_observadas(self.historial))
+
+    def memoria_estimada(self):
+        """
+        Returns:
+            int: Memoria aproximada ocupada por la sesión, en bytes
+        """
+        return MEMORIA_BASE_SESION + len(self.historial)
+
+
+class GestorSesiones:
+    """Sesiones activas y compactadas con expulsión LRU, por inactividad y por memoria."""
+
+    def __init__(self, max_sesiones_activas=MAX_SESIONES_ACTIVAS, tiempo_inactividad=TIEMPO_INACTIVIDAD,
+                 presupuesto_memoria=PRESUPUESTO_MEMORIA, reloj=time.monotonic, semilla=None, libro=None):
+        """
+        Args:
+            max_sesiones_activas (int): Máximo de sesiones completas en memoria
+            tiempo_inactividad (float): Segundos sin jugar tras los que se compacta una sesión
+            presupuesto_memoria (int): Memoria total aproximada permitida, en bytes
+            reloj (callable): Función que devuelve el instante actual en segundos
+            semilla (int | None): Semilla base de las sesiones (None = una nueva, consultable en self.semilla)
+            libro (LibroAperturas | None): Libro de aperturas de las sesiones (cargado una sola vez)
+        """
+        self.semilla = semilla_nueva() if semilla is None else semilla
+        self.libro = libro
+        self.max_sesiones_activas = max_sesiones_activas
+        self.tiempo_inactividad = tiempo_inactividad
+        self.presupuesto_memoria = presupuesto_memoria
+        self._reloj = reloj
+        # Sesiones activas de la menos a la más recientemente usada
+        self.activas = OrderedDict()
+        # Sesiones compactadas de la más antigua a la más reciente
+        self.compactadas = OrderedDict()
+        self._en_uso = set()
+        self._ids_sesion = itertools.count(1)
+        # Memoria contabilizada de cada sesión activa y totales: los límites se comprueban sin recorrer sesiones
+        self._memoria_sesiones = {}
+        self._memoria_activas = 0
+        self._memoria_compactadas = 0
+
+    def crear(self, nombre_estrategia=ESTRATEGIA_POR_DEFECTO):
+        """
+        Crea una sesión nueva, la marca en uso y aplica los límites.
+
+        Args:
+            nombre_estrategia (str): IA de la sesión
+
+        Returns:
+            SesionJuego: La sesión creada
+
+        Raises:
+            ValueError: Si la estrategia no está registrada
+        """
+        id_sesion = next(self._ids_sesion)
+        sesion = SesionJuego(id_sesion, nombre_estrategia, derivar_semilla(self.semilla, id_sesion), self.libro)
+        self._activar(sesion)
+        return sesion
+
+    def retomar(self, id_sesion):
+        """
+        Recupera una sesión existente (restaurándola si estaba compactada) y la marca en uso.
+
+        Args:
+            id_sesion (int): Identificador de la sesión
+
+        Returns:
+            SesionJuego: La sesión lista para seguir jugando
+
+        Raises:
+            KeyError: Si la sesión no existe o ya se descartó
+            RuntimeError: Si la sesión ya está en uso por otra conexión
+        """
+        if id_sesion in self._en_uso:
+            raise RuntimeError(f"La sesión {id_sesion} ya está en uso")
+
+        if id_sesion in self.activas:
+            sesion = self.activas[id_sesion]
+        else:
+            compacta = self.compactadas.pop(id_sesion)
+            self._memoria_compactadas -= compacta.memoria_estimada()
+            sesion = SesionJuego.restaurar(compacta, self.libro)
+
+        self._activar(sesion)
+        return sesion
+
+    def liberar(self, sesion):
+        """
+        Indica que la conexión de una sesión ha terminado; la sesión sigue activa hasta su expulsión.
+
+        Args:
+            sesion (SesionJuego): La sesión liberada
+        """
+        self._en_uso.discard(sesion.id_sesion)
+        sesion.ultima_actividad = self._reloj()
+
+    def registrar_actividad(self, sesion):
+        """
+        Marca una sesión como usada recientemente y actualiza su memoria contabilizada.
+
+        Debe llamarse después de cada ronda: así el total de memoria incluye
+        las rondas añadidas al historial y los recortes sin recorrer las sesiones.
+
+        Args:
+            sesion (SesionJuego): La sesión que acaba de jugar
+        """
+        sesion.ultima_actividad = self._reloj()
+        self.activas.move_to_end(sesion.id_sesion)
+        memoria = sesion.memoria_estimada()
+        self._memoria_activas += memoria - self._memoria_sesiones[sesion.id_sesion]
+        self._memoria_sesiones[sesion.id_sesion] = memoria
+
+    def memoria_estimada(self):
+        """
+        Returns:
+            int: Memoria aproximada de todas las sesiones activas y compactadas, en bytes
+        """
+        return self._memoria_activas + self._memoria_compactadas
+
+    def expulsar_inactivas(self):
+        """
+        Compacta las sesiones que llevan más de tiempo_inactividad sin jugar.
+
+        Returns:
+            int: Número de sesiones expulsadas
+        """
+        limite = self._reloj() - self.tiempo_inactividad
+        inactivas = [
+            sesion for sesion in self.activas.values()
+            if sesion.ultima_actividad < limite and sesion.id_sesion not in self._en_uso
+        ]
+        for sesion in inactivas:
+            self._expulsar(sesion)
+        return len(inactivas)
+
+    def aplicar_limites(self):
+        """
+        Expulsa sesiones (de la menos a la más recientemente usada) hasta cumplir los límites.
+
+        Si compactar no basta para respetar el presupuesto de memoria, se
+        descartan definitivamente las sesiones compactadas más antiguas.
+        """
+        # Caso habitual: los totales se llevan al día, así que comprobarlos no recorre nada
+        num_activas = len(self.activas)
+        memoria = self.memoria_estimada()
+        if num_activas <= self.max_sesiones_activas and memoria <= self.presupuesto_memoria:
+            return
+
+        # Las expulsadas se eligen desde la menos usada y se sacan después, sin modificar el diccionario al recorrerlo
+        expulsiones = []
+        for sesion in self.activas.values():
+            if num_activas <= self.max_sesiones_activas and memoria <= self.presupuesto_memoria:
+                break
+            if sesion.id_sesion in self._en_uso:
+                continue
+            compacta = sesion.compactar() if sesion.compactable else None
+            num_activas -= 1
+            memoria -= self._memoria_sesiones[sesion.id_sesion]
+            if compacta is not None:
+                memoria += compacta.memoria_estimada()
+            expulsiones.append((sesion, compacta))
+        for sesion, compacta in expulsiones:
+            self._retirar(sesion, compacta)
+
+        while memoria > self.presupuesto_memoria and self.compactadas:
+            _, compacta = self.compactadas.popitem(last=False)
+            self._memoria_compactadas -= compacta.memoria_estimada()
+            memoria -= compacta.memoria_estimada()
+
+    def mantenimiento(self):
+        """Expulsa las sesiones inactivas y aplica los límites de memoria y de sesiones."""
+        self.expulsar_inactivas()
+        self.aplicar_limites()
+
+    def guardar(self, ruta):
+        """
+        Guarda todas las sesiones, activas y compactadas, en una instantánea.
+
+        Las sesiones activas se compactan para guardarlas sin dejar de estar
+        activas. Las de IA sin estado exportable (por ejemplo, el ensamble) no
+        se pueden guardar: se omiten y se cuentan.
+
+        Args:
+            ruta (str | os.PathLike): Archivo de la instantánea
+
+        Returns:
+            tuple: (sesiones guardadas, sesiones activas omitidas)
+        """
+        compactas, omitidas = self.instantanea()
+        return guardar_sesiones(ruta, compactas), omitidas
+
+    def instantanea(self):
+        """
+        Obtiene la versión compactada de todas las sesiones, activas y compactadas.
+
+        Las sesiones compactadas son inmutables, así que la lista se puede
+        escribir después (por ejemplo, en otro hilo) aunque las sesiones sigan jugando.
+
+        Returns:
+            tuple: (list[SesionCompacta] con las sesiones que se pueden guardar,
+                número de sesiones activas omitidas porque su IA no permite compactarlas)
+        """
+        compactas = [sesion.compactar() for sesion in self.activas.values() if sesion.compactable]
+        omitidas = len(self.activas) - len(compactas)
+        compactas.extend(self.compactadas.values())
+        return compactas, omitidas
+
+    def cargar(self, ruta):
+        """
+        Carga como sesiones compactadas las sesiones de una instantánea.
+
+        Las sesiones se restauran al retomarlas, así que cargar no crea
+        ninguna IA. Las sesiones activas con el mismo identificador se
+        conservan, y los identificadores nuevos siguen al mayor cargado.
+
+        Args:
+            ruta (str | os.PathLike): Archivo escrito con guardar()
+
+        Returns:
+            int: Número de sesiones cargadas
+
+        Raises:
+            ValueError: Si el archivo no es una instantánea válida de esta versión
+        """
+        cargadas = 0
+        mayor_id = 0
+        for campos in leer_sesiones(ruta):
+            compacta = SesionCompacta(*campos)
+            mayor_id = max(mayor_id, compacta.id_sesion)
+            if compacta.id_sesion in self.activas:
+                continue
+            anterior = self.compactadas.pop(compacta.id_sesion, None)
+            if anterior is not None:
+                self._memoria_compactadas -= anterior.memoria_estimada()
+            self.compactadas[compacta.id_sesion] = compacta
+            self._memoria_compactadas += compacta.memoria_estimada()
+            cargadas += 1
+        self.avanzar_ids(mayor_id)
+        self.aplicar_limites()
+        return cargadas
+
+    def avanzar_ids(self, mayor_id):
+        """
+        Hace que los identificadores de las sesiones nuevas sigan a uno ya usado.
+
+        Sirve para no reutilizar los identificadores de arranques anteriores,
+        por ejemplo los de una bitácora que se sigue ampliando. Nunca retrocede.
+
+        Args:
+            mayor_id (int): Mayor identificador de sesión usado hasta ahora
+        """
+        self._ids_sesion = itertools.count(max(next(self._ids_sesion), mayor_id + 1))
+
+    def _activar(self, sesion):
+        """Registra una sesión como activa y en uso, y aplica los límites."""
+        self.activas[sesion.id_sesion] = sesion
+        self._memoria_sesiones.setdefault(sesion.id_sesion, 0)
+        self._en_uso.add(sesion.id_sesion)
+        self.registrar_actividad(sesion)
+        self.aplicar_limites()
+
+    def _expulsar(self, sesion):
+        """Saca una sesión de memoria, compactándola si su IA lo permite."""
+        # Sin estadística suficiente exportable no se puede restaurar: se descarta
+        return self._retirar(sesion, sesion.compactar() if sesion.compactable else None)
+
+    def _retirar(self, sesion, compacta):
+        """Quita una sesión de las activas y guarda su versión compactada (si la hay)."""
+        del self.activas[sesion.id_sesion]
+        self._memoria_activas -= self._memoria_sesiones.pop(sesion.id_sesion)
+        if compacta is not None:
+            self.compactadas[sesion.id_sesion] = compacta
+            self._memoria_compactadas += compacta.memoria_estimada()
+        return compacta
@@ -0,0 +1,370 @@
+"""
+Piedra, Papel y Tijeras - Simulación sin interfaz
+=================================================
+Motor para enfrentar dos jugadores automáticos durante muchas rondas sin
+entrada ni salida por pantalla.
+
+Características:
+- Jugadores intercambiables: aleatorio, secuencias fijas, las IA de las versiones 4 y 5,
+  la IA de Markov de orden k, el ensamble de estrategias y cualquier Estrategia
+  (estrategias.py) mediante JugadorEstrategia
+- Ninguna operación de entrada/salida por ronda
+- Resultados agregados (victorias, derrotas y empates del jugador A)
+- Camino vectorizado con NumPy cuando ningún jugador depende del historial
+
+Contrato de un jugador:
+    Un jugador es cualquier objeto invocable con la firma
+    jugador(acciones_propias, acciones_rival, resultados_rival) -> AccionJuego
+
+    Los resultados se entregan desde la perspectiva del rival, igual que
+    historial_juego en las versiones 4 y 5 (Victoria = el rival ganó).
+    Ninguno de los historiales incluye la ronda actual: ambos jugadores
+    eligen sin conocer la acción actual del otro.
+
+    Opcionalmente, un jugador puede ofrecer exportar_estado() e
+    importar_estado(estado, rondas_vistas) para guardar solo la información
+    que necesita (su estadística suficiente) y continuar después con un
+    historial recortado a las últimas rondas. Lo indica con el atributo
+    compactable = True; sin él, sus sesiones no se compactan.
+"""
+
+import random
+
+from .azar import FlujoAleatorio, GeneradorReanudable
+from .estrategias import ESTRATEGIAS, JugadorEstrategia
+from .historial import HistorialPartida
+from .markov import ORDEN_MARKOV, EstrategiaMarkov
+from .nucleo import TABLA_RESULTADOS, AccionJuego, ResultadoJuego
+from .ventana import VentanaFrecuencias
+from .versiones import VERSION_IA_BASICA, VERSION_MAS_IA, cargar_version
+
+# Acciones indexadas por su valor, para convertir sin llamar al enum
+_ACCIONES = tuple(AccionJuego)
+
+# Número de rondas generadas de una vez en el camino vectorizado
+TAMANO_BLOQUE = 1 << 20
+
+
+class JugadorAleatorio:
+    """Jugador que elige cada acción al azar, sin mirar el historial."""
+
+    compactable = True
+
+    def __init__(self, semilla=None):
+        """
+        Args:
+            semilla (int | None): Semilla para que la secuencia de acciones sea reproducible
+                (None = una nueva, consultable después en self.semilla)
+        """
+        self._flujo = FlujoAleatorio(semilla)
+        self.semilla = self._flujo.semilla
+
+    def __call__(self, acciones_propias, acciones_rival, resultados_rival):
+        return _ACCIONES[self._flujo.siguiente()]
+
+    def generar_bloque(self, num_rondas):
+        """
+        Genera las acciones de varias rondas de una vez.
+
+        Continúa el mismo flujo que las llamadas ronda a ronda, así que la
+        partida es idéntica por cualquiera de los dos caminos.
+
+        Args:
+            num_rondas (int): Número de acciones a generar
+
+        Returns:
+            numpy.ndarray: Valores de AccionJuego (uint8)
+        """
+        return self._flujo.extraer_array(num_rondas)
+
+    def exportar_estado(self):
+        """
+        Returns:
+            int: Acciones ya sacadas del flujo aleatorio
+        """
+        return self._flujo.exportar_estado()
+
+    def importar_estado(self, estado, rondas_vistas=0):
+        """
+        Args:
+            estado (int | None): Posición devuelta por exportar_estado() (None = no mover el flujo)
+            rondas_vistas (int): No se usa; se acepta por compatibilidad con los jugadores
+        """
+        if estado is not None:
+            self._flujo.importar_estado(estado)
+
+
+class JugadorSecuencia:
+    """Jugador que repite cíclicamente una secuencia fija de acciones."""
+
+    compactable = True
+
+    def __init__(self, acciones):
+        """
+        Args:
+            acciones (list): Secuencia de AccionJuego que se repetirá indefinidamente
+
+        Raises:
+            ValueError: Si la secuencia está vacía o contiene acciones inválidas
+        """
+        if not acciones:
+            raise ValueError("La secuencia de acciones no puede estar vacía")
+        self.acciones = [AccionJuego(accion) for accion in acciones]
+        self._posicion = 0
+
+    def __call__(self, acciones_propias, acciones_rival, resultados_rival):
+        accion = self.acciones[self._posicion]
+        self._posicion = (self._posicion + 1) % len(self.acciones)
+        return accion
+
+    def generar_bloque(self, num_rondas):
+        """
+        Genera las acciones de varias rondas de una vez, continuando la secuencia.
+
+        Args:
+            num_rondas (int): Número de acciones a generar
+
+        Returns:
+            numpy.ndarray: Valores de AccionJuego (uint8)
+        """
+        import numpy as np
+        secuencia = np.roll(np.array(self.acciones, dtype=np.uint8), -self._posicion)
+        self._posicion = (self._posicion + num_rondas) % len(self.acciones)
+        return np.resize(secuencia, num_rondas)
+
+    def exportar_estado(self):
+        """
+        Returns:
+            int: Posición actual dentro de la secuencia
+        """
+        return self._posicion
+
+    def importar_estado(self, estado, rondas_vistas=0):
+        """
+        Args:
+            estado (int): Posición devuelta por exportar_estado()
+            rondas_vistas (int): Longitud del historial que se considera ya leída (no se usa)
+        """
+        self._posicion = estado % len(self.acciones)
+
+
+class JugadorIABasica:
+    """Adaptador de la IA de 4_IA_Basica.py (gana-se-queda / pierde-cambia)."""
+
+    compactable = True
+
+    def __init__(self, semilla=None):
+        """
+        Args:
+            semilla (int | None): Semilla del generador aleatorio propio de este jugador
+        """
+        self._obtener_accion = cargar_version(VERSION_IA_BASICA).obtener_accion_computadora
+        self._rng = GeneradorReanudable(semilla)
+
+    def __call__(self, acciones_propias, acciones_rival, resultados_rival):
+        return self._obtener_accion(resultados_rival, acciones_propias, self._rng)
+
+    def exportar_estado(self):
+        """
+        La IA básica solo consulta la última ronda, que se conserva en el historial:
+        basta con la posición de su generador aleatorio.
+
+        Returns:
+            int: Posición del generador aleatorio
+        """
+        return self._rng.exportar_estado()
+
+    def importar_estado(self, estado, rondas_vistas=0):
+        """
+        Args:
+            estado (int): Posición devuelta por exportar_estado()
+            rondas_vistas (int): No se usa; se acepta por compatibilidad con los jugadores
+        """
+        self._rng.importar_estado(estado)
+
+
+class JugadorMasIA:
+    """Adaptador de la IA de 5_Mas_IA.py (vence a la acción más frecuente del rival)."""
+
+    compactable = True
+
+    def __init__(self, semilla=None, num_acciones_recientes=None):
+        """
+        Args:
+            semilla (int | None): Semilla del generador aleatorio propio de este jugador
+            num_acciones_recientes (int | None): Tamaño de la ventana analizada
+                (por defecto, NUMERO_ACCIONES_RECIENTES de la versión 5)
+        """
+        version = cargar_version(VERSION_MAS_IA)
+        self._obtener_accion = version.obtener_accion_computadora
+        self._rng = GeneradorReanudable(semilla)
+        self._ventana_rival = VentanaFrecuencias(num_acciones_recientes or version.NUMERO_ACCIONES_RECIENTES)
+        self._acciones_vistas = 0
+
+    def __call__(self, acciones_propias, acciones_rival, resultados_rival):
+        # Añadir a la ventana solo las acciones del rival que aún no se han visto
+        while self._acciones_vistas < len(acciones_rival):
+            self._ventana_rival.append(acciones_rival[self._acciones_vistas])
+            self._acciones_vistas += 1
+        return self._obtener_accion(self._ventana_rival, resultados_rival, self._rng)
+
+    def exportar_estado(self):
+        """
+        Returns:
+            tuple: (acciones del rival en la ventana, de la más antigua a la más reciente,
+                posición del generador aleatorio)
+        """
+        return bytes(self._ventana_rival), self._rng.exportar_estado()
+
+    def importar_estado(self, estado, rondas_vistas=0):
+        """
+        Args:
+            estado (tuple): Estado devuelto por exportar_estado()
+            rondas_vistas (int): Longitud del historial que se considera ya leída
+        """
+        ventana, posicion_rng = estado
+        self._ventana_rival = VentanaFrecuencias.desde_bytes(self._ventana_rival.tamano, ventana)
+        self._acciones_vistas = rondas_vistas
+        self._rng.importar_estado(posicion_rng)
+
+
+class JugadorMarkov:
+    """Adaptador de EstrategiaMarkov (predicción a partir de las últimas k acciones del rival)."""
+
+    compactable = True
+
+    def __init__(self, semilla=None, orden=ORDEN_MARKOV, usar_resultados=False):
+        """
+        Args:
+            semilla (int | None): Semilla del generador aleatorio propio de este jugador
+            orden (int): Número de rondas previas que forman el contexto
+            usar_resultados (bool): Si el contexto incluye también los resultados
+        """
+        self._estrategia = EstrategiaMarkov(orden, usar_resultados)
+        self._rng = GeneradorReanudable(semilla)
+
+    def __call__(self, acciones_propias, acciones_rival, resultados_rival):
+        return self._estrategia(acciones_rival, resultados_rival, self._rng)
+
+    def exportar_estado(self):
+        """
+        Returns:
+            tuple: (estado de la tabla de transiciones (ver EstrategiaMarkov.exportar_estado),
+                posición del generador aleatorio)
+        """
+        return self._estrategia.exportar_estado(), self._rng.exportar_estado()
+
+    def importar_estado(self, estado, rondas_vistas=0):
+        """
+        Args:
+            estado (tuple): Estado devuelto por exportar_estado()
+            rondas_vistas (int): Longitud del historial que se considera ya leída
+        """
+        estado_estrategia, posicion_rng = estado
+        self._estrategia.importar_estado(estado_estrategia, rondas_vistas)
+        self._rng.importar_estado(posicion_rng)
+
+
+class JugadorEnsamble:
+    """Adaptador de EstrategiaEnsamble (meta-estrategia sobre muchas variantes, requiere NumPy)."""
+
+    def __init__(self, semilla=None, **opciones):
+        """
+        Args:
+            semilla (int | None): Semilla del generador aleatorio propio de este jugador
+            **opciones: Argumentos adicionales para EstrategiaEnsamble
+        """
+        from .ensamble import EstrategiaEnsamble
+        self._estrategia = EstrategiaEnsamble(**opciones)
+        self._rng = random.Random(semilla)
+
+    def __call__(self, acciones_propias, acciones_rival, resultados_rival):
+        return self._estrategia(acciones_rival, resultados_rival, self._rng)
+
+
+# Jugadores registrados por nombre: nombre => función que crea el jugador a partir de una semilla
+JUGADORES = {
+    "aleatorio": JugadorAleatorio,
+    "ia_basica": JugadorIABasica,
+    "mas_ia": JugadorMasIA,
+    "markov": JugadorMarkov,
+    "ensamble": JugadorEnsamble,
+    "ciclico": lambda semilla: JugadorSecuencia(list(AccionJuego)),
+    "gana_repite": lambda semilla: JugadorEstrategia(ESTRATEGIAS["gana_repite"](semilla)),
+    "dirichlet": lambda semilla: JugadorEstrategia(ESTRATEGIAS["dirichlet"](semilla)),
+}
+
+
+def simular(jugador_a, jugador_b, num_rondas):
+    """
+    Enfrenta a dos jugadores durante un número de rondas sin entrada/salida.
+
+    Si ambos jugadores pueden generar sus acciones por bloques (no dependen del
+    historial), la partida se evalúa de forma vectorizada con NumPy.
+
+    Args:
+        jugador_a: Jugador en el papel del usuario
+        jugador_b: Jugador en el papel de la computadora
+        num_rondas (int): Número de rondas a jugar
+
+    Returns:
+        dict: Número de rondas por cada ResultadoJuego, desde la perspectiva del jugador A
+    """
+    if hasattr(jugador_a, "generar_bloque") and hasattr(jugador_b, "generar_bloque"):
+        return _simular_por_bloques(jugador_a, jugador_b, num_rondas)
+
+    historial = HistorialPartida()
+    # Vistas vivas del historial: crecen con cada ronda sin copiar datos
+    acciones_a = historial.acciones_usuario
+    acciones_b = historial.acciones_computadora
+    resultados_a = historial.resultados
+    resultados_b = historial.resultados_computadora
+    conteos = [0] * len(ResultadoJuego)
+
+    for _ in range(num_rondas):
+        accion_a = jugador_a(acciones_a, acciones_b, resultados_b)
+        accion_b = jugador_b(acciones_b, acciones_a, resultados_a)
+        resultado_a = TABLA_RESULTADOS[accion_a][accion_b]
+
+        historial.append(accion_a, accion_b, resultado_a)
+        conteos[resultado_a] += 1
+
+    return {resultado: conteos[resultado] for resultado in ResultadoJuego}
+
+
+def simular_aleatorio(num_rondas, semilla=None):
+    """
+    Enfrenta a dos jugadores aleatorios usando el camino vectorizado.
+
+    Args:
+        num_rondas (int): Número de rondas a jugar
+        semilla (int | None): Semilla para reproducir la simulación
+
+    Returns:
+        dict: Número de rondas por cada ResultadoJuego, desde la perspectiva del jugador A
+    """
+    # Dos semillas independientes derivadas de la semilla de la simulación
+    rng = random.Random(semilla)
+    jugador_a = JugadorAleatorio(rng.getrandbits(64))
+    jugador_b = JugadorAleatorio(rng.getrandbits(64))
+
+    return _simular_por_bloques(jugador_a, jugador_b, num_rondas)
+
+
+def _simular_por_bloques(jugador_a, jugador_b, num_rondas):
+    """Evalúa la partida por bloques de TAMANO_BLOQUE rondas con NumPy."""
+    import numpy as np
+
+    from .lote import evaluar_lote
+
+    conteos = np.zeros(len(ResultadoJuego), dtype=np.int64)
+    rondas_pendientes = num_rondas
+
+    while rondas_pendientes > 0:
+        rondas_bloque = min(rondas_pendientes, TAMANO_BLOQUE)
+        resultados = evaluar_lote(jugador_a.generar_bloque(rondas_bloque),
+                                  jugador_b.generar_bloque(rondas_bloque))
+        conteos += np.bincount(resultados, minlength=len(ResultadoJuego))
+        rondas_pendientes -= rondas_bloque
+
+    return {resultado: int(conteos[resultado]) for resultado in ResultadoJuego}
@@ -0,0 +1,192 @@
+"""
+Piedra, Papel y Tijeras - Torneo todos contra todos
+===================================================
+Ejecuta un torneo entre los jugadores automáticos repartiendo las partidas
+entre varios procesos.
+
+Características:
+- Enfrentamientos todos contra todos entre los jugadores registrados
+- Partidas repartidas en fragmentos que se ejecutan en un grupo de procesos
+- Cada partida usa sus propios generadores aleatorios con semillas derivadas
+  de la semilla del torneo, sin tocar el módulo random global
+- Resultados reproducibles con independencia del número de procesos
+- Las tablas de resultados de cada proceso se combinan al final
+- Importación ligera: los procesos hijos no cargan argparse ni el ejecutor
+"""
+
+import os
+import random
+from itertools import combinations
+
+from .azar import derivar_semilla
+from .nucleo import ResultadoJuego
+from .simulacion import JUGADORES, simular
+
+
+def semilla_partida(semilla_torneo, nombre_a, nombre_b, indice_partida):
+    """
+    Deriva la semilla de una partida a partir de la semilla del torneo.
+
+    La semilla depende solo de la partida, no del proceso que la ejecuta,
+    por lo que el torneo se reproduce igual con cualquier número de procesos.
+
+    Args:
+        semilla_torneo (int): Semilla global del torneo
+        nombre_a (str): Nombre del primer jugador
+        nombre_b (str): Nombre del segundo jugador
+        indice_partida (int): Número de la partida entre esos dos jugadores
+
+    Returns:
+        int: Semilla de 64 bits para la partida
+    """
+    return derivar_semilla(semilla_torneo, nombre_a, nombre_b, indice_partida)
+
+
+def jugar_fragmento(partidas):
+    """
+    Juega secuencialmente un fragmento de partidas dentro de un proceso.
+
+    Args:
+        partidas (list): Tuplas (nombre_a, nombre_b, semilla, num_rondas)
+
+    Returns:
+        dict: Tabla parcial {(nombre_a, nombre_b): [victorias, derrotas, empates]} del jugador A
+    """
+    tabla = {}
+    for nombre_a, nombre_b, semilla, num_rondas in partidas:
+        # Cada jugador recibe su propio generador, derivado de la semilla de la partida
+        rng = random.Random(semilla)
+        jugador_a = JUGADORES[nombre_a](rng.getrandbits(64))
+        jugador_b = JUGADORES[nombre_b](rng.getrandbits(64))
+        conteos = simular(jugador_a, jugador_b, num_rondas)
+
+        acumulado = tabla.setdefault((nombre_a, nombre_b), [0] * len(ResultadoJuego))
+        for resultado in ResultadoJuego:
+            acumulado[resultado] += conteos[resultado]
+
+    return tabla
+
+
+def combinar_tablas(tablas):
+    """
+    Combina las tablas parciales producidas por cada proceso.
+
+    Args:
+        tablas (iterable): Tablas devueltas por jugar_fragmento()
+
+    Returns:
+        dict: Tabla combinada {(nombre_a, nombre_b): {ResultadoJuego: rondas}}
+    """
+    tabla_combinada = {}
+    for tabla in tablas:
+        for enfrentamiento, conteos in tabla.items():
+            acumulado = tabla_combinada.setdefault(enfrentamiento, [0] * len(ResultadoJuego))
+            for resultado in ResultadoJuego:
+                acumulado[resultado] += conteos[resultado]
+
+    return {
+        enfrentamiento: {resultado: conteos[resultado] for resultado in ResultadoJuego}
+        for enfrentamiento, conteos in sorted(tabla_combinada.items())
+    }
+
+
+def ejecutar_torneo(nombres_jugadores=None, num_partidas=4, num_rondas=1000,
+                    semilla=0, num_procesos=None):
+    """
+    Ejecuta un torneo todos contra todos repartido entre varios procesos.
+
+    Args:
+        nombres_jugadores (list | None): Jugadores participantes (por defecto, todos los registrados)
+        num_partidas (int): Partidas que juega cada pareja de jugadores
+        num_rondas (int): Rondas de cada partida
+        semilla (int): Semilla del torneo, para reproducir los resultados
+        num_procesos (int | None): Número de procesos (por defecto, os.cpu_count())
+
+    Returns:
+        dict: Tabla {(nombre_a, nombre_b): {ResultadoJuego: rondas}} desde la perspectiva de A
+
+    Raises:
+        ValueError: Si algún jugador no está registrado en JUGADORES
+    """
+    nombres_jugadores = list(nombres_jugadores or JUGADORES)
+    desconocidos = [nombre for nombre in nombres_jugadores if nombre not in JUGADORES]
+    if desconocidos:
+        raise ValueError(f"Jugadores desconocidos: {', '.join(desconocidos)}")
+
+    num_procesos = num_procesos or os.cpu_count() or 1
+
+    partidas = [
+        (nombre_a, nombre_b, semilla_partida(semilla, nombre_a, nombre_b, indice), num_rondas)
+        for nombre_a, nombre_b in combinations(nombres_jugadores, 2)
+        for indice in range(num_partidas)
+    ]
+    # Reparto en fragmentos intercalados para equilibrar la carga entre procesos
+    fragmentos = [partidas[i::num_procesos] for i in range(num_procesos) if partidas[i::num_procesos]]
+
+    if len(fragmentos) <= 1:
+        return combinar_tablas(map(jugar_fragmento, fragmentos))
+
+    # Importación diferida: multiprocessing solo se carga si hay varios procesos
+    from concurrent.futures import ProcessPoolExecutor
+
+    with ProcessPoolExecutor(max_workers=len(fragmentos)) as ejecutor:
+        return combinar_tablas(ejecutor.map(jugar_fragmento, fragmentos))
+
+
+def clasificacion(tabla):
+    """
+    Calcula la clasificación de los jugadores a partir de la tabla del torneo.
+
+    Args:
+        tabla (dict): Tabla devuelta por ejecutar_torneo()
+
+    Returns:
+        list: Tuplas (nombre, victorias, derrotas, empates) ordenadas por victorias - derrotas
+    """
+    totales = {}
+    for (nombre_a, nombre_b), conteos in tabla.items():
+        victorias = conteos[ResultadoJuego.Victoria]
+        derrotas = conteos[ResultadoJuego.Derrota]
+        empates = conteos[ResultadoJuego.Empate]
+
+        total_a = totales.setdefault(nombre_a, [0, 0, 0])
+        total_a[0] += victorias
+        total_a[1] += derrotas
+        total_a[2] += empates
+
+        # El jugador B ve las victorias y derrotas al revés
+        total_b = totales.setdefault(nombre_b, [0, 0, 0])
+        total_b[0] += derrotas
+        total_b[1] += victorias
+        total_b[2] += empates
+
+    return sorted(((nombre, *total) for nombre, total in totales.items()),
+                  key=lambda fila: fila[1] - fila[2], reverse=True)
+
+
+def main():
+    """Función principal que ejecuta un torneo desde la línea de comandos."""
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Torneo todos contra todos de Piedra, Papel y Tijeras")
+    parser.add_argument("jugadores", nargs="*", metavar="jugador",
+                        help=f"Jugadores participantes ({', '.join(JUGADORES)})")
+    parser.add_argument("--partidas", type=int, default=4, help="Partidas por pareja")
+    parser.add_argument("--rondas", type=int, default=1000, help="Rondas por partida")
+    parser.add_argument("--semilla", type=int, default=0, help="Semilla del torneo")
+    parser.add_argument("--procesos", type=int, default=None, help="Número de procesos")
+    argumentos = parser.parse_args()
+
+    try:
+        tabla = ejecutar_torneo(argumentos.jugadores, argumentos.partidas, argumentos.rondas,
+                                argumentos.semilla, argumentos.procesos)
+    except ValueError as error:
+        parser.error(str(error))
+
+    print(f"{'Jugador':<12}{'Victorias':>12}{'Derrotas':>12}{'Empates':>12}")
+    for nombre, victorias, derrotas, empates in clasificacion(tabla):
+        print(f"{nombre:<12}{victorias:>12}{derrotas:>12}{empates:>12}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,126 @@
+"""
+Piedra, Papel y Tijeras - Ventana deslizante de frecuencias
+===========================================================
+Estructura incremental para conocer la acción más frecuente entre las
+últimas N acciones de un jugador sin recorrer ni copiar todo su historial.
+
+Características:
+- Buffer circular de tamaño fijo: memoria constante aunque la sesión sea muy larga
+- Un contador por acción que se actualiza en cada append()
+- Consulta de la acción más frecuente sin recorrer la ventana (salvo empates)
+- Mismo criterio de desempate que statistics.mode(): gana la que aparece antes
+- Sirve para juegos de cualquier número de acciones (hasta 256)
+"""
+
+from .nucleo import AccionJuego
+
+
+class VentanaFrecuencias:
+    """Buffer circular con las últimas acciones y su recuento por acción."""
+
+    __slots__ = ("tamano", "acciones", "conteos", "_buffer", "_inicio", "_longitud")
+
+    def __init__(self, tamano, acciones=AccionJuego):
+        """
+        Args:
+            tamano (int): Número máximo de acciones recientes que se conservan
+            acciones (type[IntEnum]): Enum con las acciones del juego
+
+        Raises:
+            ValueError: Si el tamaño de la ventana no es positivo
+        """
+        if tamano <= 0:
+            raise ValueError("El tamaño de la ventana debe ser mayor que cero")
+        self.tamano = tamano
+        self.acciones = acciones
+        self.conteos = [0] * len(acciones)
+        self._buffer = bytearray(tamano)
+        self._inicio = 0
+        self._longitud = 0
+
+    def append(self, accion):
+        """
+        Añade una acción y descarta la más antigua si la ventana está llena.
+
+        Args:
+            accion (AccionJuego): La acción a añadir
+        """
+        if self._longitud < self.tamano:
+            self._buffer[(self._inicio + self._longitud) % self.tamano] = accion
+            self._longitud += 1
+        else:
+            # Sobrescribir la acción más antigua y avanzar el inicio del buffer
+            self.conteos[self._buffer[self._inicio]] -= 1
+            self._buffer[self._inicio] = accion
+            self._inicio = (self._inicio + 1) % self.tamano
+        self.conteos[accion] += 1
+
+    def __bytes__(self):
+        """Acciones de la ventana, de la más antigua a la más reciente."""
+        return bytes(self._buffer[self._inicio:self._inicio + self._longitud]
+                     + self._buffer[:max(0, self._inicio + self._longitud - self.tamano)])
+
+    @classmethod
+    def desde_bytes(cls, tamano, contenido, acciones=AccionJuego):
+        """
+        Reconstruye una ventana a partir de sus acciones.
+
+        Args:
+            tamano (int): Tamaño de la ventana
+            contenido (bytes): Acciones de la más antigua a la más reciente
+            acciones (type[IntEnum]): Enum con las acciones del juego
+
+        Returns:
+            VentanaFrecuencias: La ventana con esas acciones
+        """
+        ventana = cls(tamano, acciones)
+        for accion in contenido:
+            ventana.append(accion)
+        return ventana
+
+    def moda(self):
+        """
+        Obtiene la acción más frecuente de la ventana.
+
+        Si varias acciones empatan, devuelve la que aparece primero en la
+        ventana, igual que statistics.mode().
+
+        Returns:
+            IntEnum: La acción más frecuente
+
+        Raises:
+            ValueError: Si la ventana está vacía
+        """
+        if not self._longitud:
+            raise ValueError("La ventana está vacía")
+
+        if len(self.conteos) > self._longitud:
+            # Con más acciones que rondas en la ventana es más barato recorrer la ventana
+            conteos = self.conteos
+            recientes = bytes(self)
+            maximo = max(map(conteos.__getitem__, recientes))
+            for accion in recientes:
+                if conteos[accion] == maximo:
+                    return self.acciones(accion)
+
+        maximo = max(self.conteos)
+        candidatas = [accion for accion, conteo in enumerate(self.conteos) if conteo == maximo]
+        if len(candidatas) == 1:
+            return self.acciones(candidatas[0])
+
+        # Empate: la primera acción candidata desde la más antigua
+        for accion in self:
+            if self.conteos[accion] == maximo:
+                return accion
+
+    def __len__(self):
+        return self._longitud
+
+    def __getitem__(self, indice):
+        if not -self._longitud <= indice < self._longitud:
+            raise IndexError("Índice fuera de la ventana")
+        return self.acciones(self._buffer[(self._inicio + indice % self._longitud) % self.tamano])
+
+    def __iter__(self):
+        for desplazamiento in range(self._longitud):
+            yield self.acciones(self._buffer[(self._inicio + desplazamiento) % self.tamano])
@@ -0,0 +1,53 @@
+"""
+Piedra, Papel y Tijeras - Carga de versiones
+============================================
+Permite reutilizar las funciones de las versiones numeradas del juego
+(3_Codigo_Limpio.py, 4_IA_Basica.py, 5_Mas_IA.py) desde el paquete.
+
+Los nombres de estos archivos empiezan por un número, por lo que no pueden
+importarse con la sentencia import habitual. Este módulo los carga a partir
+de su ruta y los registra en sys.modules para que solo se ejecuten una vez.
+"""
+
+import importlib.util
+import sys
+from pathlib import Path
+
+# Directorio raíz del proyecto, donde se encuentran las versiones numeradas
+DIRECTORIO_VERSIONES = Path(__file__).resolve().parent.parent
+
+# Nombres de módulo de las versiones que exponen obtener_accion_computadora()
+VERSION_IA_BASICA = "4_IA_Basica"
+VERSION_MAS_IA = "5_Mas_IA"
+
+
+def cargar_version(nombre_version):
+    """
+    Carga (o reutiliza si ya está cargada) una versión numerada del juego.
+
+    Args:
+        nombre_version (str): Nombre del archivo sin extensión, por ejemplo "4_IA_Basica"
+
+    Returns:
+        module: El módulo de la versión, sin ejecutar su función main()
+
+    Raises:
+        ModuleNotFoundError: Si no existe el archivo de la versión
+    """
+    if nombre_version in sys.modules:
+        return sys.modules[nombre_version]
+
+    ruta_version = DIRECTORIO_VERSIONES / f"{nombre_version}.py"
+    if not ruta_version.is_file():
+        raise ModuleNotFoundError(f"No existe la versión {nombre_version}", name=nombre_version)
+
+    spec = importlib.util.spec_from_file_location(nombre_version, ruta_version)
+    modulo = importlib.util.module_from_spec(spec)
+    sys.modules[nombre_version] = modulo
+    try:
+        spec.loader.exec_module(modulo)
+    except BaseException:
+        del sys.modules[nombre_version]
+        raise
+
+    return modulo
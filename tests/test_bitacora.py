@@ -0,0 +1,82 @@
+"""Pruebas de la bitácora binaria de partidas."""
+
+import os
+import tempfile
+import unittest
+
+from piedra_papel_tijeras import bitacora as modulo_bitacora
+from piedra_papel_tijeras.bitacora import FORMATO_REGISTRO, MAGIA_BITACORA, TAMANO_REGISTRO, EscritorBitacora
+from piedra_papel_tijeras.nucleo import AccionJuego, ResultadoJuego
+
+
+def leer_registros(ruta):
+    """Lee los registros completos de la bitácora sin NumPy."""
+    with open(ruta, "rb") as archivo:
+        contenido = archivo.read()[len(MAGIA_BITACORA):]
+    completos = len(contenido) - len(contenido) % TAMANO_REGISTRO
+    return list(FORMATO_REGISTRO.iter_unpack(contenido[:completos]))
+
+
+class PruebasReapertura(unittest.TestCase):
+
+    def setUp(self):
+        directorio = tempfile.TemporaryDirectory()
+        self.addCleanup(directorio.cleanup)
+        self.ruta = os.path.join(directorio.name, "partidas.bin")
+
+    def test_registro_incompleto_se_descarta_al_reabrir(self):
+        with EscritorBitacora(self.ruta) as bitacora:
+            bitacora.registrar(1, 0, AccionJuego.Piedra, AccionJuego.Papel, ResultadoJuego.Derrota)
+            bitacora.registrar(2, 0, AccionJuego.Tijeras, AccionJuego.Papel, ResultadoJuego.Victoria)
+        # Caída a mitad de escritura: solo llegan 3 bytes del tercer registro
+        with open(self.ruta, "ab") as archivo:
+            archivo.write(FORMATO_REGISTRO.pack(3, 0, 0, 0, 2)[:3])
+
+        with EscritorBitacora(self.ruta) as bitacora:
+            bitacora.registrar(5, 0, AccionJuego.Papel, AccionJuego.Papel, ResultadoJuego.Empate)
+            bitacora.registrar(5, 1, AccionJuego.Piedra, AccionJuego.Tijeras, ResultadoJuego.Victoria)
+
+        self.assertEqual((os.path.getsize(self.ruta) - len(MAGIA_BITACORA)) % TAMANO_REGISTRO, 0)
+        self.assertEqual(leer_registros(self.ruta), [
+            (1, 0, AccionJuego.Piedra, AccionJuego.Papel, ResultadoJuego.Derrota),
+            (2, 0, AccionJuego.Tijeras, AccionJuego.Papel, ResultadoJuego.Victoria),
+            (5, 0, AccionJuego.Papel, AccionJuego.Papel, ResultadoJuego.Empate),
+            (5, 1, AccionJuego.Piedra, AccionJuego.Tijeras, ResultadoJuego.Victoria),
+        ])
+
+    def test_reabrir_sin_registro_incompleto_conserva_todo(self):
+        with EscritorBitacora(self.ruta) as bitacora:
+            bitacora.registrar(1, 0, AccionJuego.Piedra, AccionJuego.Papel, ResultadoJuego.Derrota)
+        with EscritorBitacora(self.ruta) as bitacora:
+            bitacora.registrar(2, 0, AccionJuego.Papel, AccionJuego.Piedra, ResultadoJuego.Victoria)
+
+        self.assertEqual([registro[0] for registro in leer_registros(self.ruta)], [1, 2])
+
+    def test_mayor_id_sesion_al_reabrir(self):
+        with EscritorBitacora(self.ruta) as bitacora:
+            self.assertEqual(bitacora.mayor_id_sesion, 0)
+            for id_sesion in (3, 41, 7):
+                bitacora.registrar(id_sesion, 0, AccionJuego.Piedra, AccionJuego.Piedra, ResultadoJuego.Empate)
+
+        with EscritorBitacora(self.ruta) as bitacora:
+            self.assertEqual(bitacora.mayor_id_sesion, 41)
+
+    def test_mayor_id_sesion_sin_numpy_coincide(self):
+        with EscritorBitacora(self.ruta) as bitacora:
+            for id_sesion in (12, 5, 900, 31):
+                bitacora.registrar(id_sesion, 0, AccionJuego.Papel, AccionJuego.Piedra, ResultadoJuego.Victoria)
+        with open(self.ruta, "ab") as archivo:
+            archivo.write(FORMATO_REGISTRO.pack(10**6, 0, 0, 0, 2)[:5])
+
+        self.assertEqual(modulo_bitacora.mayor_id_sesion(self.ruta), 900)
+        self.assertEqual(modulo_bitacora._mayor_id_sesion_por_bloques(self.ruta), 900)
+
+    def test_archivo_ajeno_se_rechaza(self):
+        with open(self.ruta, "wb") as archivo:
+            archivo.write(b"no es una bitacora")
+        with self.assertRaises(ValueError):
+            EscritorBitacora(self.ruta)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,96 @@
+"""Pruebas de la fusión incremental de las estadísticas globales."""
+
+import random
+import unittest
+from unittest import mock
+
+from piedra_papel_tijeras import estadisticas
+from piedra_papel_tijeras.estadisticas import AgregadorEstadisticas
+from piedra_papel_tijeras.nucleo import ResultadoJuego
+
+
+def fusion_completa(fragmentos):
+    """Suma desde cero los contadores de cada jugador en todos los fragmentos."""
+    totales = {}
+    for fragmento in fragmentos:
+        for jugador, conteos in fragmento.jugadores.items():
+            anteriores = totales.get(jugador, (0,) * len(ResultadoJuego))
+            totales[jugador] = tuple(map(sum, zip(anteriores, conteos)))
+    return totales
+
+
+class PruebasFusionIncremental(unittest.TestCase):
+
+    def setUp(self):
+        # Pocos candidatos: la clasificación se queda sin ellos y se reconstruye a menudo
+        parche = mock.patch.object(estadisticas, "CANDIDATOS_CLASIFICACION", 8)
+        parche.start()
+        self.addCleanup(parche.stop)
+
+    def comprobar(self, agregador, fragmentos):
+        """Comprueba la instantánea publicada contra una fusión completa por fuerza bruta."""
+        instantanea = agregador.fusionar()
+        totales = fusion_completa(fragmentos)
+        self.assertEqual(instantanea.num_jugadores, len(totales))
+        # A igualdad de puntuación el orden es arbitrario: se comparan las puntuaciones
+        esperadas = sorted(map(estadisticas._puntuacion, totales.values()), reverse=True)
+        self.assertEqual([estadisticas._puntuacion(conteos) for _, *conteos in instantanea.clasificacion],
+                         esperadas[:agregador.tamano_clasificacion])
+        for jugador, *conteos in instantanea.clasificacion:
+            self.assertEqual(tuple(conteos), totales[jugador])
+        return instantanea
+
+    def test_rondas_aleatorias_en_varios_fragmentos(self):
+        rng = random.Random(7)
+        agregador = AgregadorEstadisticas(tamano_clasificacion=5, max_jugadores=60)
+        fragmentos = [agregador.nuevo_fragmento() for _ in range(3)]
+        for _ in range(300):
+            for _ in range(rng.randrange(1, 80)):
+                # Unos pocos jugadores muy activos y muchos ocasionales que se acaban olvidando
+                jugador = int(rng.paretovariate(1.2)) % 200
+                rng.choice(fragmentos).registrar(jugador, rng.choice("ab"), ResultadoJuego(rng.randrange(3)))
+            self.comprobar(agregador, fragmentos)
+        self.assertTrue(all(len(fragmento.jugadores) <= 60 for fragmento in fragmentos))
+
+    def test_empates_en_la_clasificacion(self):
+        agregador = AgregadorEstadisticas(tamano_clasificacion=4)
+        fragmentos = [agregador.nuevo_fragmento() for _ in range(2)]
+        for jugador in range(40):
+            fragmentos[jugador % 2].registrar(jugador, "a", ResultadoJuego.Victoria)
+        self.comprobar(agregador, fragmentos)
+        # Un jugador desempata y otro empata con él desde el otro fragmento
+        fragmentos[0].registrar(3, "a", ResultadoJuego.Victoria)
+        fragmentos[1].registrar(3, "a", ResultadoJuego.Empate)
+        fragmentos[1].registrar(20, "a", ResultadoJuego.Victoria)
+        instantanea = self.comprobar(agregador, fragmentos)
+        self.assertEqual({jugador for jugador, *_ in instantanea.clasificacion[:2]}, {3, 20})
+
+    def test_candidatos_que_caen_bajo_el_umbral(self):
+        agregador = AgregadorEstadisticas(tamano_clasificacion=3)
+        fragmentos = [agregador.nuevo_fragmento() for _ in range(2)]
+        for jugador in range(30):
+            for _ in range(jugador):
+                fragmentos[jugador % 2].registrar(jugador, "a", ResultadoJuego.Victoria)
+        self.comprobar(agregador, fragmentos)
+        # Los mejores pierden tanto que todos los candidatos quedan por debajo del resto
+        for jugador in range(20, 30):
+            for _ in range(60):
+                fragmentos[(jugador + 1) % 2].registrar(jugador, "a", ResultadoJuego.Derrota)
+        instantanea = self.comprobar(agregador, fragmentos)
+        self.assertEqual([jugador for jugador, *_ in instantanea.clasificacion], [19, 18, 17])
+
+    def test_jugador_olvidado_sale_de_la_clasificacion(self):
+        agregador = AgregadorEstadisticas(tamano_clasificacion=2, max_jugadores=5)
+        fragmento = agregador.nuevo_fragmento()
+        for _ in range(10):
+            fragmento.registrar(0, "a", ResultadoJuego.Victoria)
+        self.assertEqual(self.comprobar(agregador, [fragmento]).clasificacion[0][0], 0)
+        # Cinco jugadores más recientes expulsan al líder del fragmento
+        for jugador in range(1, 6):
+            fragmento.registrar(jugador, "a", ResultadoJuego.Derrota)
+        instantanea = self.comprobar(agregador, [fragmento])
+        self.assertNotIn(0, [jugador for jugador, *_ in instantanea.clasificacion])
+
+
+if __name__ == "__main__":
+    unittest.main()
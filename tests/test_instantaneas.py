@@ -0,0 +1,86 @@
+"""Pruebas del formato binario de las instantáneas de sesiones."""
+
+import os
+import tempfile
+import unittest
+
+from piedra_papel_tijeras.instantaneas import MAGIA_INSTANTANEA, guardar_sesiones, leer_sesiones
+from piedra_papel_tijeras.nucleo import AccionJuego
+from piedra_papel_tijeras.sesiones import GestorSesiones, SesionCompacta
+
+
+def campos(compacta):
+    """Campos de una sesión compactada en el orden en que los devuelve leer_sesiones()."""
+    return (compacta.id_sesion, compacta.nombre_estrategia, compacta.semilla, compacta.rondas_jugadas,
+            compacta.cola_historial, compacta.estado_jugador)
+
+
+class PruebasInstantaneas(unittest.TestCase):
+
+    def setUp(self):
+        directorio = tempfile.TemporaryDirectory()
+        self.addCleanup(directorio.cleanup)
+        self.ruta = os.path.join(directorio.name, "sesiones.snap")
+        self.compactas = [
+            SesionCompacta(1, "ia_basica", 42, 3, b"\x05", 17),
+            SesionCompacta(2**40, "dirichlet", None, 0, b"",
+                           (0.95, -3, b"\x00\x01" * 8, {"rng": (True, False, None)})),
+            SesionCompacta(7, "markov", -1, 1000, b"\x80", ("ñandú", 2.5, ())),
+        ]
+
+    def escribir(self, contenido):
+        with open(self.ruta, "wb") as archivo:
+            archivo.write(contenido)
+
+    def test_ida_y_vuelta(self):
+        self.assertEqual(guardar_sesiones(self.ruta, self.compactas), 3)
+        self.assertEqual(list(leer_sesiones(self.ruta)), [campos(compacta) for compacta in self.compactas])
+        self.assertFalse(os.path.exists(f"{self.ruta}.tmp"))
+
+    def test_instantanea_vacia(self):
+        self.assertEqual(guardar_sesiones(self.ruta, []), 0)
+        self.assertEqual(list(leer_sesiones(self.ruta)), [])
+
+    def test_instantanea_truncada_se_rechaza(self):
+        guardar_sesiones(self.ruta, self.compactas)
+        with open(self.ruta, "rb") as archivo:
+            contenido = archivo.read()
+        # Incluye el prefijo de la firma sin versión y la firma con un solo byte de cabecera
+        for longitud in (0, 3, len(MAGIA_INSTANTANEA) - 1, len(MAGIA_INSTANTANEA), len(MAGIA_INSTANTANEA) + 1,
+                         len(MAGIA_INSTANTANEA) + 8, len(MAGIA_INSTANTANEA) + 20, len(contenido) - 1):
+            with self.subTest(longitud=longitud):
+                self.escribir(contenido[:longitud])
+                with self.assertRaises(ValueError):
+                    list(leer_sesiones(self.ruta))
+
+    def test_otra_version_se_rechaza(self):
+        guardar_sesiones(self.ruta, self.compactas)
+        with open(self.ruta, "rb") as archivo:
+            contenido = bytearray(archivo.read())
+        contenido[len(MAGIA_INSTANTANEA) - 1] += 1
+        self.escribir(contenido)
+        with self.assertRaisesRegex(ValueError, "Versión"):
+            list(leer_sesiones(self.ruta))
+
+    def test_archivo_ajeno_se_rechaza(self):
+        self.escribir(b"no es una instantanea de sesiones")
+        with self.assertRaisesRegex(ValueError, "no es una instantánea"):
+            list(leer_sesiones(self.ruta))
+
+
+class PruebasGuardarGestor(unittest.TestCase):
+
+    def test_sesiones_sin_estado_exportable_se_cuentan(self):
+        directorio = tempfile.TemporaryDirectory()
+        self.addCleanup(directorio.cleanup)
+        ruta = os.path.join(directorio.name, "sesiones.snap")
+        gestor = GestorSesiones(semilla=1)
+        for nombre_estrategia in ("ia_basica", "ensamble", "dirichlet", "ensamble"):
+            gestor.crear(nombre_estrategia).jugar(AccionJuego.Papel)
+
+        self.assertEqual(gestor.guardar(ruta), (2, 2))
+        self.assertEqual(GestorSesiones().cargar(ruta), 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
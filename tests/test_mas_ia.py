@@ -0,0 +1,57 @@
+"""Pruebas de la IA de la versión 5: nunca usa la acción actual del usuario."""
+
+import random
+import unittest
+
+from piedra_papel_tijeras.historial import HistorialPartida
+from piedra_papel_tijeras.nucleo import AccionJuego, evaluar_ronda
+from piedra_papel_tijeras.ventana import VentanaFrecuencias
+from piedra_papel_tijeras.versiones import VERSION_MAS_IA, cargar_version
+
+mas_ia = cargar_version(VERSION_MAS_IA)
+
+
+def partida_aleatoria(rondas, semilla):
+    """Historial de una partida con acciones al azar."""
+    rng = random.Random(semilla)
+    historial = HistorialPartida()
+    for _ in range(rondas):
+        usuario, computadora = AccionJuego(rng.randrange(3)), AccionJuego(rng.randrange(3))
+        historial.append(usuario, computadora, evaluar_ronda(usuario, computadora))
+    return historial
+
+
+class PruebasHonestidad(unittest.TestCase):
+
+    def decidir(self, historial_usuario, historial_juego):
+        # Misma semilla en cada llamada: las elecciones al azar también deben coincidir
+        return mas_ia.obtener_accion_computadora(historial_usuario, historial_juego, random.Random(7))
+
+    def test_la_accion_actual_no_cambia_la_decision(self):
+        for rondas in range(12):
+            historial = partida_aleatoria(rondas, rondas)
+            previas = list(historial.acciones_usuario)
+            resultados = list(historial.resultados)
+            esperada = self.decidir(previas, resultados)
+            # Convención de las versiones anteriores: la lista incluye la acción actual al final
+            for actual in AccionJuego:
+                self.assertEqual(self.decidir(previas + [actual], resultados), esperada, (rondas, actual))
+
+    def test_mismas_decisiones_con_ventana_lista_y_vista(self):
+        for rondas in range(1, 30):
+            historial = partida_aleatoria(rondas, 100 + rondas)
+            ventana = VentanaFrecuencias.desde_bytes(mas_ia.NUMERO_ACCIONES_RECIENTES,
+                                                     bytes(historial.acciones_usuario))
+            esperada = self.decidir(ventana, historial.resultados)
+            self.assertEqual(self.decidir(list(historial.acciones_usuario), list(historial.resultados)), esperada)
+            self.assertEqual(self.decidir(historial.acciones_usuario, historial.resultados), esperada)
+
+    def test_vence_a_la_accion_mas_frecuente_previa(self):
+        previas = [AccionJuego.Tijeras, AccionJuego.Tijeras, AccionJuego.Papel]
+        resultados = [evaluar_ronda(accion, AccionJuego.Piedra) for accion in previas]
+        # La acción actual (Papel) no debe empatar la moda con Tijeras
+        self.assertEqual(self.decidir(previas + [AccionJuego.Papel], resultados), AccionJuego.Piedra)
+
+
+if __name__ == "__main__":
+    unittest.main()